@@ -49,7 +49,26 @@ def main():
         "tests/test_complex_integrals.py",
         "tests/test_advanced_mathematics.py",
         "tests/test_comprehensive_integrals.py",
-        "tests/test_advanced_scenarios.py"
+        "tests/test_advanced_scenarios.py",
+        "tests/test_batch_integration.py",
+        "tests/test_precision_integration.py",
+        "tests/test_interval_integration.py",
+        "tests/test_singularities.py",
+        "tests/test_symmetry.py",
+        "tests/test_multiple_integrals.py",
+        "tests/test_qmc_integration.py",
+        "tests/test_assumptions.py",
+        "tests/test_plotting.py",
+        "tests/test_interactive_plot.py",
+        "tests/test_riemann_animation.py",
+        "tests/test_headless_render.py",
+        "tests/test_display_canvas.py",
+        "tests/test_tex_render.py",
+        "tests/test_text_layout.py",
+        "tests/test_result_layout.py",
+        "tests/test_result_view.py",
+        "tests/test_results_panel.py",
+        "tests/test_expression_parser.py"
     ]
     
     # Check if test files exist
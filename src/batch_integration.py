@@ -0,0 +1,378 @@
+"""
+Batch definite integration
+Evaluates one integrand over many (a, b) bound pairs or parameter values at
+once, and samples cumulative integrals on a grid in a single pass.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import sympy as sp
+from sympy import integrate, symbols
+
+from integration_utils import (parse_function, lambdify_numpy, gauss_legendre, gauss_legendre_batch,
+                               run_with_timeout, apply_assumptions)
+from singularities import find_singular_points, singular_conditions, singular_roots
+
+
+def antiderivative(func, x):
+    """Return an antiderivative of func, or None when SymPy cannot find one."""
+    try:
+        F = integrate(func, x)
+    except Exception:
+        return None
+    if F.has(sp.Integral):
+        return None
+    return F
+
+
+def _limit_value(F, x, point, direction):
+    """One-sided limit of F at point as a float: ±inf when F diverges, nan
+    when the limit is undetermined or not real."""
+    try:
+        value = sp.limit(F, x, point, direction)
+    except Exception:
+        return np.nan
+    if value == sp.oo:
+        return np.inf
+    if value == -sp.oo:
+        return -np.inf
+    try:
+        return float(value)
+    except TypeError:
+        return np.nan
+
+
+def _antiderivative_values(F_np, t, ends):
+    """F at the points t, with the limits in ends (a dict from ±inf to the
+    limit of F there) at infinite points."""
+    with np.errstate(all='ignore'):
+        values = np.array(F_np(np.where(np.isfinite(t), t, 0.0)), dtype=float)
+    for point, value in ends.items():
+        values[t == point] = value
+    return values
+
+
+def _across_points(F, x, F_at, points, values, left, right):
+    """∫ over [left[i], right[i]] for intervals containing singular points.
+
+    points are the sorted singular points (SymPy values, their floats in
+    values). Each piece between them is F(r-) - F(l+), with one-sided limits
+    at the points (computed once per point), so divergent pieces give ±inf
+    or nan and convergent improper integrals (1/sqrt(x) on [0, 1]) their
+    value. F_at evaluates F at the bounds.
+    """
+    below = np.array([_limit_value(F, x, p, '-') for p in points])
+    above = np.array([_limit_value(F, x, p, '+') for p in points])
+    start = F_at(left)
+    end = F_at(right)
+    first = np.searchsorted(values, left, side='left')
+    last = np.searchsorted(values, right, side='right')
+    results = np.empty(left.shape)
+    with np.errstate(all='ignore'):
+        for i in range(left.size):
+            low, high, jumps = start[i], end[i], 0.0
+            for k in range(first[i], last[i]):
+                if values[k] == left[i]:
+                    low = above[k]
+                elif values[k] == right[i]:
+                    high = below[k]
+                else:
+                    jumps += below[k] - above[k]
+            results[i] = high - low + jumps
+    return results
+
+
+# Distances (in units of the largest finite bound) where tails are checked
+_TAIL_POINTS = np.array([1e4, 1e6, 1e8])
+
+
+def _tail_decays(f_np, direction, scale):
+    """Whether f decays at least like |x|^-1.5 toward direction * inf.
+
+    Checked at a few far points, so that the mapped quadrature is only
+    trusted for tails that converge; 1, 1/x or sin(x) fail.
+    """
+    t = direction * max(scale, 1.0) * _TAIL_POINTS
+    with np.errstate(all='ignore'):
+        weighted = np.abs(f_np(t)) * np.abs(t) ** 1.5
+    return bool(np.all(np.isfinite(weighted)) and np.all(np.diff(weighted) <= 0))
+
+
+def _end_value(F, x, F_np, end, scale):
+    """Limit of F at the infinite end (±inf). An infinite limit is checked
+    against F at a few far points, as SymPy gets the sign of some wrong
+    (li(x) - x/log(x)); nan when they disagree."""
+    direction = 1.0 if end > 0 else -1.0
+    value = _limit_value(F, x, _sympy_bound(end), '-' if end > 0 else '+')
+    if np.isinf(value):
+        with np.errstate(all='ignore'):
+            far = F_np(direction * max(scale, 1.0) * _TAIL_POINTS)
+            # F must move toward the limit (or overflow to it)
+            toward = (np.diff(far) * value > 0) | (far[1:] == value)
+        if not np.all(toward):
+            return np.nan
+    return value
+
+
+def _sympy_bound(value):
+    """SymPy number for a float bound, ±oo for infinite ones."""
+    if np.isinf(value):
+        return sp.oo if value > 0 else -sp.oo
+    return sp.Float(value)
+
+
+def definite_integrals_batch(func, lower, upper, x=None, nodes=20, panels=8):
+    """Compute the definite integral of func for every (lower[i], upper[i]) pair.
+
+    The antiderivative is computed once and evaluated vectorized as
+    F(b) - F(a), with F at infinite bounds taken as a limit (once per
+    infinite end). Pairs whose interval contains a singular point of func
+    or F are evaluated piece by piece with one-sided limits of F at the
+    points, so divergent integrals give inf or nan. Finite pairs without
+    singular points where F(b) - F(a) is not finite, and all pairs when no
+    antiderivative exists, are computed with vectorized Gauss-Legendre
+    quadrature instead; pairs containing a singular point of func, and
+    infinite pairs whose integrand does not decay fast enough, then give
+    nan. The integrand may only depend on x.
+
+    Returns a NumPy array with the broadcast shape of lower and upper.
+    """
+    x = x if x is not None else symbols('x')
+    func = parse_function(func)
+    unbound = func.free_symbols - {x}
+    if unbound:
+        raise ValueError(f"No values given for {', '.join(sorted(s.name for s in unbound))}")
+
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    lower, upper = np.broadcast_arrays(lower, upper)
+    a = lower.ravel()
+    b = upper.ravel()
+    results = np.full(a.shape, np.nan)
+    defined = ~(np.isnan(a) | np.isnan(b))
+    if not defined.any():
+        return results.reshape(lower.shape)
+
+    needs_quadrature = defined.copy()
+    finite = np.isfinite(a) & np.isfinite(b)
+    left = np.minimum(a, b)
+    right = np.maximum(a, b)
+    sign = np.where(a <= b, 1.0, -1.0)
+    scale = float(np.max(np.abs(np.concatenate([a[finite], b[finite]])), initial=1.0))
+
+    lo = _sympy_bound(min(a[defined].min(), b[defined].min()))
+    hi = _sympy_bound(max(a[defined].max(), b[defined].max()))
+    # Poles and branch points of the integrand itself: quadrature across
+    # them would return a finite number for a divergent integral
+    poles = find_singular_points(func, x, lo, hi)
+    F = antiderivative(func, x)
+    jumps = find_singular_points(F, x, lo, hi) if F is not None and poles is not None else None
+    if jumps is not None:
+        points = sorted(set(poles) | set(jumps), key=float)
+    else:
+        points = poles
+    if points is not None:
+        values = np.array([float(p) for p in points], dtype=float)
+        # An interval is unsafe when a singular point lies inside it
+        # or on one of its ends
+        idx_left = np.searchsorted(values, left, side='left')
+        idx_right = np.searchsorted(values, right, side='right')
+        safe = defined & (idx_left == idx_right)
+        unsafe = defined & ~safe
+        needs_quadrature[unsafe] = False
+        if jumps is not None:
+            F_np = lambdify_numpy(F, x)
+            ends = {end: _end_value(F, x, F_np, end, scale)
+                    for end in (np.inf, -np.inf) if np.any((a == end) | (b == end))}
+
+            def F_at(t):
+                return _antiderivative_values(F_np, t, ends)
+
+            if safe.any():
+                with np.errstate(all='ignore'):
+                    safe_values = F_at(b[safe]) - F_at(a[safe])
+                results[safe] = safe_values
+                # Limits at infinite ends are trusted, divergence included
+                needs_quadrature[safe] = ~np.isfinite(safe_values) & finite[safe]
+            if unsafe.any():
+                results[unsafe] = sign[unsafe] * _across_points(
+                    F, x, F_at, points, values, left[unsafe], right[unsafe])
+
+    if needs_quadrature.any():
+        f_np = lambdify_numpy(func, x)
+        for end in (np.inf, -np.inf):
+            tail = needs_quadrature & ((a == end) | (b == end))
+            if tail.any() and not _tail_decays(f_np, 1.0 if end > 0 else -1.0, scale):
+                needs_quadrature[tail] = False
+        if needs_quadrature.any():
+            results[needs_quadrature] = gauss_legendre_batch(
+                f_np, a[needs_quadrature], b[needs_quadrature], nodes=nodes, panels=panels)
+
+    return results.reshape(lower.shape)
+
+
+def iter_cumulative_integral(func, a, b, n, x=None, method='gauss', nodes=5, chunk_size=65536):
+    """Stream F(t) = ∫ₐᵗ f dx on a uniform grid of n points from a to b.
+
+    Yields (grid_chunk, values_chunk) pairs in order. Each grid cell is
+    integrated once (per-cell Gauss-Legendre, or composite Simpson with
+    method='simpson') and the running total is carried between chunks, so
+    the work is O(n) and memory is bounded by chunk_size.
+    """
+    if method not in ('gauss', 'simpson'):
+        raise ValueError(f"Unknown method: {method}")
+    if n < 1:
+        return
+    x = x if x is not None else symbols('x')
+    f_np = lambdify_numpy(parse_function(func), x)
+    a = float(sp.sympify(a))
+    b = float(sp.sympify(b))
+    h = (b - a) / (n - 1) if n > 1 else 0.0
+
+    if method == 'gauss':
+        t, w = gauss_legendre(nodes)
+        offsets = (t + 1.0) * h / 2.0
+        weights = w * h / 2.0
+
+    running = 0.0
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        grid = a + h * np.arange(start, stop, dtype=float)
+        # Cell i spans [grid[i] - h, grid[i]]; the first grid point has no cell
+        left = grid - h
+        if method == 'gauss':
+            cells = f_np(left[:, None] + offsets[None, :]) @ weights
+        else:
+            cells = h / 6.0 * (f_np(left) + 4.0 * f_np(left + h / 2.0) + f_np(grid))
+        if start == 0:
+            cells[0] = 0.0
+        values = running + np.cumsum(cells)
+        running = values[-1]
+        yield grid, values
+
+
+def cumulative_integral(func, a, b, n, x=None, method='gauss', nodes=5, chunk_size=65536):
+    """Return (grid, F) with F[i] = ∫ₐ^grid[i] f dx sampled on n grid points."""
+    grids = []
+    values = []
+    for grid_chunk, value_chunk in iter_cumulative_integral(func, a, b, n, x=x, method=method,
+                                                            nodes=nodes, chunk_size=chunk_size):
+        grids.append(grid_chunk)
+        values.append(value_chunk)
+    if not grids:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(grids), np.concatenate(values)
+
+
+def _sweep_quadrature(f_np, a, b, param_values, nodes, panels):
+    """Quadrature of f(x, *params) on [a, b] for one chunk of parameter points."""
+    columns = [values[:, None] for values in param_values]
+    count = param_values[0].shape[0] if param_values else 1
+    lower = np.full(count, a)
+    upper = np.full(count, b)
+    return gauss_legendre_batch(lambda xs: f_np(xs, *columns), lower, upper,
+                                nodes=nodes, panels=panels)
+
+
+def _sweep_singular(func, x, symbols_list, a, b, param_values, samples=257):
+    """Mask of the parameter points where func has a pole or branch point
+    in [a, b].
+
+    The roots of singular_roots are solved for x once and evaluated for all
+    points. When they have no closed form (tan(k*x)), the conditions that
+    vanish there are checked for a zero or a sign change on a grid, and
+    when those are unknown too, func for a non-finite value. The grid
+    checks need finite bounds.
+    """
+    count = param_values[0].shape[0] if param_values else 1
+    lo, hi = min(a, b), max(a, b)
+    singular = np.zeros(count, dtype=bool)
+    roots = singular_roots(func, x)
+    if roots is not None:
+        for root in roots:
+            # Complex roots evaluate to nan and are never inside
+            values = lambdify_numpy(root, symbols_list)(*param_values)
+            singular |= (values >= lo) & (values <= hi)
+        return singular
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        return singular
+
+    xs = np.linspace(lo, hi, samples)[None, :]
+    columns = [values[:, None] for values in param_values]
+    conditions = singular_conditions(func, x)
+    if conditions is None:
+        values = lambdify_numpy(func, [x] + symbols_list)(xs, *columns)
+        return ~np.all(np.isfinite(values), axis=1)
+    for condition in conditions:
+        values = lambdify_numpy(condition, [x] + symbols_list)(xs, *columns)
+        with np.errstate(invalid='ignore'):
+            crossing = np.sign(values[:, 1:]) * np.sign(values[:, :-1]) <= 0
+        singular |= np.any(crossing, axis=1) | ~np.all(np.isfinite(values), axis=1)
+    return singular
+
+
+def parameter_sweep(func, a, b, params, x=None, assumptions=None, timeout=10.0, nodes=20, panels=8,
+                    chunk_size=4096, workers=None):
+    """Evaluate ∫ₐᵇ func dx over a grid of parameter values.
+
+    params maps each parameter (a Symbol or its name) to a 1-D array of
+    values; the grid is their outer product, in the order given. The
+    integral is computed once with the parameters kept symbolic (given up
+    after timeout seconds) and the result is evaluated vectorized over the
+    grid. Grid points where the symbolic form is missing, undefined or not
+    real are integrated numerically, in chunks spread over a thread pool,
+    except where the integrand has a pole or branch point in [a, b]; those
+    give nan. Infinite values from the symbolic form are kept, they mark
+    divergence.
+    Declaring assumptions for the parameters (e.g. {"k": "positive"}) keeps
+    SymPy from splitting the result into a large Piecewise.
+
+    Returns an array of shape (len(values_1), len(values_2), ...).
+    """
+    x = apply_assumptions(x if x is not None else symbols('x'), assumptions)
+    func = parse_function(func, assumptions)
+    by_name = {s.name: s for s in func.free_symbols}
+    symbols_list = [by_name.get(str(p), apply_assumptions(sp.Symbol(str(p)), assumptions))
+                    for p in params]
+    unbound = func.free_symbols - {x} - set(symbols_list)
+    if unbound:
+        raise ValueError(f"No values given for {', '.join(sorted(s.name for s in unbound))}")
+    grids = np.meshgrid(*[np.asarray(v, dtype=float) for v in params.values()], indexing='ij')
+    shape = grids[0].shape if grids else ()
+    flat = [g.ravel() for g in grids]
+    a = float(sp.sympify(a))
+    b = float(sp.sympify(b))
+
+    results = np.full(int(np.prod(shape)), np.nan)
+    limits = (x, a if np.isfinite(a) else sp.sign(a) * sp.oo,
+              b if np.isfinite(b) else sp.sign(b) * sp.oo)
+    try:
+        finished, symbolic = run_with_timeout(integrate, timeout, func, limits)
+    except Exception:
+        finished, symbolic = False, None
+    if finished:
+        # Branches SymPy could not evaluate (e.g. the "otherwise" case of a
+        # Piecewise) become nan and are integrated numerically below
+        symbolic = symbolic.replace(lambda e: isinstance(e, sp.Integral), lambda e: sp.nan)
+        try:
+            results[:] = lambdify_numpy(symbolic, symbols_list)(*flat)
+        except Exception:
+            pass
+
+    failed = np.flatnonzero(np.isnan(results))
+    if failed.size:
+        # Quadrature across a pole returns a finite number for a divergent integral
+        singular = _sweep_singular(func, x, symbols_list, a, b, [values[failed] for values in flat])
+        failed = failed[~singular]
+    if failed.size:
+        f_np = lambdify_numpy(func, [x] + symbols_list)
+        chunks = [failed[i:i + chunk_size] for i in range(0, failed.size, chunk_size)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sweep_quadrature, f_np, a, b,
+                                   [values[chunk] for values in flat], nodes, panels)
+                       for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                results[chunk] = future.result()
+
+    return results.reshape(shape)
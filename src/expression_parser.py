@@ -0,0 +1,308 @@
+"""
+Expression parser
+Parses the calculator's input syntax in one pass with a precedence-climbing
+(Pratt) parser and builds SymPy objects directly, so no Python code is
+evaluated. Accepts ^ and ** for powers, × ÷ · for products and quotients,
+√, π, ∞, superscript exponents (x²), factorials (n!), implicit
+multiplication (2x, 3(x+1), (x+1)(x-1), x y) and the elementary and
+special functions in FUNCTIONS by name. A number is never multiplied
+implicitly from the right: x2, x.5 and 2 3 are syntax errors (write 2x or
+x*2). A name written directly before a parenthesis that is not a known
+function is always an undefined function, as f(x) in SymPy, even when it is
+declared as a symbol; write x*(x+1) or x (x+1) for a product.
+
+Syntax errors raise ParseError with the position in the text, as do input
+nested more than MAX_DEPTH levels deep, integers (literals and powers of
+numbers) of more than MAX_DIGITS digits and too large arguments of the
+functions SymPy evaluates exactly for integers (factorial, gamma, zeta,
+...; see INTEGER_VALUED), which would take too long to compute or print.
+"""
+
+import math
+import re
+
+import sympy as sp
+
+
+class ParseError(ValueError):
+    """Syntax error in an expression; position is the index in the text."""
+
+    def __init__(self, message, position, text=""):
+        super().__init__(f"{message} (column {position + 1})")
+        self.message = message
+        self.position = position
+        self.text = text
+
+
+_SUPERSCRIPTS = '⁰¹²³⁴⁵⁶⁷⁸⁹'
+
+TOKEN = re.compile(rf"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<superscript>[{_SUPERSCRIPTS}]+)
+      | (?P<name>[^\W\d{_SUPERSCRIPTS}π]+)
+      | (?P<op>\*\*|[-+*/^()×÷·,!√−∞π])
+    )""", re.VERBOSE)
+
+SUPERSCRIPT_DIGITS = str.maketrans(_SUPERSCRIPTS, '0123456789')
+
+# Binding powers: higher binds tighter; ^ is right-associative
+SUM, PRODUCT, UNARY, POWER, POSTFIX = 10, 20, 30, 40, 50
+INFIX = {'+': SUM, '-': SUM, '−': SUM,
+         '*': PRODUCT, '×': PRODUCT, '·': PRODUCT, '/': PRODUCT, '÷': PRODUCT,
+         '^': POWER, '**': POWER}
+NEGATIVE = ('-', '−')
+DIVIDE = ('/', '÷')
+
+MAX_DEPTH = 100
+# Python prints integers of up to 4300 digits
+MAX_DIGITS = 4000
+
+CONSTANTS = {'pi': sp.pi, 'E': sp.E, 'I': sp.I, 'oo': sp.oo, 'zoo': sp.zoo,
+             'nan': sp.nan, 'EulerGamma': sp.EulerGamma, 'GoldenRatio': sp.GoldenRatio,
+             'Catalan': sp.Catalan}
+
+_ELEMENTARY = """
+    sin cos tan cot sec csc asin acos atan acot asec acsc atan2
+    sinh cosh tanh coth sech csch asinh acosh atanh acoth asech acsch
+    exp log sqrt cbrt root Abs sign floor ceiling frac Min Max re im arg conjugate
+"""
+# Left unevaluated for numeric arguments
+_SPECIAL = """
+    erf erfc erfi erfinv Si Ci Shi Chi Ei li Li expint E1 fresnels fresnelc sinc Heaviside
+    besselj bessely besseli besselk airyai airybi elliptic_k elliptic_e elliptic_f elliptic_pi
+    LambertW beta polylog
+"""
+# Evaluated exactly for integer arguments: the largest numeric argument
+# allowed (1000! has 2568 digits, zeta(200, 200) already more than 4300)
+_INTEGER_VALUED = {'factorial': 1000, 'binomial': 1000, 'gamma': 1000,
+                   'loggamma': 100, 'lowergamma': 100, 'uppergamma': 100,
+                   'digamma': 100, 'trigamma': 100, 'polygamma': 100, 'zeta': 100}
+
+FUNCTIONS = {name: getattr(sp, name) for name in (_ELEMENTARY + _SPECIAL).split() + list(_INTEGER_VALUED)}
+FUNCTIONS.update(abs=sp.Abs, ln=sp.log)
+INTEGER_VALUED = {FUNCTIONS[name]: limit for name, limit in _INTEGER_VALUED.items()}
+
+
+def tokenize(text):
+    """List of (kind, value, position) ending in ('end', None, len(text))"""
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        match = TOKEN.match(text, pos)
+        if match is None:
+            start = len(text) - len(text[pos:].lstrip())
+            raise ParseError(f"Unexpected character {text[start]!r}", start, text)
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        pos = match.end()
+    tokens.append(('end', None, len(text)))
+    return tokens
+
+
+class Parser:
+    """Parser of one text; see parse_expression"""
+
+    def __init__(self, text, symbols=None, evaluate=True):
+        self.text = text
+        self.symbols = symbols or {}
+        self.evaluate = evaluate
+        self.tokens = tokenize(text)
+        self.index = 0
+        self.depth = 0
+
+    def parse(self):
+        expr = self.expression(0)
+        if self.peek()[0] != 'end':
+            raise self.unexpected(self.peek())
+        return expr
+
+    def peek(self):
+        return self.tokens[self.index]
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, value, after=None):
+        kind, found, pos = self.peek()
+        if found != value or kind != 'op':
+            where = f" after {after}" if after else ""
+            raise ParseError(f"Expected {value!r}{where}", pos, self.text)
+        return self.advance()
+
+    def unexpected(self, token):
+        kind, value, pos = token
+        if kind == 'end':
+            return ParseError("Unexpected end of expression", pos, self.text)
+        return ParseError(f"Unexpected {value!r}", pos, self.text)
+
+    def starts_operand(self, token):
+        kind, value, _ = token
+        return kind in ('number', 'name') or value in ('(', '√', '∞', 'π')
+
+    def expression(self, rbp):
+        """Parse operators binding tighter than rbp"""
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ParseError("Expression nested too deeply", self.peek()[2], self.text)
+        left = self.prefix(self.advance())
+        while True:
+            token = self.peek()
+            kind, value, pos = token
+            if kind == 'op' and value in INFIX:
+                bp = INFIX[value]
+                if bp <= rbp:
+                    break
+                self.advance()
+                # Powers are right-associative
+                right = self.expression(bp - 1 if bp == POWER else bp)
+                left = self.infix(value, left, right, pos)
+            elif kind == 'superscript' or value == '!':
+                if POSTFIX <= rbp:
+                    break
+                self.advance()
+                if value == '!':
+                    left = self.factorial(left, pos)
+                else:
+                    left = self.power(left, sp.Integer(value.translate(SUPERSCRIPT_DIGITS)), pos)
+            elif self.starts_operand(token):
+                # Implicit multiplication
+                if PRODUCT <= rbp:
+                    break
+                if kind == 'number':
+                    # x2, x.5 and 2 3 are more likely typos than products
+                    raise ParseError(f"Missing operator before {value!r}", pos, self.text)
+                left = self.multiply(left, self.expression(PRODUCT))
+            else:
+                break
+        self.depth -= 1
+        return left
+
+    def prefix(self, token):
+        kind, value, pos = token
+        if kind == 'number':
+            if value.isdigit():
+                if len(value) > MAX_DIGITS:
+                    raise ParseError("Number too large", pos, self.text)
+                return sp.Integer(value)
+            return sp.Float(value)
+        if kind == 'name':
+            return self.name(value, pos)
+        if value == '(':
+            expr = self.expression(0)
+            self.expect(')')
+            return expr
+        if value in NEGATIVE:
+            return self.negate(self.expression(UNARY))
+        if value == '+':
+            return self.expression(UNARY)
+        if value == '√':
+            return sp.sqrt(self.expression(POWER - 1), **self.options())
+        if value == '∞':
+            return sp.oo
+        if value == 'π':
+            return sp.pi
+        raise self.unexpected(token)
+
+    def name(self, name, pos):
+        kind, value, following_pos = self.peek()
+        if kind == 'number' and following_pos == pos + len(name) and name + value in FUNCTIONS:
+            # Digits belong to the name only in function names such as atan2
+            self.advance()
+            name += value
+        following = self.peek()
+        if following[1] == '(' and following[2] == pos + len(name) and name not in CONSTANTS:
+            # f(x): a function call, an undefined function for unknown names
+            # as in SymPy (also for names declared as symbols)
+            self.advance()
+            return self.call(FUNCTIONS.get(name) or sp.Function(name), name, pos)
+        if name in self.symbols:
+            return self.symbols[name]
+        if name in FUNCTIONS:
+            self.expect('(', after=name)
+            return self.call(FUNCTIONS[name], name, pos)
+        if name in CONSTANTS:
+            return CONSTANTS[name]
+        return sp.Symbol(name)
+
+    def call(self, function, name, pos):
+        """Arguments after the opening parenthesis and the call"""
+        args = []
+        if self.peek()[1] != ')':
+            args.append(self.expression(0))
+            while self.peek()[1] == ',':
+                self.advance()
+                args.append(self.expression(0))
+        self.expect(')')
+        self.check_arguments(function, name, args, pos)
+        try:
+            return function(*args, **self.options())
+        except (TypeError, ValueError) as e:
+            raise ParseError(f"Invalid arguments for {name}: {e}", pos, self.text)
+
+    def options(self):
+        return {} if self.evaluate else {'evaluate': False}
+
+    def infix(self, op, left, right, pos):
+        if op in ('^', '**'):
+            return self.power(left, right, pos)
+        if op == '+':
+            return self.add(left, right)
+        if op in NEGATIVE:
+            return self.add(left, self.negate(right))
+        if op in DIVIDE:
+            if left is sp.S.One and not self.evaluate:
+                # 1/x as \frac{1}{x}, not 1 \frac{1}{x}
+                return self.power(right, sp.Integer(-1), pos)
+            return self.multiply(left, self.power(right, sp.Integer(-1), pos))
+        return self.multiply(left, right)
+
+    def add(self, left, right):
+        if self.evaluate:
+            return left + right
+        return sp.Add(*(left.args if left.is_Add else (left,)), right, evaluate=False)
+
+    def multiply(self, left, right):
+        if self.evaluate:
+            return left * right
+        return sp.Mul(*(left.args if left.is_Mul else (left,)), right, evaluate=False)
+
+    def power(self, base, exponent, pos):
+        if base.is_Rational and exponent.is_Rational and abs(base) not in (0, 1):
+            digits = abs(float(exponent)) * math.log10(max(abs(base.p), base.q))
+            if digits > MAX_DIGITS:
+                raise ParseError("Number too large", pos, self.text)
+        if self.evaluate:
+            return base ** exponent
+        return sp.Pow(base, exponent, evaluate=False)
+
+    def check_arguments(self, function, name, args, pos):
+        limit = INTEGER_VALUED.get(function)
+        if limit is not None and any(arg.is_Rational and abs(arg) > limit for arg in args):
+            raise ParseError(f"Argument of {name} too large", pos, self.text)
+
+    def factorial(self, arg, pos):
+        self.check_arguments(sp.factorial, 'factorial', [arg], pos)
+        return sp.factorial(arg, **self.options())
+
+    def negate(self, expr):
+        if self.evaluate or expr.is_Number:
+            return -expr
+        if expr.is_Mul and expr.args[0] == -1:
+            # --x
+            return sp.Mul(*expr.args[1:], evaluate=False) if len(expr.args) > 2 else expr.args[1]
+        return sp.Mul(sp.Integer(-1), expr, evaluate=False)
+
+
+def parse_expression(text, symbols=None, evaluate=True):
+    """SymPy expression of text in the calculator's syntax.
+
+    symbols maps names to the SymPy objects to use for them (e.g. symbols
+    with assumptions); other names become plain symbols, constants or
+    functions. evaluate=False keeps the expression as typed (x + x stays
+    x + x). Raises ParseError for a syntax error.
+    """
+    return Parser(text, symbols, evaluate).parse()
@@ -0,0 +1,143 @@
+"""
+Headless rendering of integrals to image files
+Writes the equation with its result and the plot of the integrand to PNG or
+SVG with Matplotlib's Agg canvas, for servers without a display. Batches are
+spread over a process pool. Neither this module nor any module it uses
+imports tkinter, so it runs where Tk is not installed; test_headless_render
+checks this.
+
+Usage: python src/headless_render.py "x^2" "sin(x)" --lower 0 --upper pi --out renders
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import mpmath
+import sympy as sp
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.mathtext import MathTextParser
+
+from integration_utils import parse_function, assumed_symbols
+from plotting import draw_integral
+from symbolic_integration import improved_integrate, simplify_expr, definite_integral
+
+FORMATS = ('png', 'svg')
+
+_mathtext_parser = MathTextParser('path')
+
+
+def mathtext_or_plain(latex, plain):
+    """latex as Matplotlib mathtext when it can be parsed, otherwise plain text"""
+    text = f"${latex}$"
+    try:
+        _mathtext_parser.parse(text)
+        return text
+    except Exception:
+        return plain
+
+
+def equation_text(func, x, integral, a=None, b=None, exact=None, numeric=None):
+    """Text of the integral equation and its result, e.g. ∫ₐᵇ f dx = value ≈ number"""
+    if a is None:
+        latex = rf"\int {sp.latex(func)}\,d{sp.latex(x)} = {sp.latex(integral)} + C"
+        plain = f"∫ {func} d{x} = {integral} + C"
+    else:
+        latex = rf"\int_{{{sp.latex(a)}}}^{{{sp.latex(b)}}} {sp.latex(func)}\,d{sp.latex(x)} = {sp.latex(exact)}"
+        plain = f"∫[{a}, {b}] {func} d{x} = {exact}"
+        if numeric is not None and not exact.is_Float and mpmath.isfinite(numeric):
+            approx = mpmath.nstr(numeric, 8)
+            latex += rf" \approx {approx}"
+            plain += f" ≈ {approx}"
+    return mathtext_or_plain(latex, plain)
+
+
+def render_integral(func, path, a=None, b=None, fmt=None, dpi=120, assumptions=None):
+    """Render the equation and the plot of one integral to path (PNG or SVG).
+
+    The format comes from fmt or the file extension. Bounds a and b make it
+    a definite integral. Returns path.
+    """
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.') or 'png').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}, use {', '.join(FORMATS)}")
+    x = assumed_symbols(assumptions).get('x', sp.Symbol('x'))
+    func = parse_function(func, assumptions)
+
+    if a is None or b is None:
+        a = b = None
+        integral = simplify_expr(improved_integrate(func, x))
+        text = equation_text(func, x, integral)
+    else:
+        a = parse_function(a, assumptions)
+        b = parse_function(b, assumptions)
+        integral, exact, numeric = definite_integral(func, x, a, b)
+        text = equation_text(func, x, integral, a, b, exact, numeric)
+
+    figure = Figure(figsize=(7, 4.5), dpi=dpi, facecolor='white')
+    FigureCanvasAgg(figure)
+    figure.text(0.5, 0.9, text, ha='center', va='center', fontsize=14)
+    ax = figure.add_axes([0.1, 0.12, 0.85, 0.65])
+    draw_integral(ax, func, x, a, b, integral)
+    figure.savefig(path, format=fmt)
+    return path
+
+
+def _render_job(job):
+    """Worker entry point: (func, path, a, b, fmt, dpi, assumptions) -> (path, error)"""
+    try:
+        return render_integral(*job), None
+    except Exception as e:
+        return job[1], f"{type(e).__name__}: {e}"
+
+
+def render_batch(inputs, out_dir, fmt='png', dpi=120, assumptions=None, workers=None):
+    """Render many integrals in parallel with a process pool.
+
+    inputs holds function strings (indefinite) or (func, a, b) tuples
+    (definite). Files are named integral_000.<fmt>, integral_001.<fmt>, ...
+    in out_dir. Returns the paths in input order, None for inputs that
+    failed (the error is printed).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for i, item in enumerate(inputs):
+        func, a, b = (item, None, None) if isinstance(item, str) else tuple(item)
+        path = os.path.join(out_dir, f"integral_{i:03d}.{fmt}")
+        jobs.append((func, path, a, b, fmt, dpi, assumptions))
+
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for job, (path, error) in zip(jobs, pool.map(_render_job, jobs)):
+            if error is not None:
+                print(f"Error: Could not render {job[0]}: {error}")
+                path = None
+            paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render integrals to PNG or SVG without a display")
+    parser.add_argument('functions', nargs='+', help='integrands, e.g. "x^2" "sin(x)"')
+    parser.add_argument('--lower', help='lower bound for definite integrals')
+    parser.add_argument('--upper', help='upper bound for definite integrals')
+    parser.add_argument('--out', default='renders', help='output directory')
+    parser.add_argument('--format', default='png', choices=FORMATS)
+    parser.add_argument('--dpi', type=int, default=120)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if (args.lower is None) != (args.upper is None):
+        parser.error("give both --lower and --upper, or neither")
+    inputs = [f if args.lower is None else (f, args.lower, args.upper) for f in args.functions]
+    paths = render_batch(inputs, args.out, args.format, args.dpi, workers=args.workers)
+    for func, path in zip(args.functions, paths):
+        if path is not None:
+            print(f"{func}: {path}")
+    return 0 if all(paths) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,34 @@
 import tkinter as tk
 import sympy as sp
-from sympy import symbols, integrate, sympify, simplify, expand, factor, cancel, trigsimp
-from sympy import tanh, cosh, sinh, log, exp, sin, cos
+from sympy import symbols, integrate
 import re
+import time
+import base64
+from collections import deque, OrderedDict
 from tkinter import font as tkfont
-from sympy import nsimplify, pi, E
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from precision_integration import definite_integral_precise
+from multiple_integrals import multiple_integral
+from integration_utils import parse_function, parse_assumptions, assumed_symbols
+from expression_parser import ParseError
+from symbolic_integration import (improved_integrate, simplify_expr, verify_antiderivative, definite_integral,
+                                  approximation_text)
+from interactive_plot import PanZoomPlot
+from riemann_animation import RULES, riemann_frames, RiemannAnimation
+from tex_render import (TEX_DPI, expression_latex, bounds_latex, integral_latex, tex_png, is_large,
+                        result_text)
+from text_layout import wrap_text, font_key
+from result_layout import FONTS as RESULT_FONTS, FontMetrics, layout_result, layout_image
+from results_panel import ResultsPanel, ResultEntry, shorten
 
 class IntegralCalculator:
     def __init__(self, root):
         self.root = root
         self.root.title("Calculate the Integral of ...")
-        self.root.geometry("800x600")
+        self.root.geometry("800x900")
         self.root.configure(bg='#F5F5DC')  # Cream background
         
         # Variables
@@ -19,6 +37,18 @@ class IntegralCalculator:
         self.integral_type_var = tk.StringVar(value="indefinite")
         self.lower_bound_var = tk.StringVar()
         self.upper_bound_var = tk.StringVar()
+        self.precision_var = tk.StringVar(value="4")  # Digits shown for definite results
+        self.variables_var = tk.StringVar(value="x")  # Integration variables, inner to outer
+        self.assumptions_var = tk.StringVar()  # Symbol assumptions, e.g. "k: positive"
+        self.assumptions = {}
+        self.riemann_rule_var = tk.StringVar(value="midpoint")  # Rule shown by the sum animation
+        self.riemann_animation = None
+        self.display_update_id = None  # Pending coalesced display redraw
+        self.keystroke_time = None  # Oldest keystroke not painted yet
+        self.display_latencies = deque(maxlen=200)  # Keystroke-to-paint times in seconds
+        self.tex_photos = OrderedDict()  # PhotoImages of rendered TeX, least recently used first
+        self.layout_metrics = None  # Font metrics of the result layouts, see result_metrics
+        self.results_panel = ResultsPanel(self.root)  # One window for all results, with history
         
         self.setup_ui()
         
@@ -82,7 +112,7 @@ class IntegralCalculator:
         self.input_entry = tk.Entry(input_frame, textvariable=self.function_var, 
                                    font=('Arial', 12), width=40, relief='solid', bd=1)
         self.input_entry.pack(side=tk.LEFT, padx=(0, 10))
-        self.input_entry.bind('<KeyRelease>', lambda e: self.update_display())
+        self.input_entry.bind('<KeyRelease>', self.schedule_display_update)
         
         # Go button
         go_btn = tk.Button(input_frame, text="Go!", font=('Arial', 10, 'bold'),
@@ -111,6 +141,15 @@ class IntegralCalculator:
                                    font=('Arial', 11), width=10, relief='solid', bd=1)
         self.upper_entry.pack(side=tk.LEFT)
         
+        # Precision of the numeric approximation ("4" keeps the 4 decimal display)
+        precision_label = tk.Label(self.bounds_frame, text="Digits:", 
+                                  font=('Arial', 11), bg='#F5F5DC', fg='#333333')
+        precision_label.pack(side=tk.LEFT, padx=(15, 5))
+        
+        precision_menu = tk.OptionMenu(self.bounds_frame, self.precision_var, "4", "15", "50", "100", "Interval")
+        precision_menu.config(font=('Arial', 10), bg='white', relief='solid', bd=1)
+        precision_menu.pack(side=tk.LEFT)
+        
         # Subtitle
         subtitle_label = tk.Label(main_frame, text="This will be calculated:", 
                                  font=('Arial', 12, 'bold'), bg='#F5F5DC', fg='#333333')
@@ -141,6 +180,150 @@ class IntegralCalculator:
         options_label = tk.Label(instructions_frame, text='"Options"', 
                                 font=('Arial', 9, 'underline'), bg='#F5F5DC', fg='#666666')
         options_label.place(x=200, y=20)
+        options_label.config(cursor='hand2')
+        options_label.bind('<Button-1>', lambda e: self.show_options_dialog())
+        
+        # Plot of the integrand with the integrated area shaded
+        self.create_plot_panel(main_frame)
+        
+    def create_plot_panel(self, parent):
+        """Create the embedded Matplotlib plot of f(x)"""
+        plot_frame = tk.Frame(parent, bg='#F5F5DC')
+        plot_frame.pack(fill=tk.BOTH, expand=True, pady=(15, 0))
+        
+        self.figure = Figure(figsize=(7, 2.8), dpi=100, facecolor='#F5F5DC')
+        self.plot_axes = self.figure.add_subplot(111)
+        self.plot_canvas = FigureCanvasTkAgg(self.figure, master=plot_frame)
+        self.plot_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.plot_view = PanZoomPlot(self.plot_canvas, self.plot_axes)
+        
+        controls_frame = tk.Frame(plot_frame, bg='#F5F5DC')
+        controls_frame.pack(fill=tk.X)
+        
+        # Riemann and trapezoid sums for the bounds entered above
+        rule_label = tk.Label(controls_frame, text="Sums:", 
+                             font=('Arial', 9), bg='#F5F5DC', fg='#333333')
+        rule_label.pack(side=tk.LEFT)
+        
+        rule_menu = tk.OptionMenu(controls_frame, self.riemann_rule_var, *RULES)
+        rule_menu.config(font=('Arial', 9), bg='white', relief='solid', bd=1)
+        rule_menu.pack(side=tk.LEFT, padx=(5, 5))
+        
+        animate_btn = tk.Button(controls_frame, text="Animate", font=('Arial', 9, 'bold'),
+                               bg='white', fg='#333333', relief='raised', bd=1,
+                               command=self.animate_riemann)
+        animate_btn.pack(side=tk.LEFT)
+        
+        plot_hint = tk.Label(controls_frame, text="Drag to pan, scroll to zoom", 
+                            font=('Arial', 9), bg='#F5F5DC', fg='#666666')
+        plot_hint.pack(side=tk.RIGHT)
+        
+    def animate_riemann(self):
+        """Animate the selected sum of the input function between the bounds as n grows"""
+        try:
+            func = parse_function(self.function_var.get(), self.assumptions)
+            a = self.parse_bound(self.lower_bound_var.get())
+            b = self.parse_bound(self.upper_bound_var.get())
+            frames = riemann_frames(func, self.x, a, b, rule=self.riemann_rule_var.get())
+        except Exception as e:
+            print(f"Info: Sums need a function and finite bounds: {str(e)}")
+            return
+        try:
+            exact = float(definite_integral_precise(func, a, b, x=self.x))
+        except Exception:
+            exact = None
+        
+        self.update_plot(func, a, b)
+        self.riemann_animation = RiemannAnimation(self.plot_axes, frames, self.plot_view.refresh,
+                                                  exact=exact)
+        for artist in self.riemann_animation.artists:
+            self.plot_view.add_overlay(artist)
+        self.riemann_animation.start()
+        
+    def update_plot(self, func, a=None, b=None, antiderivative=None):
+        """Plot func and its antiderivative, shading the area between the bounds (if given)"""
+        if self.riemann_animation is not None:
+            self.riemann_animation.remove()
+            self.riemann_animation = None
+        try:
+            self.plot_view.show(func, self.x, a, b, antiderivative)
+            self.figure.tight_layout()
+        except Exception as e:
+            print(f"Info: Could not plot {func}: {str(e)}")
+        
+    def show_options_dialog(self):
+        """Show the Options window for integration variables and order"""
+        options_window = tk.Toplevel(self.root)
+        options_window.title("Options")
+        options_window.configure(bg='#F5F5DC')
+        options_window.transient(self.root)
+        
+        frame = tk.Frame(options_window, bg='#F5F5DC', padx=15, pady=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        variables_label = tk.Label(frame, text="Integration variables (inner to outer):", 
+                                  font=('Arial', 11, 'bold'), bg='#F5F5DC', fg='#333333')
+        variables_label.grid(row=0, column=0, sticky='w')
+        
+        variables_entry = tk.Entry(frame, textvariable=self.variables_var, 
+                                  font=('Arial', 11), width=20, relief='solid', bd=1)
+        variables_entry.grid(row=0, column=1, padx=(10, 0))
+        
+        hint_label = tk.Label(frame, 
+                             text='e.g. "y, x" for ∫∫ f dy dx. For definite integrals enter one bound\n'
+                                  'per variable in the same order, separated by commas (e.g. 0, 0 and x, 1).',
+                             font=('Arial', 9), bg='#F5F5DC', fg='#666666', justify='left')
+        hint_label.grid(row=1, column=0, columnspan=2, sticky='w', pady=(5, 10))
+        
+        assumptions_label = tk.Label(frame, text="Assumptions:", 
+                                    font=('Arial', 11, 'bold'), bg='#F5F5DC', fg='#333333')
+        assumptions_label.grid(row=2, column=0, sticky='w')
+        
+        assumptions_entry = tk.Entry(frame, textvariable=self.assumptions_var, 
+                                    font=('Arial', 11), width=20, relief='solid', bd=1)
+        assumptions_entry.grid(row=2, column=1, padx=(10, 0))
+        
+        assumptions_hint = tk.Label(frame, 
+                                   text='e.g. "k: positive; n: integer nonzero". Available: positive, real,\n'
+                                        'integer, nonzero. Parameters with assumptions avoid case splits.',
+                                   font=('Arial', 9), bg='#F5F5DC', fg='#666666', justify='left')
+        assumptions_hint.grid(row=3, column=0, columnspan=2, sticky='w', pady=(5, 0))
+        
+        error_label = tk.Label(frame, text="", font=('Arial', 9), bg='#F5F5DC', fg='#B22222')
+        error_label.grid(row=4, column=0, columnspan=2, sticky='w', pady=(0, 10))
+        
+        def close():
+            try:
+                self.set_assumptions(self.assumptions_var.get())
+            except ValueError as e:
+                error_label.config(text=str(e))
+                return
+            options_window.destroy()
+            self.update_display()
+        
+        close_btn = tk.Button(frame, text="Close", font=('Arial', 10, 'bold'),
+                            bg='#4169E1', fg='white', relief='raised', bd=1,
+                            command=close)
+        close_btn.grid(row=5, column=0, columnspan=2)
+    
+    def set_assumptions(self, text):
+        """Declare symbol assumptions (e.g. "x: real; k: positive") and rebuild self.x"""
+        self.assumptions = parse_assumptions(text)
+        self.x = assumed_symbols(self.assumptions).get('x', symbols('x'))
+        
+    def integration_variables(self):
+        """Return the integration variables as SymPy symbols, inner to outer"""
+        names = [n for n in re.split(r'[,\s]+', self.variables_var.get()) if n] or ['x']
+        declared = assumed_symbols(self.assumptions)
+        return [self.x if name == 'x' else declared.get(name, symbols(name)) for name in names]
+    
+    def integral_sign_text(self):
+        """One ∫ per integration variable"""
+        return "∫" * len(self.integration_variables())
+    
+    def differential_text(self):
+        """Differentials in integration order, e.g. 'dx dy'"""
+        return " ".join(f"d{v}" for v in self.integration_variables())
         
     def create_display_box(self, parent):
         """Create the display box with grid background and integral symbol"""
@@ -159,35 +342,96 @@ class IntegralCalculator:
                                  font=('Arial', 8), bg='#F5F5DC', fg='#999999')
         self.tex_label.place(x=250, y=220)
         
-        # Create grid pattern
+        # Create grid pattern (redrawn only when the canvas size changes)
+        self.grid_size = None
         self.create_grid_pattern()
         
         # Create integral symbol and expression
+        self.create_display_items()
+        self.display_state = None
         self.create_integral_display()
         
+    def create_display_items(self):
+        """Create the widgets and canvas items of the display once.
+        
+        create_integral_display only changes their text, colors and
+        positions, so typing creates no new widgets or items.
+        """
+        canvas = self.display_canvas
+        items = {}
+        
+        # Proper integral symbol (∫) at a fixed left position
+        items['integral_label'] = tk.Label(canvas, text="∫", 
+                                          font=('Times New Roman', 80, 'bold'), 
+                                          bg='white', fg='#333333')
+        items['integral'] = canvas.create_window(100, 100, window=items['integral_label'], tags="integral")
+        
+        # Bound boxes and values
+        items['upper_box'] = canvas.create_rectangle(90, 25, 100, 35, tags="integral")
+        items['upper_text'] = canvas.create_text(95, 30, text="", font=('Arial', 10, 'bold'), 
+                                                 fill='#333333', tags="integral")
+        items['lower_box'] = canvas.create_rectangle(90, 165, 100, 175, tags="integral")
+        items['lower_text'] = canvas.create_text(95, 170, text="", font=('Arial', 10, 'bold'), 
+                                                 fill='#333333', tags="integral")
+        
+        # Typeset integral, shown instead of the items above when it renders
+        items['tex'] = canvas.create_image(40, 100, anchor='w', state='hidden', tags="integral")
+        
+        # Function expression
+        items['function'] = canvas.create_text(200, 100, text="", font=('Arial', 16, 'bold'), 
+                                               fill='#333333', tags="integral")
+        
+        # dx box
+        dx_frame = tk.Frame(canvas, bg='#F0F0F0', relief='solid', bd=1)
+        items['dx_label'] = tk.Label(dx_frame, text="dx", font=('Arial', 12, 'bold'), 
+                                     bg='#F0F0F0', fg='#333333')
+        items['dx_label'].pack(padx=5, pady=2)
+        items['dx'] = canvas.create_window(300, 100, window=dx_frame, tags="integral")
+        
+        self.display_items = items
+        
     def create_grid_pattern(self):
-        """Create a subtle grid pattern on the canvas"""
+        """Create a subtle grid pattern on the canvas, once per canvas size"""
         # Get current canvas dimensions
         canvas_width = self.display_canvas.winfo_reqwidth()
         canvas_height = 200
+        if self.grid_size == (canvas_width, canvas_height):
+            return
+        self.display_canvas.delete("grid")
         
-        # Draw grid lines
+        # Draw grid lines behind everything else
         for i in range(0, canvas_width, 20):
-            self.display_canvas.create_line(i, 0, i, canvas_height, fill='#F0F0F0', width=1)
+            self.display_canvas.create_line(i, 0, i, canvas_height, fill='#F0F0F0', width=1, tags="grid")
         for i in range(0, canvas_height, 20):
-            self.display_canvas.create_line(0, i, canvas_width, i, fill='#F0F0F0', width=1)
+            self.display_canvas.create_line(0, i, canvas_width, i, fill='#F0F0F0', width=1, tags="grid")
+        self.display_canvas.tag_lower("grid")
+        self.grid_size = (canvas_width, canvas_height)
+    
+    def display_item_count(self):
+        """Number of items on the display canvas; stays bounded while typing"""
+        return len(self.display_canvas.find_all())
             
     def create_integral_display(self):
         """Create the integral symbol and mathematical expression"""
-        # Clear previous drawings
-        self.display_canvas.delete("integral")
-        
         # Get function text
         func_text = self.function_var.get()
         
         # Convert function to proper mathematical notation
         display_text = self.convert_to_math_notation(func_text)
         
+        # Nothing to redraw when the displayed content did not change
+        # (e.g. cursor keys or Shift in the input field)
+        state = (display_text, self.integral_type_var.get(), self.lower_bound_var.get(),
+                 self.upper_bound_var.get(), self.variables_var.get())
+        if state == self.display_state:
+            return
+        self.display_state = state
+        
+        # Typeset the integral with TeX when all of it parses, otherwise use
+        # the Unicode layout below
+        photo = self.display_tex_photo()
+        self.display_photo = photo
+        
         # Calculate required width based on function length
         # Base width for integral symbol, bounds, dx, and generous spacing
         base_width = 300  # More space for integral symbol + bounds + dx + generous spacing
@@ -199,6 +443,8 @@ class IntegralCalculator:
         max_width = 1600  # Increased maximum for very long equations
         # Calculate total width
         total_width = max(min_width, min(max_width, base_width + function_width))
+        if photo is not None:
+            total_width = max(min_width, min(max_width, photo.width() + 80))
         
         # Resize canvas
         self.display_canvas.config(width=total_width)
@@ -206,155 +452,87 @@ class IntegralCalculator:
         # Recreate grid pattern with new width
         self.create_grid_pattern()
         
-        # Create proper integral symbol (∫) - positioned at fixed left position
-        integral_label = tk.Label(self.display_canvas, text="∫", 
-                                 font=('Times New Roman', 80, 'bold'), 
-                                 bg='white', fg='#333333')
-        self.display_canvas.create_window(100, 100, window=integral_label, tags="integral")
+        # Update the fixed display items: only their text, colors and positions change
+        items = self.display_items
+        items['integral_label'].config(text=self.integral_sign_text())
         
-        # Add bounds - show actual values if definite integral, placeholders if indefinite
+        # Bounds - show actual values if definite integral, placeholders if indefinite
         if self.integral_type_var.get() == "definite":
             # Show actual bound values
             lower_bound = self.lower_bound_var.get() or "a"
             upper_bound = self.upper_bound_var.get() or "b"
-            
-            # Upper bound
-            self.display_canvas.create_rectangle(90, 25, 100, 35, fill='white', 
-                                                 outline='#333333', tags="integral")
-            self.display_canvas.create_text(95, 30, text=upper_bound, 
-                                           font=('Arial', 10, 'bold'), fill='#333333', tags="integral")
-            
-            # Lower bound
-            self.display_canvas.create_rectangle(90, 165, 100, 175, fill='white', 
-                                                 outline='#333333', tags="integral")
-            self.display_canvas.create_text(95, 170, text=lower_bound, 
-                                           font=('Arial', 10, 'bold'), fill='#333333', tags="integral")
+            box_style = {'fill': 'white', 'outline': '#333333'}
         else:
             # Show placeholder squares for indefinite integral
-            self.display_canvas.create_rectangle(90, 25, 100, 35, fill='#E0E0E0', 
-                                                 outline='#CCCCCC', tags="integral")
-            self.display_canvas.create_rectangle(90, 165, 100, 175, fill='#E0E0E0', 
-                                                 outline='#CCCCCC', tags="integral")
+            lower_bound = upper_bound = ""
+            box_style = {'fill': '#E0E0E0', 'outline': '#CCCCCC'}
+        self.display_canvas.itemconfig(items['upper_box'], **box_style)
+        self.display_canvas.itemconfig(items['lower_box'], **box_style)
+        self.display_canvas.itemconfig(items['upper_text'], text=upper_bound)
+        self.display_canvas.itemconfig(items['lower_text'], text=lower_bound)
         
         # Function expression - positioned well after integral symbol to avoid overlap
         func_x = 200  # Further increased distance from integral symbol for longer equations
-        # Display function as regular text
-        self.display_canvas.create_text(func_x, 100, text=f"({display_text})", 
-                                       font=('Arial', 16, 'bold'), fill='#333333', 
-                                       tags="integral")
+        self.display_canvas.itemconfig(items['function'], text=f"({display_text})")
         
         # dx box - positioned after function with proper spacing
-        dx_frame = tk.Frame(self.display_canvas, bg='#F0F0F0', relief='solid', bd=1)
-        dx_label = tk.Label(dx_frame, text="dx", font=('Arial', 12, 'bold'), 
-                           bg='#F0F0F0', fg='#333333')
-        dx_label.pack(padx=5, pady=2)
+        items['dx_label'].config(text=self.differential_text())
         
         # Calculate dx position based on function width
         func_width = len(f"({display_text})") * 10 + 20  # Approximate character width
         dx_x = func_x + func_width + 20  # Add spacing after function
-        self.display_canvas.create_window(dx_x, 100, window=dx_frame, tags="integral")
+        self.display_canvas.coords(items['dx'], dx_x, 100)
+        
+        # Show either the typeset integral or the Unicode items
+        unicode_state = 'normal' if photo is None else 'hidden'
+        for name in ('integral', 'upper_box', 'upper_text', 'lower_box', 'lower_text', 'function', 'dx'):
+            self.display_canvas.itemconfig(items[name], state=unicode_state)
+        self.display_canvas.itemconfig(items['tex'], image=photo or '',
+                                       state='hidden' if photo is None else 'normal')
         
-        # Reposition TeX label to stay at right edge
+        # Reposition TeX label to stay at right edge, dark while TeX is shown
+        self.tex_label.config(fg='#999999' if photo is None else '#333333')
         self.tex_label.place(x=total_width - 50, y=220)
+        
+    def tex_photo(self, latex, size=16):
+        """PhotoImage of the LaTeX typeset with mathtext, or None when it
+        cannot be typeset. Rendering is cached by (latex, size, dpi) in
+        tex_png; the last 64 PhotoImages are kept here as well.
+        """
+        key = (latex, size, TEX_DPI)
+        if key in self.tex_photos:
+            self.tex_photos.move_to_end(key)
+            return self.tex_photos[key]
+        png = tex_png(latex, size, TEX_DPI)
+        if png is None:
+            return None
+        photo = tk.PhotoImage(master=self.root, data=base64.b64encode(png))
+        self.tex_photos[key] = photo
+        if len(self.tex_photos) > 64:
+            self.tex_photos.popitem(last=False)
+        return photo
+        
+    def display_tex_photo(self):
+        """Typeset integral for the display, or None while the function or a
+        bound does not parse"""
+        integrand = expression_latex(self.function_var.get())
+        if integrand is None:
+            return None
+        variables = self.integration_variables()
+        lower = upper = None
+        if self.integral_type_var.get() == "definite":
+            # Placeholders a and b until bounds are typed
+            lower_text = self.lower_bound_var.get().strip() or ",".join("a" * len(variables))
+            upper_text = self.upper_bound_var.get().strip() or ",".join("b" * len(variables))
+            lower = bounds_latex(lower_text, len(variables))
+            upper = bounds_latex(upper_text, len(variables))
+            if lower is None or upper is None:
+                return None
+        return self.tex_photo(integral_latex(integrand, variables, lower, upper), 24)
     
     def improved_integrate(self, func, x):
         """Enhanced integration function that handles special cases better"""
-        try:
-            # First try standard integration
-            result = integrate(func, x)
-            
-            # Apply simplification and canonical forms for better accuracy
-            result = self.simplify_and_canonicalize(result, func, x)
-            
-            # Verify antiderivative; try manualintegrate if needed
-            if not self.verify_antiderivative(func, result, x):
-                try:
-                    from sympy.integrals.manualintegrate import manualintegrate
-                    alt = manualintegrate(func, x)
-                    alt = self.simplify_expr(alt)
-                    if self.verify_antiderivative(func, alt, x):
-                        return alt
-                except Exception:
-                    pass
-            
-            return result
-            
-        except Exception as e:
-            # If standard integration fails, try alternative methods
-            return self.handle_special_cases(func, x)
-    
-    def simplify_and_canonicalize(self, result, original_func, x):
-        """Simplify and canonicalize the integration result for better accuracy"""
-        # Apply various simplification techniques
-        result = simplify(result)
-        result = expand(result)
-        result = factor(result)
-        result = cancel(result)
-        
-        # For trigonometric results, try trigonometric simplification
-        if any(trig in str(result) for trig in ['sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh']):
-            result = trigsimp(result)
-        
-        return result
-    
-    def handle_special_cases(self, func, x):
-        """Handle special cases that might not integrate well with standard methods"""
-        func_str = str(func)
-        
-        # Handle hyperbolic tangent specifically
-        if 'tanh' in func_str:
-            return self.handle_tanh_integration(func, x)
-        
-        # Handle complex exponential-trigonometric products
-        if 'exp' in func_str and ('sin' in func_str or 'cos' in func_str):
-            return self.handle_exponential_trigonometric(func, x)
-        
-        # Default fallback
-        return integrate(func, x)
-    
-    def handle_tanh_integration(self, func, x):
-        """Special handling for tanh(x) integration"""
-        try:
-            # Standard integration
-            result = integrate(func, x)
-            
-            # For tanh(x), we know the canonical form should be log(cosh(x))
-            if func == tanh(x):
-                # Verify by differentiation
-                canonical_result = log(cosh(x))
-                derivative = canonical_result.diff(x)
-                
-                # Check if derivative matches original function
-                if simplify(derivative - func) == 0:
-                    return canonical_result
-            
-            return result
-            
-        except Exception as e:
-            # Fallback to known result for tanh(x)
-            if func == tanh(x):
-                return log(cosh(x))
-            raise e
-    
-    def handle_exponential_trigonometric(self, func, x):
-        """Special handling for products of exponential and trigonometric functions"""
-        try:
-            # Try standard integration first
-            result = integrate(func, x)
-            
-            # For x*exp(x)*sin(x), try to get a cleaner form
-            if str(func) == 'x*exp(x)*sin(x)':
-                # Known result: exp(x)*((x-1)*sin(x) - x*cos(x))/2
-                # But SymPy might give a different but equivalent form
-                # Let's verify by differentiation
-                derivative = result.diff(x)
-                if simplify(derivative - func) == 0:
-                    return result
-            
-            return result
-            
-        except Exception as e:
-            raise e
+        return improved_integrate(func, x)
     
     def is_edge_case(self, func_str):
         """Check if function is an edge case"""
@@ -362,7 +540,7 @@ class IntegralCalculator:
             r'/0',           # Division by zero
             r'sqrt\(-1\)',   # Imaginary
             r'log\(0\)',     # Log of zero
-            r'\^0',          # Zero power
+            r'\^0(?![\d.])',  # Zero power
         ]
         
         for pattern in edge_patterns:
@@ -374,11 +552,7 @@ class IntegralCalculator:
         """Handle edge cases with informative results"""
         try:
             # Parse function
-            func_parsed = func_str.replace('^', '**')
-            func_parsed = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', func_parsed)
-            func_parsed = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', func_parsed)
-            
-            func = sympify(func_parsed)
+            func = parse_function(func_str, self.assumptions)
             
             # Check for specific problematic cases
             if func_str == "x/0":
@@ -397,7 +571,7 @@ class IntegralCalculator:
                 return result
                 
         except Exception as e:
-            return sp.Integral(func_str, x)  # Return symbolic integral
+            return sp.Integral(parse_function(func_str, self.assumptions), x)  # Return symbolic integral
     
     def show_edge_case_result(self, func_str, result):
         """Show edge case result in a special popup"""
@@ -527,81 +701,23 @@ class IntegralCalculator:
     def wrap_text_for_canvas(self, text, max_width_px, font_obj):
         """Wrap a math string to fit within max_width_px using font metrics.
         Breaks preferentially at spaces and common operators.
-        Returns a list of lines.
+        Returns a list of lines (see text_layout.wrap_text).
         """
-        if not text:
-            return [""]
-
-        # Insert spaces around typical math operators to create breakpoints
-        # Include common unicode operators used in UI
-        operators_pattern = r"([+\-*/^=(),]|·|×|÷)"
-        preprocessed = re.sub(operators_pattern, r" \1 ", text)
-
-        tokens = preprocessed.split()
-        lines = []
-        current_line_tokens = []
-
-        def measured_width(tokens_list):
-            # Join with single spaces for display spacing
-            return font_obj.measure(" ".join(tokens_list))
-
-        for token in tokens:
-            if not current_line_tokens:
-                current_line_tokens.append(token)
-                continue
-
-            trial = current_line_tokens + [token]
-            if measured_width(trial) <= max_width_px:
-                current_line_tokens.append(token)
-            else:
-                # Commit current line and start new
-                lines.append(" ".join(current_line_tokens))
-                current_line_tokens = [token]
-
-        if current_line_tokens:
-            lines.append(" ".join(current_line_tokens))
-
-        # Fallback: ensure at least one line
-        if not lines:
-            lines = [text]
-
-        return lines
+        return wrap_text(text, int(max_width_px), font_key(font_obj), font_obj.measure)
 
     def simplify_expr(self, expr):
         """Apply a sequence of simplifications to get a cleaner, equivalent form."""
-        try:
-            simplified = simplify(expr)
-            simplified = cancel(simplified)
-            simplified = factor(simplified)
-            simplified = sp.together(simplified)
-            simplified = sp.radsimp(simplified)
-            simplified = trigsimp(simplified)
-            try:
-                simplified = nsimplify(simplified, [pi, E])
-            except Exception:
-                pass
-            return simplified
-        except Exception:
-            return expr
+        return simplify_expr(expr)
 
     def verify_antiderivative(self, func, F, x):
         """Return True if dF/dx simplifies to func."""
-        try:
-            check = simplify(sp.diff(F, x) - func)
-            return check == 0
-        except Exception:
-            return False
+        return verify_antiderivative(func, F, x)
 
     def parse_bound(self, bound_str):
         """Parse a bound string into a SymPy expression supporting π and ^ syntax."""
-        s = (bound_str or "").strip()
-        if not s:
+        if not (bound_str or "").strip():
             raise ValueError("Empty bound")
-        s = s.replace('^', '**')
-        s = s.replace('π', 'pi')
-        s = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', s)
-        s = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', s)
-        return sympify(s)
+        return parse_function(bound_str, self.assumptions)
     
     def create_superscript_text(self, canvas, x, y, base, exponent, font_size=16):
         """Create text with proper superscript positioning"""
@@ -668,9 +784,40 @@ class IntegralCalculator:
         self.function_var.set("")
         self.update_display()
         
+    def schedule_display_update(self, event=None):
+        """Redraw the display once the queued events are handled.
+        
+        Keystrokes arriving before that (fast typing, key repeat) are
+        coalesced into one redraw of the latest input.
+        """
+        if self.keystroke_time is None:
+            self.keystroke_time = time.perf_counter()
+        if self.display_update_id is None:
+            self.display_update_id = self.root.after_idle(self.run_scheduled_display_update)
+            
+    def run_scheduled_display_update(self):
+        self.display_update_id = None
+        self.update_display()
+        
     def update_display(self):
-        """Update the integral display"""
+        """Update the integral display now, replacing a scheduled redraw"""
+        if self.display_update_id is not None:
+            self.root.after_cancel(self.display_update_id)
+            self.display_update_id = None
         self.create_integral_display()
+        if self.keystroke_time is not None:
+            # Paint right away so the latency includes the screen update
+            self.display_canvas.update_idletasks()
+            self.display_latencies.append(time.perf_counter() - self.keystroke_time)
+            self.keystroke_time = None
+            
+    def display_latency_summary(self):
+        """Median, 95th percentile and maximum keystroke-to-paint latency in ms"""
+        if not self.display_latencies:
+            return None
+        ms = np.array(self.display_latencies) * 1000.0
+        return {'count': ms.size, 'median_ms': float(np.median(ms)),
+                'p95_ms': float(np.percentile(ms, 95)), 'max_ms': float(ms.max())}
         
     def calculate_integral(self):
         """Enhanced calculate integral with improved accuracy and edge case handling"""
@@ -680,6 +827,12 @@ class IntegralCalculator:
                 print("Info: Please enter a function")
                 return
             
+            # Double and triple integrals selected in Options
+            variables = self.integration_variables()
+            if len(variables) > 1:
+                self.calculate_multiple_integral(func_str, variables)
+                return
+            
             # Check if definite integral and bounds are provided
             if self.integral_type_var.get() == "definite":
                 lower_bound = self.lower_bound_var.get().strip()
@@ -693,16 +846,15 @@ class IntegralCalculator:
                 try:
                     A = self.parse_bound(lower_bound)
                     B = self.parse_bound(upper_bound)
+                except ParseError as e:
+                    print(f"Error: Invalid bound: {e}")
+                    return
                 except Exception:
                     print("Error: Bounds must be valid numbers or expressions (e.g., 0, 1, pi/2)")
                     return
                 
                 # Parse function
-                func_str = func_str.replace('^', '**')
-                func_str = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', func_str)
-                func_str = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', func_str)
-                
-                func = sympify(func_str)
+                func = parse_function(func_str, self.assumptions)
                 
                 # Check for edge cases first
                 if self.is_edge_case(func_str):
@@ -710,33 +862,14 @@ class IntegralCalculator:
                     self.show_edge_case_result(func_str, result)
                     return
                 
-                # Calculate antiderivative and exact definite integral if possible
-                integral = self.improved_integrate(func, self.x)
-                integral = self.simplify_expr(integral)
-
-                try:
-                    exact_def = integrate(func, (self.x, A, B))
-                except Exception:
-                    exact_def = sp.Integral(func, (self.x, A, B))
-
-                if isinstance(exact_def, sp.Integral):
-                    # Fallback to Fundamental Theorem of Calculus
-                    try:
-                        exact_def = integral.subs(self.x, B) - integral.subs(self.x, A)
-                    except Exception:
-                        exact_def = sp.Integral(func, (self.x, A, B))
-
-                exact_def = self.simplify_expr(exact_def)
-
-                # Numeric approximation
-                try:
-                    numeric_val = float(exact_def.evalf())
-                except Exception:
-                    try:
-                        numeric_val = float((integral.subs(self.x, B) - integral.subs(self.x, A)).evalf())
-                    except Exception:
-                        numeric_val = None
-
+                # Symmetry shortcuts, splitting at singular points and the numeric
+                # value at the selected precision (or a validated enclosure)
+                precision = self.precision_var.get()
+                digits = 15 if precision == "Interval" else int(precision)
+                integral, exact_def, numeric_val = definite_integral(func, self.x, A, B, precision)
+                
+                self.update_plot(func, A, B, integral)
+                
                 # Show definite integral result (display exact, include numeric approx)
                 self.show_definite_result_popup(
                     func_str,
@@ -745,16 +878,13 @@ class IntegralCalculator:
                     self.convert_to_math_notation(lower_bound),
                     self.convert_to_math_notation(upper_bound),
                     numeric_val,
+                    None if digits == 4 else digits,
                 )
                 return
                 
             # Indefinite integral (original logic)
             # Parse function
-            func_str = func_str.replace('^', '**')
-            func_str = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', func_str)
-            func_str = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', func_str)
-            
-            func = sympify(func_str)
+            func = parse_function(func_str, self.assumptions)
             
             # Check for edge cases first
             if self.is_edge_case(func_str):
@@ -766,380 +896,121 @@ class IntegralCalculator:
             integral = self.improved_integrate(func, self.x)
             integral = self.simplify_expr(integral)
             
-            # Show result in popup
+            self.update_plot(func, antiderivative=integral)
+            
+            # Show result in the results panel
             self.show_result_popup(func_str, integral)
             
         except Exception as e:
             print(f"Error: Calculation error: {str(e)}")
     
-    def show_result_popup(self, func_str, integral):
-        """Show result in a popup window with improved layout for longer equations"""
-        # Convert function to proper mathematical notation
-        display_func = self.convert_to_math_notation(func_str)
-        # Convert integral result to proper mathematical notation - keep horizontal format
-        integral_with_superscripts = self.convert_to_math_notation(str(integral))
-        display_integral = integral_with_superscripts
-        c_part = " + C"  # Always add +C for indefinite integrals
-        
-        # Calculate required width dynamically based on actual equation components
-        # More accurate spacing calculation for even distribution
-        
-        # Calculate actual text widths using font metrics
-        font_size = 16
-        char_width = font_size * 0.6  # Approximate character width for Arial font
-        
-        # Component spacing calculations
-        integral_symbol_width = 80  # Width of the integral symbol
-        integral_bounds_width = 20  # Space for bounds
-        integral_total_width = integral_symbol_width + integral_bounds_width
-        
-        function_text_width = len(display_func) * char_width + 20  # Function text + reduced padding
-        dx_box_width = 30  # dx box width (reduced)
-        equals_width = 15  # equals sign width (reduced)
-        
-        # Calculate result width more accurately for longer equations
-        # Account for stacked fractions and complex expressions
-        result_str = str(integral)
-        if '/' in result_str:
-            # For fractions, estimate width based on longest part
-            parts = result_str.split('/')
-            max_part_width = max(len(part) for part in parts) * char_width
-            result_text_width = max_part_width + 40  # Extra space for fraction formatting
-        else:
-            result_text_width = len(result_str) * char_width + 20  # Standard width
-        
-        c_text_width = len(" + C") * char_width  # + C text width
-        
-        # Spacing between components (tighter for better content hugging)
-        component_spacing = 20  # Reduced from 30 for tighter spacing
-        
-        # Calculate total required width with safety factor for longer equations
-        total_equation_width = (integral_total_width + component_spacing + 
-                               function_text_width + component_spacing + 
-                               dx_box_width + component_spacing + 
-                               equals_width + component_spacing + 
-                               result_text_width + component_spacing + 
-                               c_text_width)
-        
-        # Add safety factor for very long equations to prevent stacking
-        safety_factor = 1.2  # 20% extra space for complex expressions
-        total_equation_width = int(total_equation_width * safety_factor)
-        
-        # Add tighter margins for better content hugging
-        left_margin = 30  # Reduced from 50
-        right_margin = 30  # Reduced from 50
-        total_width = int(total_equation_width + left_margin + right_margin)
-        
-        # Set tighter bounds for better content hugging
-        min_width = 400  # Reduced from 600 for shorter equations
-        max_width = 2500  # Increased to accommodate longer equations with stacked fractions
-        total_width = max(min_width, min(max_width, total_width))
-        
-        # Create popup window
-        result_window = tk.Toplevel(self.root)
-        result_window.title("Integral Result")
-        result_window.geometry(f"{total_width}x350")  # Increased height for better layout
-        result_window.configure(bg='#F5F5DC')  # Same cream background
-        result_window.resizable(False, False)
-        
-        # Center the window
-        result_window.transient(self.root)
-        result_window.grab_set()
-        
-        # Main frame
-        main_frame = tk.Frame(result_window, bg='#F5F5DC')
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+    def calculate_multiple_integral(self, func_str, variables):
+        """Calculate an iterated integral over several variables (inner to outer)"""
+        func = parse_function(func_str, self.assumptions)
+        
+        if self.integral_type_var.get() != "definite":
+            integral, _ = multiple_integral(func, variables)
+            self.show_result_popup(func_str, self.simplify_expr(integral))
+            return
+        
+        lower_bounds = [b for b in self.lower_bound_var.get().split(',') if b.strip()]
+        upper_bounds = [b for b in self.upper_bound_var.get().split(',') if b.strip()]
+        if len(lower_bounds) != len(variables) or len(upper_bounds) != len(variables):
+            print(f"Info: Please enter {len(variables)} comma-separated lower and upper bounds, "
+                  f"one per variable ({', '.join(str(v) for v in variables)})")
+            return
         
-        # Title
-        title_label = tk.Label(main_frame, text="Result", 
-                              font=('Arial', 14, 'bold'), bg='#F5F5DC', fg='#333333')
-        title_label.pack(pady=(0, 15))
-        
-        # Display canvas with same styling as main integral display
-        display_canvas = tk.Canvas(main_frame, width=total_width-30, height=200, 
-                                  bg='white', relief='solid', bd=1,
-                                  highlightthickness=2, highlightbackground='#87CEEB')
-        display_canvas.pack(pady=10)
-        
-        # Create grid pattern
-        for i in range(0, total_width-30, 20):
-            display_canvas.create_line(i, 0, i, 200, fill='#F0F0F0', width=1)
-        for i in range(0, 200, 20):
-            display_canvas.create_line(0, i, total_width-30, i, fill='#F0F0F0', width=1)
-        
-        # Create result display with dynamic positioning for even spacing
-        # Calculate positions based on actual component widths
-        
-        # Start position (left margin)
-        start_x = left_margin
-        
-        # Integral symbol position
-        integral_x = start_x + integral_symbol_width // 2
-        integral_label = tk.Label(display_canvas, text="∫", 
-                                 font=('Times New Roman', 80, 'bold'), 
-                                 bg='white', fg='#333333')
-        display_canvas.create_window(integral_x, 100, window=integral_label)
-        
-        # Function expression position
-        func_x = start_x + integral_total_width + component_spacing + function_text_width // 2
-        display_canvas.create_text(func_x, 100, text=f"({display_func})", 
-                                 font=('Arial', 16, 'bold'), fill='#333333')
-        
-        # dx box position
-        dx_x = start_x + integral_total_width + component_spacing + function_text_width + component_spacing + dx_box_width // 2
-        dx_frame = tk.Frame(display_canvas, bg='#F0F0F0', relief='solid', bd=1)
-        dx_label = tk.Label(dx_frame, text="dx", font=('Arial', 12, 'bold'), 
-                           bg='#F0F0F0', fg='#333333')
-        dx_label.pack(padx=5, pady=2)
-        display_canvas.create_window(dx_x, 100, window=dx_frame)
-        
-        # Equals sign position
-        equals_x = start_x + integral_total_width + component_spacing + function_text_width + component_spacing + dx_box_width + component_spacing + equals_width // 2
-        display_canvas.create_text(equals_x, 100, text="=", 
-                                 font=('Arial', 20, 'bold'), fill='#333333')
-        
-        # Compute available result area and center x
-        result_left_x = (start_x + integral_total_width + component_spacing +
-                         function_text_width + component_spacing + dx_box_width +
-                         component_spacing + equals_width + component_spacing)
-        available_result_width = (total_width - right_margin) - result_left_x
-        result_x = int(result_left_x + available_result_width / 2)
-        
-        # Convert fractions to stacked format for better mathematical display
-        stacked_result, c_part_stacked = self.convert_fractions_to_stacked(display_integral + c_part)
-        
-        # Check if result contains fractions (has newlines)
-        if '\n' in stacked_result:
-            # For fractions, create a multi-line display with proper positioning
-            lines = stacked_result.split('\n')
-            
-            # Calculate tighter vertical positioning for fractions
-            # Reduce spacing between numerator, fraction bar, and denominator
-            line_spacing = 15  # Reduced from 20 for tighter spacing
-            fraction_height = len(lines) * line_spacing
-            start_y = 100 - (fraction_height // 2) + 5  # Reduced offset for better centering
-            
-            # Display each line of the fraction with tighter spacing
-            for i, line in enumerate(lines):
-                y_offset = start_y + (i * line_spacing)
-                display_canvas.create_text(result_x, y_offset, text=line, 
-                                         font=('Arial', 16, 'bold'), fill='#333333')
-        else:
-            # Non-fraction: wrap to available width using font metrics
-            font_obj = tkfont.Font(family='Arial', size=16, weight='bold')
-            wrapped_lines = self.wrap_text_for_canvas(stacked_result, int(available_result_width), font_obj)
-            line_spacing = int(font_obj.metrics('linespace') * 1.2) or 20
-            start_y = int(100 - (len(wrapped_lines) - 1) * line_spacing / 2)
-            for i, line in enumerate(wrapped_lines):
-                y = start_y + i * line_spacing
-                display_canvas.create_text(result_x, y, text=line,
-                                           font=('Arial', 16, 'bold'), fill='#333333')
-        
-        # TeX label
-        tex_label = tk.Label(main_frame, text="TeX", 
-                           font=('Arial', 8), bg='#F5F5DC', fg='#999999')
-        tex_label.place(x=total_width-60, y=230)
+        try:
+            limits = [(v, self.parse_bound(lo), self.parse_bound(hi))
+                      for v, lo, hi in zip(variables, lower_bounds, upper_bounds)]
+        except Exception:
+            print("Error: Bounds must be valid numbers or expressions (e.g., 0, 1, pi/2)")
+            return
         
-        # Close button
-        close_btn = tk.Button(main_frame, text="Close", font=('Arial', 10, 'bold'),
-                            bg='#4169E1', fg='white', relief='raised', bd=1,
-                            command=result_window.destroy)
-        close_btn.pack(pady=(15, 0))
+        result, method = multiple_integral(func, limits)
+        if method == 'symbolic':
+            result = self.simplify_expr(result)
+        try:
+            numeric_val = float(result.evalf())
+        except Exception:
+            numeric_val = None
+        
+        self.show_definite_result_popup(
+            func_str,
+            None,
+            result,
+            self.convert_to_math_notation(self.lower_bound_var.get().strip()),
+            self.convert_to_math_notation(self.upper_bound_var.get().strip()),
+            numeric_val,
+        )
     
-    def show_definite_result_popup(self, func_str, integral, definite_result_exact, a_display, b_display, numeric_result):
-        """Show definite integral result in a popup window with improved layout"""
-        # Convert function to proper mathematical notation
-        display_func = self.convert_to_math_notation(func_str)
-        # Convert integral result to proper mathematical notation - keep horizontal format
-        integral_with_superscripts = self.convert_to_math_notation(str(integral))
-        display_integral = integral_with_superscripts
-        
-        # Calculate required width dynamically based on actual equation components
-        # More accurate spacing calculation for even distribution
-        
-        # Calculate actual text widths using font metrics
-        font_size = 16
-        char_width = font_size * 0.6  # Approximate character width for Arial font
-        
-        # Component spacing calculations
-        integral_symbol_width = 80  # Width of the integral symbol
-        integral_bounds_width = 20  # Space for bounds
-        integral_total_width = integral_symbol_width + integral_bounds_width
-        
-        function_text_width = len(display_func) * char_width + 20  # Function text + reduced padding
-        dx_box_width = 30  # dx box width (reduced)
-        equals_width = 15  # equals sign width (reduced)
-        
-        # Calculate result width based on exact symbolic result
-        result_str = str(definite_result_exact)
-        if '/' in result_str:
-            # For fractions, estimate width based on longest part
-            parts = result_str.split('/')
-            max_part_width = max(len(part) for part in parts) * char_width
-            result_text_width = max_part_width + 40  # Extra space for fraction formatting
-        else:
-            result_text_width = len(result_str) * char_width + 20  # Standard width
-        
-        # Spacing between components (tighter for better content hugging)
-        component_spacing = 20  # Reduced from 30 for tighter spacing
-        
-        # Calculate total required width with safety factor for longer equations
-        total_equation_width = (integral_total_width + component_spacing + 
-                               function_text_width + component_spacing + 
-                               dx_box_width + component_spacing + 
-                               equals_width + component_spacing + 
-                               result_text_width)
-        
-        # Add safety factor for very long equations to prevent stacking
-        safety_factor = 1.2  # 20% extra space for complex expressions
-        total_equation_width = int(total_equation_width * safety_factor)
-        
-        # Add tighter margins for better content hugging
-        left_margin = 30  # Reduced from 50
-        right_margin = 30  # Reduced from 50
-        total_width = int(total_equation_width + left_margin + right_margin)
-        
-        # Set tighter bounds for better content hugging
-        min_width = 400  # Reduced from 600 for shorter equations
-        max_width = 2500  # Increased to accommodate longer equations with stacked fractions
-        total_width = max(min_width, min(max_width, total_width))
-        
-        # Create popup window
-        result_window = tk.Toplevel(self.root)
-        result_window.title("Definite Integral Result")
-        result_window.geometry(f"{total_width}x400")  # Increased height for better layout
-        result_window.configure(bg='#F5F5DC')
-        result_window.resizable(False, False)
-        
-        # Center the window
-        result_window.transient(self.root)
-        result_window.grab_set()
-        
-        # Main frame
-        main_frame = tk.Frame(result_window, bg='#F5F5DC')
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
-        
-        # Title
-        title_label = tk.Label(main_frame, text="Definite Integral Result", 
-                              font=('Arial', 14, 'bold'), bg='#F5F5DC', fg='#333333')
-        title_label.pack(pady=(0, 15))
-        
-        # Display canvas with same styling as main integral display
-        display_canvas = tk.Canvas(main_frame, width=total_width-30, height=220, 
-                                  bg='white', relief='solid', bd=1,
-                                  highlightthickness=2, highlightbackground='#87CEEB')
-        display_canvas.pack(pady=10)
-        
-        # Create grid pattern
-        for i in range(0, total_width-30, 20):
-            display_canvas.create_line(i, 0, i, 220, fill='#F0F0F0', width=1)
-        for i in range(0, 220, 20):
-            display_canvas.create_line(0, i, total_width-30, i, fill='#F0F0F0', width=1)
-        
-        # Create definite integral display with dynamic positioning for even spacing
-        # Calculate positions based on actual component widths
-        
-        # Start position (left margin)
-        start_x = left_margin
-        
-        # Integral symbol position
-        integral_x = start_x + integral_symbol_width // 2
-        integral_label = tk.Label(display_canvas, text="∫", 
-                                 font=('Times New Roman', 80, 'bold'), 
-                                 bg='white', fg='#333333')
-        display_canvas.create_window(integral_x, 110, window=integral_label)
-        
-        # Bounds positioned relative to integral symbol
-        # Upper bound
-        display_canvas.create_rectangle(integral_x - 10, 35, integral_x, 45, fill='white', 
-                                       outline='#333333')
-        display_canvas.create_text(integral_x - 5, 40, text=str(b_display), 
-                                 font=('Arial', 10, 'bold'), fill='#333333')
-        
-        # Lower bound
-        display_canvas.create_rectangle(integral_x - 10, 175, integral_x, 185, fill='white', 
-                                       outline='#333333')
-        display_canvas.create_text(integral_x - 5, 180, text=str(a_display), 
-                                 font=('Arial', 10, 'bold'), fill='#333333')
-        
-        # Function expression position
-        func_x = start_x + integral_total_width + component_spacing + function_text_width // 2
-        display_canvas.create_text(func_x, 110, text=f"({display_func})", 
-                                 font=('Arial', 16, 'bold'), fill='#333333')
-        
-        # dx box position
-        dx_x = start_x + integral_total_width + component_spacing + function_text_width + component_spacing + dx_box_width // 2
-        dx_frame = tk.Frame(display_canvas, bg='#F0F0F0', relief='solid', bd=1)
-        dx_label = tk.Label(dx_frame, text="dx", font=('Arial', 12, 'bold'), 
-                           bg='#F0F0F0', fg='#333333')
-        dx_label.pack(padx=5, pady=2)
-        display_canvas.create_window(dx_x, 110, window=dx_frame)
-        
-        # Equals sign position
-        equals_x = start_x + integral_total_width + component_spacing + function_text_width + component_spacing + dx_box_width + component_spacing + equals_width // 2
-        display_canvas.create_text(equals_x, 110, text="=", 
-                                 font=('Arial', 20, 'bold'), fill='#333333')
-        
+    def result_metrics(self):
+        """FontMetrics of the result fonts, measured with Tk (created once)"""
+        if self.layout_metrics is None:
+            self.layout_metrics = {}
+            for role, spec in RESULT_FONTS.items():
+                font_obj = tkfont.Font(root=self.root, font=spec)
+                self.layout_metrics[role] = FontMetrics(font_key(font_obj), font_obj.measure,
+                                                        font_obj.metrics('linespace'))
+        return self.layout_metrics
+    
+    def show_result_popup(self, func_str, integral):
+        """Show result in the results panel, sized to the measured equation"""
+        formatted_result = result_text(integral)
+        
+        # Typeset the whole equation with TeX when mathtext can render it
+        equation_photo = None
+        integrand = expression_latex(func_str)
+        if integrand is not None and not is_large(integral):
+            equation_photo = self.tex_photo(integral_latex(integrand, self.integration_variables(),
+                                                           result=sp.latex(integral), constant=True), 20)
+        layout = None
+        if equation_photo is not None:
+            layout = layout_image(equation_photo.width())
+        if layout is None:
+            equation_photo = None
+            # Unicode notation (no TeX, or too wide) with stacked fractions, long results wrapped
+            display_func = self.convert_to_math_notation(func_str)
+            result, c_part = self.convert_fractions_to_stacked(formatted_result + " + C")
+            layout = layout_result(self.result_metrics(), self.integral_sign_text(), f"({display_func})",
+                                   self.differential_text(), result, suffix=c_part)
+        summary = f"{self.integral_sign_text()} {func_str} {self.differential_text()} = {formatted_result} + C"
+        self.results_panel.show(ResultEntry("Result", shorten(summary), layout, equation_photo))
+    
+    def show_definite_result_popup(self, func_str, integral, definite_result_exact, a_display, b_display, numeric_result,
+                                   numeric_digits=None):
+        """Show definite integral result in the results panel, sized to the measured equation"""
         # Exact result string used for display; numeric shown in info below
-        formatted_result = str(definite_result_exact)
-        
-        # Compute available result area and center x
-        result_left_x = (start_x + integral_total_width + component_spacing +
-                         function_text_width + component_spacing + dx_box_width +
-                         component_spacing + equals_width + component_spacing)
-        available_result_width = (total_width - right_margin) - result_left_x
-        result_x = int(result_left_x + available_result_width / 2)
-        
-        # For definite integrals, convert any fractions to stacked format
-        stacked_result, _ = self.convert_fractions_to_stacked(formatted_result)
-        
-        # Check if result contains fractions (has newlines)
-        if '\n' in stacked_result:
-            # For fractions, create a multi-line display with proper positioning
-            lines = stacked_result.split('\n')
-            
-            # Calculate tighter vertical positioning for fractions
-            # Reduce spacing between numerator, fraction bar, and denominator
-            line_spacing = 15  # Reduced from 20 for tighter spacing
-            fraction_height = len(lines) * line_spacing
-            start_y = 110 - (fraction_height // 2) + 5  # Reduced offset for better centering
-            
-            # Display each line of the fraction with tighter spacing
-            for i, line in enumerate(lines):
-                y_offset = start_y + (i * line_spacing)
-                display_canvas.create_text(result_x, y_offset, text=line, 
-                                         font=('Arial', 16, 'bold'), fill='#333333')
-        else:
-            # Non-fraction: wrap to available width using font metrics
-            font_obj = tkfont.Font(family='Arial', size=16, weight='bold')
-            wrapped_lines = self.wrap_text_for_canvas(stacked_result, int(available_result_width), font_obj)
-            line_spacing = int(font_obj.metrics('linespace') * 1.2) or 20
-            start_y = int(110 - (len(wrapped_lines) - 1) * line_spacing / 2)
-            for i, line in enumerate(wrapped_lines):
-                y = start_y + i * line_spacing
-                display_canvas.create_text(result_x, y, text=line,
-                                           font=('Arial', 16, 'bold'), fill='#333333')
-        
-        # TeX label
-        tex_label = tk.Label(main_frame, text="TeX", 
-                           font=('Arial', 8), bg='#F5F5DC', fg='#999999')
-        tex_label.place(x=total_width-60, y=250)
-        
-        # Additional info
-        if numeric_result is not None:
-            approx_text = f" ≈ {numeric_result:.4f}"
-        else:
-            approx_text = ""
-        info_text = f"∫ from {a_display} to {b_display} of {func_str} dx = {formatted_result}{approx_text}"
-        info_label = tk.Label(main_frame, text=info_text, 
-                             font=('Arial', 11), bg='#F5F5DC', fg='#666666')
-        info_label.pack(pady=(15, 0))
-        
-        # Close button
-        close_btn = tk.Button(main_frame, text="Close", font=('Arial', 10, 'bold'),
-                            bg='#4169E1', fg='white', relief='raised', bd=1,
-                            command=result_window.destroy)
-        close_btn.pack(pady=(15, 0))
+        formatted_result = result_text(definite_result_exact)
+        
+        # Typeset the whole equation with TeX when mathtext can render it
+        equation_photo = None
+        variables = self.integration_variables()
+        integrand = expression_latex(func_str)
+        lower = bounds_latex(self.lower_bound_var.get().strip(), len(variables))
+        upper = bounds_latex(self.upper_bound_var.get().strip(), len(variables))
+        if (integrand is not None and lower is not None and upper is not None
+                and not is_large(definite_result_exact)):
+            equation_photo = self.tex_photo(integral_latex(integrand, variables, lower, upper,
+                                                           result=sp.latex(definite_result_exact)), 20)
+        layout = None
+        if equation_photo is not None:
+            layout = layout_image(equation_photo.width(), height=220)
+        if layout is None:
+            equation_photo = None
+            # Unicode notation (no TeX, or too wide) with stacked fractions, long results wrapped
+            display_func = self.convert_to_math_notation(func_str)
+            result, _ = self.convert_fractions_to_stacked(formatted_result)
+            layout = layout_result(self.result_metrics(), self.integral_sign_text(), f"({display_func})",
+                                   self.differential_text(), result, bounds=(str(a_display), str(b_display)),
+                                   center_y=110, height=220)
+        
+        # Info line under the equation, also the history entry
+        approx_text = approximation_text(numeric_result, numeric_digits)
+        info_text = (f"{self.integral_sign_text()} from {a_display} to {b_display} of {func_str} "
+                     f"{self.differential_text()} = {formatted_result}{approx_text}")
+        self.results_panel.show(ResultEntry("Definite Integral Result", shorten(info_text), layout,
+                                            equation_photo, info=shorten(info_text, 400)))
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,239 @@
+"""
+Shared helpers for the numeric integration tools.
+Parsing of user input and symbol assumptions, cached NumPy lambdification and
+Gauss-Legendre nodes.
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from expression_parser import parse_expression
+
+
+ASSUMPTIONS = ('positive', 'real', 'integer', 'nonzero')
+
+
+def parse_assumptions(text):
+    """Parse assumptions typed by the user, e.g. "k: positive; n: integer nonzero".
+
+    Entries are separated by semicolons or new lines; several names may share
+    flags ("a, b: real"). Returns a dict mapping names to tuples of flags.
+    """
+    assumptions = {}
+    for entry in re.split(r'[;\n]+', text or ''):
+        if not entry.strip():
+            continue
+        if ':' not in entry:
+            raise ValueError(f"Expected 'name: assumption' in {entry.strip()!r}")
+        names, flags = entry.split(':', 1)
+        flags = tuple(f for f in re.split(r'[,\s]+', flags) if f)
+        for name in (n for n in re.split(r'[,\s]+', names) if n):
+            assumptions[name] = assumptions.get(name, ()) + flags
+    _normalize_assumptions(assumptions)
+    return assumptions
+
+
+def _normalize_assumptions(assumptions):
+    """Hashable form of an assumptions dict, with the flags checked."""
+    normalized = []
+    for name, flags in (assumptions or {}).items():
+        if isinstance(flags, str):
+            flags = flags.split()
+        flags = frozenset(flags)
+        unknown = flags.difference(ASSUMPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown assumption {sorted(unknown)[0]!r} for {name}, "
+                             f"use {', '.join(ASSUMPTIONS)}")
+        normalized.append((str(name), flags))
+    return tuple(sorted(normalized, key=lambda item: item[0]))
+
+
+@lru_cache(maxsize=64)
+def _assumed_symbols_cached(normalized):
+    return {name: sp.Symbol(name, **{flag: True for flag in flags}) for name, flags in normalized}
+
+
+def assumed_symbols(assumptions):
+    """Symbols carrying the given assumptions, by name.
+
+    assumptions maps names to flags from ASSUMPTIONS (a string such as
+    "positive nonzero" or an iterable). Symbols with assumptions are different
+    SymPy objects from plain ones, so every cache keyed on expressions keeps
+    results with and without assumptions apart.
+    """
+    return dict(_assumed_symbols_cached(_normalize_assumptions(assumptions)))
+
+
+def apply_assumptions(expr, assumptions):
+    """Replace the symbols of expr named in assumptions by the assumed ones."""
+    declared = assumed_symbols(assumptions)
+    if not declared:
+        return expr
+    expr = sp.sympify(expr)
+    return expr.xreplace({s: declared[s.name] for s in expr.free_symbols
+                          if isinstance(s, sp.Symbol) and s.name in declared})
+
+
+@lru_cache(maxsize=256)
+def _parse_cached(text, normalized, evaluate):
+    return parse_expression(text, _assumed_symbols_cached(normalized), evaluate)
+
+
+def parse_function(func_str, assumptions=None, evaluate=True):
+    """Parse a function string typed by the user into a SymPy expression.
+    Accepts the same syntax as the calculator input (^, π, √, × and ÷,
+    implicit multiplication such as 2x; see expression_parser) without
+    evaluating any Python code. Symbols named in assumptions are created
+    with them (see assumed_symbols). evaluate=False keeps the expression as
+    typed (x + x stays x + x), for display. Raises ParseError (a ValueError)
+    with the position of a syntax error.
+    """
+    if isinstance(func_str, sp.Basic):
+        return apply_assumptions(func_str, assumptions)
+    s = str(func_str)
+    if not s.strip():
+        raise ValueError("Empty function")
+    return _parse_cached(s, _normalize_assumptions(assumptions), evaluate)
+
+
+@lru_cache(maxsize=256)
+def _lambdify_cached(variables, expr):
+    return sp.lambdify(variables, expr, modules='numpy')
+
+
+@lru_cache(maxsize=64)
+def _lambdify_mpmath_cached(variables, expr):
+    return sp.lambdify(variables, expr, modules='mpmath')
+
+
+def lambdify_numpy(expr, variables):
+    """Return a cached NumPy function for expr.
+    The returned function always produces an array broadcast to the shape of
+    its inputs, even when expr does not depend on the variables. Special
+    functions NumPy lacks are evaluated point by point with mpmath.
+    """
+    if isinstance(variables, sp.Symbol):
+        variables = (variables,)
+    variables = tuple(variables)
+    raw = _lambdify_cached(variables, sp.sympify(expr))
+
+    def evaluate(*args):
+        arrays = [np.asarray(a, dtype=float) for a in args]
+        shape = np.broadcast_shapes(*(a.shape for a in arrays))
+        with np.errstate(all='ignore'):
+            try:
+                values = raw(*arrays)
+            except (TypeError, NameError):
+                # Special functions without a NumPy version (erf maps to math.erf,
+                # Si is unknown): evaluate point by point with mpmath
+                scalar = _lambdify_mpmath_cached(variables, sp.sympify(expr))
+                values = np.vectorize(lambda *point: complex(scalar(*point)), otypes=[complex])(*arrays)
+        values = np.asarray(values)
+        if np.iscomplexobj(values):
+            # Keep real results only, complex values are outside the real domain
+            values = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+        return np.broadcast_to(values.astype(float), shape)
+
+    return evaluate
+
+
+def run_with_timeout(function, timeout, *args):
+    """Run function(*args) in a daemon thread and wait at most timeout seconds.
+
+    Returns (finished, result). Exceptions raised by function are re-raised.
+    An unfinished call keeps running in the background (SymPy cannot be
+    interrupted), so any caches it fills are still useful later.
+    """
+    outcome = {}
+
+    def work():
+        try:
+            outcome['result'] = function(*args)
+        except Exception as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=work, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if 'error' in outcome:
+        raise outcome['error']
+    if 'result' in outcome:
+        return True, outcome['result']
+    return False, None
+
+
+@lru_cache(maxsize=32)
+def gauss_legendre(n):
+    """Gauss-Legendre nodes and weights on [-1, 1] (cached, read-only)."""
+    nodes, weights = np.polynomial.legendre.leggauss(n)
+    nodes.setflags(write=False)
+    weights.setflags(write=False)
+    return nodes, weights
+
+
+def gauss_legendre_batch(f_np, lower, upper, nodes=20, panels=8):
+    """Composite Gauss-Legendre quadrature for many intervals at once.
+
+    f_np must accept an array of any shape. lower and upper are arrays of the
+    same shape; infinite bounds are handled with the substitution
+    x = a + t / (1 - t) (and its mirrored forms). Returns an array of
+    integral values with the shape of the bounds.
+    """
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    lower, upper = np.broadcast_arrays(lower, upper)
+    flat_a = lower.ravel()
+    flat_b = upper.ravel()
+
+    # Orient every interval so that a <= b, and remember the sign
+    sign = np.where(flat_b < flat_a, -1.0, 1.0)
+    a = np.minimum(flat_a, flat_b)
+    b = np.maximum(flat_a, flat_b)
+
+    t, w = gauss_legendre(nodes)
+    # Panel edges in [0, 1], nodes mapped into every panel
+    edges = np.linspace(0.0, 1.0, panels + 1)
+    half = (edges[1:] - edges[:-1]) / 2.0
+    mid = (edges[1:] + edges[:-1]) / 2.0
+    u = (mid[:, None] + half[:, None] * t[None, :]).ravel()
+    wu = (half[:, None] * w[None, :]).ravel()
+
+    result = np.zeros_like(a)
+    finite_a = np.isfinite(a)
+    finite_b = np.isfinite(b)
+
+    with np.errstate(all='ignore'):
+        # Finite intervals: x = a + (b - a) u
+        m = finite_a & finite_b
+        if m.any():
+            width = (b[m] - a[m])[:, None]
+            xs = a[m][:, None] + width * u[None, :]
+            result[m] = np.sum(f_np(xs) * wu[None, :], axis=1) * width[:, 0]
+
+        # [a, oo): x = a + u / (1 - u), dx = du / (1 - u)^2
+        m = finite_a & ~finite_b
+        if m.any():
+            xs = a[m][:, None] + (u / (1.0 - u))[None, :]
+            jac = 1.0 / (1.0 - u) ** 2
+            result[m] = np.sum(f_np(xs) * (wu * jac)[None, :], axis=1)
+
+        # (-oo, b]: x = b - u / (1 - u)
+        m = ~finite_a & finite_b
+        if m.any():
+            xs = b[m][:, None] - (u / (1.0 - u))[None, :]
+            jac = 1.0 / (1.0 - u) ** 2
+            result[m] = np.sum(f_np(xs) * (wu * jac)[None, :], axis=1)
+
+        # (-oo, oo): x = s / (1 - s^2) with s = 2u - 1
+        m = ~finite_a & ~finite_b
+        if m.any():
+            s = 2.0 * u - 1.0
+            xs = np.broadcast_to((s / (1.0 - s ** 2))[None, :], (int(m.sum()), u.size))
+            jac = 2.0 * (1.0 + s ** 2) / (1.0 - s ** 2) ** 2
+            result[m] = np.sum(f_np(xs) * (wu * jac)[None, :], axis=1)
+
+    return (sign * result).reshape(lower.shape)
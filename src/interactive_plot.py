@@ -0,0 +1,212 @@
+"""
+Pan and zoom for the integral plot
+Dragging pans and the scroll wheel zooms around the cursor. Only the x-range
+that becomes visible is sampled, the overlap comes from a per-curve sample
+cache, and frames are redrawn by blitting the curves (reduced to the pixel
+columns of the axes) over a saved background. Works with any Matplotlib
+canvas.
+"""
+
+import time
+
+import numpy as np
+import sympy as sp
+
+from integration_utils import parse_function
+from plotting import adaptive_sample, draw_integral, shade_area, minmax_downsample, pixel_columns
+
+
+class SampleCache:
+    """Samples of one curve over the x-range seen so far.
+
+    Seeded with the samples of the first view. Panning samples only the
+    strips that were not covered yet, with the same density as the first
+    view; zooming in or out by more than a factor rescale starts over at the
+    resolution of the new view. `evaluated` counts the samples computed after
+    the seed.
+    """
+
+    def __init__(self, func, x, xs, ys, initial=65, max_points=2000, rescale=4.0, keep=8.0):
+        self.func = parse_function(func)
+        self.x = x
+        self.initial = initial
+        self.max_points = max_points
+        self.rescale = rescale
+        self.keep = keep
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.lo, self.hi = self.xs[0], self.xs[-1]
+        self.view_width = self.hi - self.lo
+        self.evaluated = 0
+
+    def _sample(self, lo, hi):
+        share = (hi - lo) / self.view_width
+        initial = max(3, int(np.ceil(self.initial * share)))
+        max_points = max(initial, int(np.ceil(self.max_points * share)))
+        xs, ys = adaptive_sample(self.func, self.x, lo, hi, max_points, initial)
+        self.evaluated += xs.size
+        return xs, ys
+
+    def samples(self, lo, hi):
+        """Samples covering [lo, hi], computing only what is not cached."""
+        width = hi - lo
+        if width < self.view_width / self.rescale or width > self.view_width * self.rescale:
+            self.view_width = width
+            self.xs, self.ys = self._sample(lo, hi)
+            self.lo, self.hi = lo, hi
+        else:
+            if lo < self.lo:
+                xs, ys = self._sample(lo, self.lo)
+                self.xs = np.concatenate([xs[:-1], self.xs])
+                self.ys = np.concatenate([ys[:-1], self.ys])
+                self.lo = lo
+            if hi > self.hi:
+                xs, ys = self._sample(self.hi, hi)
+                self.xs = np.concatenate([self.xs, xs[1:]])
+                self.ys = np.concatenate([self.ys, ys[1:]])
+                self.hi = hi
+            if self.hi - self.lo > self.keep * width:
+                # Forget samples far away from the view
+                margin = (self.keep - 1.0) * width / 2.0
+                self.lo, self.hi = max(self.lo, lo - margin), min(self.hi, hi + margin)
+                inside = (self.xs >= self.lo) & (self.xs <= self.hi)
+                self.xs, self.ys = self.xs[inside], self.ys[inside]
+
+        # One sample beyond each edge so the line reaches the frame
+        start = max(np.searchsorted(self.xs, lo, side='right') - 1, 0)
+        stop = np.searchsorted(self.xs, hi, side='left') + 1
+        return self.xs[start:stop], self.ys[start:stop]
+
+
+class PanZoomPlot:
+    """Interactive integral plot on a Matplotlib canvas.
+
+    show() draws the plot with draw_integral; afterwards the curves, the
+    shaded area and the x-axis line are animated artists. While dragging or
+    zooming, only they are redrawn over the background saved at the last
+    full draw, then the changed axes area is blitted. Tick labels and grid
+    are brought up to date by a full draw when the drag ends or shortly
+    after the last scroll step. `last_frame_seconds` holds the time spent on
+    the most recent frame.
+    """
+
+    def __init__(self, canvas, ax, zoom_step=1.2, settle_ms=250):
+        self.canvas = canvas
+        self.ax = ax
+        self.zoom_step = zoom_step
+        self.artists = None
+        self.overlays = []
+        self.caches = {}
+        self.bounds = None
+        self.background = None
+        self.last_frame_seconds = None
+        self._drag = None
+
+        self._settle_timer = canvas.new_timer(interval=settle_ms)
+        self._settle_timer.single_shot = True
+        self._settle_timer.add_callback(self.canvas.draw_idle)
+
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('button_press_event', self._on_press)
+        canvas.mpl_connect('motion_notify_event', self._on_motion)
+        canvas.mpl_connect('button_release_event', self._on_release)
+        canvas.mpl_connect('scroll_event', self._on_scroll)
+
+    def show(self, func, x, a=None, b=None, antiderivative=None):
+        """Draw func (and its antiderivative) and make the plot interactive"""
+        self.artists = draw_integral(self.ax, func, x, a, b, antiderivative)
+        self.bounds = None
+        if a is not None and b is not None:
+            self.bounds = sorted((float(sp.sympify(a)), float(sp.sympify(b))))
+        samples = self.artists['samples']
+        self.caches = {'curve': SampleCache(func, x, *samples['curve'])}
+        if 'antiderivative' in samples:
+            self.caches['antiderivative'] = SampleCache(antiderivative, x, *samples['antiderivative'])
+        self.overlays = []
+        for artist in self._animated():
+            artist.set_animated(True)
+        self.background = None
+        self.canvas.draw_idle()
+
+    def add_overlay(self, artist):
+        """Redraw an extra artist (e.g. Riemann cells) with the curves in every frame"""
+        artist.set_animated(True)
+        self.overlays.append(artist)
+
+    def refresh(self):
+        """Blit the animated artists in their current state"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+    def _animated(self):
+        names = ('axis', 'area', 'curve', 'antiderivative')
+        curves = [self.artists[n] for n in names if self.artists and self.artists[n] is not None]
+        return curves + self.overlays
+
+    def _draw_animated(self):
+        for artist in self._animated():
+            self.ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        # Full draw: save everything but the animated artists, then add them
+        if self.artists is None:
+            return
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def _update_data(self):
+        lo, hi = self.ax.get_xlim()
+        columns = pixel_columns(self.ax)
+        for name, cache in self.caches.items():
+            xs, ys = cache.samples(lo, hi)
+            self.artists[name].set_data(*minmax_downsample(xs, ys, columns, lo, hi))
+        if self.bounds is not None:
+            self.artists['area'].remove()
+            xs, ys = self.artists['curve'].get_data()
+            self.artists['area'] = shade_area(self.ax, xs, ys, self.bounds)
+            self.artists['area'].set_animated(True)
+
+    def _frame(self):
+        start = time.perf_counter()
+        self._update_data()
+        self.refresh()
+        self.last_frame_seconds = time.perf_counter() - start
+
+    def _on_press(self, event):
+        if self.artists is None or event.inaxes is not self.ax or event.button != 1:
+            return
+        self._drag = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _on_motion(self, event):
+        if self._drag is None or event.x is None:
+            return
+        x0, y0, (xlo, xhi), (ylo, yhi) = self._drag
+        dx = (event.x - x0) * (xhi - xlo) / self.ax.bbox.width
+        dy = (event.y - y0) * (yhi - ylo) / self.ax.bbox.height
+        self.ax.set_xlim(xlo - dx, xhi - dx)
+        self.ax.set_ylim(ylo - dy, yhi - dy)
+        self._frame()
+
+    def _on_release(self, event):
+        if self._drag is None:
+            return
+        self._drag = None
+        self.canvas.draw_idle()
+
+    def _on_scroll(self, event):
+        if self.artists is None or event.inaxes is not self.ax:
+            return
+        factor = 1.0 / self.zoom_step if event.button == 'up' else self.zoom_step
+        xlo, xhi = self.ax.get_xlim()
+        ylo, yhi = self.ax.get_ylim()
+        self.ax.set_xlim(event.xdata + (xlo - event.xdata) * factor,
+                         event.xdata + (xhi - event.xdata) * factor)
+        self.ax.set_ylim(event.ydata + (ylo - event.ydata) * factor,
+                         event.ydata + (yhi - event.ydata) * factor)
+        self._frame()
+        self._settle_timer.stop()
+        self._settle_timer.start()
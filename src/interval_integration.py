@@ -0,0 +1,268 @@
+"""
+Validated definite integration
+Rigorous enclosures of definite integrals with mpmath interval arithmetic.
+"""
+
+import heapq
+import math
+from decimal import Decimal, Context, ROUND_CEILING, ROUND_FLOOR
+
+import mpmath
+from mpmath import iv
+import sympy as sp
+from sympy import symbols
+
+from integration_utils import parse_function
+
+# Pieces after which refinement stops while the total is still unbounded
+# (a pole inside the interval)
+_UNBOUNDED_PIECES = 64
+
+
+def _monotone(increasing_function):
+    """Lift a monotone increasing interval function so it is evaluated only
+    at the end points, which avoids the dependency problem of composites."""
+    def lifted(X):
+        low = increasing_function(iv.mpf(X.a))
+        high = increasing_function(iv.mpf(X.b))
+        return iv.mpf([low.a, high.b])
+    return lifted
+
+
+def _sinh(X):
+    E = iv.exp(X)
+    return (E - 1 / E) / 2
+
+
+def _tanh(X):
+    return 1 - 2 / (iv.exp(2 * X) + 1)
+
+
+def _cosh(X):
+    # cosh is decreasing then increasing, so split at zero
+    def cosh_point(Y):
+        E = iv.exp(Y)
+        return (E + 1 / E) / 2
+    if X.a >= 0:
+        return _monotone(cosh_point)(X)
+    if X.b <= 0:
+        return _monotone(cosh_point)(-X)
+    high = max(cosh_point(iv.mpf(X.a)).b, cosh_point(iv.mpf(X.b)).b)
+    return iv.mpf([1, high])
+
+
+def _erf_point(X):
+    """erf at a point interval. iv.erf does not converge, so erf is taken
+    at extra precision and widened by more than its error."""
+    point = mpmath.mpf(X.a)
+    with mpmath.workprec(iv.prec + 20):
+        value = mpmath.erf(point)
+        error = abs(value) * mpmath.ldexp(1, -iv.prec - 10)
+        return iv.mpf([value - error, value + error])
+
+
+_INTERVAL_FUNCTIONS = {
+    sp.sin: iv.sin,
+    sp.cos: iv.cos,
+    sp.tan: iv.tan,
+    sp.cot: iv.cot,
+    sp.sec: iv.sec,
+    sp.csc: lambda X: 1 / iv.sin(X),
+    sp.exp: iv.exp,
+    sp.log: iv.log,
+    sp.Abs: abs,
+    sp.sinh: _monotone(_sinh),
+    sp.cosh: _cosh,
+    sp.tanh: _monotone(_tanh),
+    sp.erf: _monotone(_erf_point),
+}
+
+
+def _constant(value):
+    """Interval enclosing a SymPy constant."""
+    if value.is_Integer:
+        return iv.mpf(int(value))
+    if value.is_Rational:
+        return iv.mpf(int(value.p)) / iv.mpf(int(value.q))
+    if value.is_Float:
+        return iv.mpf(mpmath.mpf(value._mpf_))
+    if value is sp.pi:
+        return iv.pi
+    if value is sp.E:
+        return iv.e
+    raise ValueError(f"Constant not supported in interval mode: {value}")
+
+
+def compile_interval_function(expr, x):
+    """Compile a SymPy expression into a function of one mpmath interval.
+
+    Raises ValueError for functions the interval engine does not support.
+    """
+    expr = sp.sympify(expr)
+
+    if expr == x:
+        return lambda X: X
+    if not expr.has(x):
+        if expr.is_Number or expr.is_NumberSymbol:
+            c = _constant(expr)
+            return lambda X: c
+    if expr.is_Add or expr.is_Mul:
+        parts = [compile_interval_function(arg, x) for arg in expr.args]
+        if expr.is_Add:
+            def add(X):
+                total = parts[0](X)
+                for part in parts[1:]:
+                    total = total + part(X)
+                return total
+            return add
+
+        def mul(X):
+            product = parts[0](X)
+            for part in parts[1:]:
+                product = product * part(X)
+            return product
+        return mul
+    if expr.is_Pow:
+        base = compile_interval_function(expr.base, x)
+        exponent = expr.exp
+        if exponent.is_Integer:
+            n = int(exponent)
+            if n >= 0:
+                return lambda X: base(X) ** n
+            return lambda X: 1 / base(X) ** (-n)
+        if exponent == sp.Rational(1, 2):
+            return lambda X: iv.sqrt(base(X))
+        if exponent == -sp.Rational(1, 2):
+            return lambda X: 1 / iv.sqrt(base(X))
+        power = compile_interval_function(exponent, x)
+        return lambda X: iv.exp(power(X) * iv.log(base(X)))
+    if isinstance(expr, sp.Function) and expr.func in _INTERVAL_FUNCTIONS and len(expr.args) == 1:
+        inner = compile_interval_function(expr.args[0], x)
+        function = _INTERVAL_FUNCTIONS[expr.func]
+        return lambda X: function(inner(X))
+    raise ValueError(f"Not supported in interval mode: {expr}")
+
+
+def _piece_enclosure(f_iv, f2_iv, lo, hi):
+    """Enclosure of the integral over [lo, hi] (lo, hi exact mpf numbers).
+
+    Intersects the range bound (hi - lo) * f([lo, hi]) with the midpoint
+    rule plus its remainder w * f(m) + w^3 / 24 * f''([lo, hi]).
+    """
+    X = iv.mpf([lo, hi])
+    width = iv.mpf(hi) - iv.mpf(lo)
+    try:
+        enclosure = width * f_iv(X)
+    except Exception:
+        enclosure = iv.mpf([-mpmath.inf, mpmath.inf])
+    if f2_iv is not None:
+        try:
+            m = iv.mpf(mpmath.mpf(lo) + (mpmath.mpf(hi) - mpmath.mpf(lo)) / 2)
+            midpoint = width * f_iv(m) + width ** 3 / 24 * f2_iv(X)
+            low = max(mpmath.mpf(enclosure.a), mpmath.mpf(midpoint.a))
+            high = min(mpmath.mpf(enclosure.b), mpmath.mpf(midpoint.b))
+            if low <= high:
+                enclosure = iv.mpf([low, high])
+        except Exception:
+            pass
+    return enclosure
+
+
+def _width(enclosure):
+    """Upper bound of the width of an interval, as a float."""
+    return float(enclosure.delta.b)
+
+
+def definite_integral_enclosure(func, a, b, x=None, tol=1e-8, max_pieces=2000, dps=20):
+    """Return an mpmath interval guaranteed to contain ∫ₐᵇ func dx.
+
+    The interval [a, b] is bisected adaptively, always splitting the piece
+    whose enclosure is widest, until the total width is below tol or
+    max_pieces pieces have been used, or while it is still unbounded after
+    a few bisections. The enclosure stays rigorous when the work cap is
+    reached, it is only wider. Bounds must be finite.
+    """
+    x = x if x is not None else symbols('x')
+    func = parse_function(func)
+    f_iv = compile_interval_function(func, x)
+    try:
+        f2_iv = compile_interval_function(sp.diff(func, x, 2), x)
+    except ValueError:
+        f2_iv = None
+
+    a = sp.sympify(a)
+    b = sp.sympify(b)
+    if not (a.is_finite and b.is_finite):
+        raise ValueError("Interval mode needs finite bounds")
+
+    saved_prec = iv.prec
+    iv.dps = dps
+    try:
+        # Point arithmetic at the interval precision keeps end points exact
+        with mpmath.workprec(iv.prec):
+            sign = 1
+            if bool(b < a):
+                a, b = b, a
+                sign = -1
+            A = compile_interval_function(a, x)(None)
+            B = compile_interval_function(b, x)(None)
+            # Exact points inside the bound enclosures, the small remainders
+            # between the true bounds and these points are enclosed separately
+            a_point = mpmath.mpf(A.mid.a)
+            b_point = mpmath.mpf(B.mid.a)
+            total = iv.mpf(0)
+            if A.a != A.b:
+                total = total + (iv.mpf(a_point) - A) * f_iv(A)
+            if B.a != B.b:
+                total = total + (B - iv.mpf(b_point)) * f_iv(B)
+
+            first = _piece_enclosure(f_iv, f2_iv, a_point, b_point)
+            heap = [(-_width(first), 0, a_point, b_point, first)]
+            counter = 1
+            width = _width(first)
+            while counter < max_pieces and width > tol:
+                _, _, lo, hi, enclosure = heapq.heappop(heap)
+                mid = lo + (hi - lo) / 2
+                left = _piece_enclosure(f_iv, f2_iv, lo, mid)
+                right = _piece_enclosure(f_iv, f2_iv, mid, hi)
+                width += _width(left) + _width(right) - _width(enclosure)
+                heapq.heappush(heap, (-_width(left), counter, lo, mid, left))
+                heapq.heappush(heap, (-_width(right), counter + 1, mid, hi, right))
+                counter += 2
+                if not math.isfinite(width):
+                    width = sum(-item[0] for item in heap)
+                    if not math.isfinite(width) and counter >= _UNBOUNDED_PIECES:
+                        break
+
+            for _, _, _, _, enclosure in heap:
+                total = total + enclosure
+            return total if sign == 1 else -total
+    finally:
+        iv.prec = saved_prec
+
+
+def _round_outward(value, digits, rounding):
+    """Round an mpf to digits significant digits in the given direction."""
+    value = mpmath.mpf(value)
+    if not mpmath.isfinite(value):
+        return str(value)
+    if value == 0:
+        return "0"
+    sign, mantissa, exponent, _ = value._mpf_
+    # m * 2^e written exactly in decimal: m * 5^-e * 10^e for negative e
+    if exponent >= 0:
+        exact = Decimal(int(mantissa) << exponent)
+    else:
+        exact = Decimal(f"{int(mantissa) * 5 ** (-exponent)}E{exponent}")
+    if sign:
+        exact = -exact
+    return str(Context(prec=digits, rounding=rounding).plus(exact))
+
+
+def format_enclosure(enclosure, digits=15):
+    """Format an interval as "[lo, hi]", rounding outward so the printed
+    interval still contains the true value."""
+    with mpmath.workprec(max(iv.prec, 53)):
+        lo = mpmath.mpf(enclosure.a)
+        hi = mpmath.mpf(enclosure.b)
+    return f"[{_round_outward(lo, digits, ROUND_FLOOR)}, {_round_outward(hi, digits, ROUND_CEILING)}]"
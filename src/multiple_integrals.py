@@ -0,0 +1,137 @@
+"""
+Double and triple integrals
+Iterated integration with selectable variables and order. Inner integrals are
+computed symbolically once and cached, so changing outer bounds reuses them;
+when the symbolic path takes too long a nested Gauss-Legendre cubature (or
+quasi-Monte Carlo beyond three dimensions) is used.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+from sympy import integrate
+
+from integration_utils import (parse_function, lambdify_numpy, gauss_legendre, run_with_timeout,
+                               apply_assumptions)
+from qmc_integration import qmc_integrate
+
+
+def _normalize_limits(limits):
+    """Limits as tuples (var,) or (var, lower, upper), innermost first.
+
+    Bounds may only depend on outer variables: a bound containing the
+    variable of its own or of an inner level raises ValueError.
+    """
+    normalized = []
+    integrated = set()
+    for limit in limits:
+        if isinstance(limit, sp.Symbol):
+            limit = (limit,)
+        var = limit[0]
+        integrated.add(var)
+        if len(limit) == 1:
+            normalized.append((var,))
+            continue
+        _, lower, upper = limit
+        lower, upper = sp.sympify(lower), sp.sympify(upper)
+        inner = (lower.free_symbols | upper.free_symbols) & integrated
+        if inner:
+            names = ', '.join(sorted(s.name for s in inner))
+            raise ValueError(f"Bounds of {var} depend on {names}, which is integrated inside it; "
+                             f"list the limits innermost first, e.g. [(y, 0, x), (x, 0, 1)]")
+        normalized.append((var, lower, upper))
+    return tuple(normalized)
+
+
+@lru_cache(maxsize=256)
+def inner_integral(func, limit):
+    """Integrate func over one limit, (var,) or (var, lower, upper), cached.
+
+    The result is an expression in the remaining (outer) variables, so it is
+    reused for any outer bounds.
+    """
+    return integrate(func, limit)
+
+
+def iterated_integral(func, limits):
+    """Symbolic iterated integral, innermost limit first, each level cached."""
+    result = parse_function(func)
+    for limit in _normalize_limits(limits):
+        result = inner_integral(result, limit)
+    return result
+
+
+def nested_gauss(func, limits, nodes=16):
+    """Numeric iterated integral with nested Gauss-Legendre rules.
+
+    Bounds may depend on outer variables (e.g. y from 0 to x). All points
+    are built as flat NumPy arrays and the integrand is evaluated once.
+    """
+    func = parse_function(func)
+    limits = _normalize_limits(limits)
+    if any(len(limit) == 1 for limit in limits):
+        raise ValueError("Numeric cubature needs bounds for every variable")
+    variables = [limit[0] for limit in limits]
+    t, w = gauss_legendre(nodes)
+
+    points = {}
+    weights = np.ones(1)
+    outer = []
+    # Build the point set from the outermost variable inwards
+    for var, lower, upper in reversed(limits):
+        if not (lower.is_finite is not False and upper.is_finite is not False):
+            raise ValueError("Numeric cubature needs finite bounds")
+        args = [points[v] for v in outer]
+        size = weights.size
+        lo = np.broadcast_to(lambdify_numpy(lower, outer)(*args), (size,))
+        hi = np.broadcast_to(lambdify_numpy(upper, outer)(*args), (size,))
+        half = (hi - lo) / 2.0
+        mid = (hi + lo) / 2.0
+        for v in outer:
+            points[v] = np.repeat(points[v], nodes)
+        points[var] = (mid[:, None] + half[:, None] * t[None, :]).ravel()
+        weights = (weights[:, None] * half[:, None] * w[None, :]).ravel()
+        outer.append(var)
+
+    values = lambdify_numpy(func, variables)(*[points[v] for v in variables])
+    return float(np.sum(weights * values))
+
+
+def multiple_integral(func, limits, timeout=10.0, nodes=16, assumptions=None):
+    """Double or triple (or any order) integral of func.
+
+    limits lists (var, lower, upper) for definite or var for indefinite
+    integration, innermost first. Returns (result, method) where method is
+    'symbolic', 'numeric' or 'qmc'. The symbolic path runs in a background
+    thread; if it has not finished after timeout seconds a definite integral
+    is computed with nested Gauss cubature instead, or with quasi-Monte Carlo
+    for boxes in more than three dimensions (the symbolic work keeps filling
+    the cache in the background). An indefinite integral that times out is
+    returned unevaluated. assumptions (e.g. {"a": "positive"}) are applied to
+    the integrand and the limits.
+    """
+    func = parse_function(func, assumptions)
+    limits = tuple(tuple(apply_assumptions(item, assumptions) for item in limit)
+                   for limit in _normalize_limits(limits))
+    try:
+        _, result = run_with_timeout(iterated_integral, timeout, func, limits)
+        error = None
+    except Exception as e:
+        result, error = None, e
+
+    if result is not None and not result.has(sp.Integral):
+        return result, 'symbolic'
+
+    if all(len(limit) == 3 for limit in limits):
+        box = all(not limit[1].free_symbols and not limit[2].free_symbols for limit in limits)
+        if len(limits) > 3 and box:
+            # Nested rules need nodes ** dim points, quasi-Monte Carlo does not
+            estimate, _ = qmc_integrate(func, limits)
+            return sp.Float(estimate), 'qmc'
+        return sp.Float(nested_gauss(func, limits, nodes=nodes)), 'numeric'
+    if result is not None:
+        return result, 'symbolic'
+    if error is not None:
+        raise error
+    return sp.Integral(func, *limits), 'symbolic'
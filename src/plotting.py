@@ -0,0 +1,254 @@
+"""
+Plotting helpers for the integrand and the area under it
+Samples come from the cached NumPy functions in integration_utils and are
+refined adaptively where the curve bends or jumps, then reduced to at most a
+few points per pixel column before drawing. The drawing works on any
+Matplotlib Axes.
+"""
+
+import numpy as np
+import sympy as sp
+
+from integration_utils import parse_function, lambdify_numpy
+
+# Range shown for indefinite integrals and how far an infinite bound is cut
+DEFAULT_VIEW = (-5.0, 5.0)
+INFINITE_SPAN = 10.0
+
+CURVE_COLOR = '#4169E1'
+AREA_COLOR = '#87CEEB'
+ANTIDERIVATIVE_COLOR = '#B22222'
+
+
+def view_window(a=None, b=None, margin=0.15):
+    """Finite x-range to plot for the bounds a, b (None for indefinite).
+
+    Infinite bounds are cut INFINITE_SPAN away from the other bound, and a
+    margin of the interval width is added on both sides for context.
+    """
+    if a is None or b is None:
+        return DEFAULT_VIEW
+    lo, hi = sorted((float(sp.sympify(a)), float(sp.sympify(b))))
+    if not np.isfinite(lo) and not np.isfinite(hi):
+        lo, hi = -INFINITE_SPAN, INFINITE_SPAN
+    elif not np.isfinite(lo):
+        lo = hi - INFINITE_SPAN
+    elif not np.isfinite(hi):
+        hi = lo + INFINITE_SPAN
+    pad = (hi - lo) * margin if hi > lo else 1.0
+    return lo - pad, hi + pad
+
+
+def _percentiles(xs, ys, quantiles):
+    """Percentiles of the curve values, weighting every sample by the x-range
+    it covers, so points clustered by refinement near a pole do not count
+    more than the rest of the curve. None when too few values are defined.
+    """
+    finite = np.isfinite(ys)
+    if finite.sum() < 2:
+        return None
+    weights = np.gradient(xs)[finite]
+    order = np.argsort(ys[finite])
+    cumulative = np.cumsum(weights[order])
+    cumulative /= cumulative[-1]
+    return np.interp(np.asarray(quantiles) / 100.0, cumulative, ys[finite][order])
+
+
+def _y_scale(xs, ys):
+    """Robust height of the sampled curve, ignoring spikes next to poles."""
+    bounds = _percentiles(xs, ys, [2.0, 98.0])
+    if bounds is None:
+        return 1.0
+    return max(bounds[1] - bounds[0], 1e-9)
+
+
+def adaptive_sample(func, x, lo, hi, max_points=2000, initial=65, tol=2e-3, include=()):
+    """Sample func on [lo, hi], refining only where the curve needs it.
+
+    Starting from a uniform grid, every segment whose midpoint deviates from
+    the straight line between its ends by more than tol times the curve
+    height is split at that midpoint; segments at the edge of the domain
+    (one end undefined) are split too. All midpoints of a round are
+    evaluated in one vectorized call, and when the point budget max_points
+    would be exceeded only the worst segments are split. Segments that
+    straddle a pole get a nan point so the line is broken there.
+
+    Returns (xs, ys) sorted by x, with nan where func is undefined.
+    """
+    f_np = lambdify_numpy(parse_function(func), x)
+
+    def evaluate(points):
+        values = np.array(f_np(points), dtype=float)
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    extra = [p for p in include if lo <= p <= hi]
+    xs = np.union1d(np.linspace(lo, hi, min(initial, max_points)), extra)
+    ys = evaluate(xs)
+    min_width = (hi - lo) * 1e-9
+
+    while xs.size < max_points:
+        scale = _y_scale(xs, ys)
+        xm = (xs[:-1] + xs[1:]) / 2.0
+        ym = evaluate(xm)
+        finite = np.isfinite(ys)
+        ends_finite = finite[:-1] & finite[1:]
+        error = np.where(ends_finite & np.isfinite(ym),
+                         np.abs(ym - (ys[:-1] + ys[1:]) / 2.0) / scale, 0.0)
+        # One end (or the midpoint) undefined: the domain edge lies inside
+        mixed = (finite[:-1] | finite[1:] | np.isfinite(ym)) & ~(ends_finite & np.isfinite(ym))
+        error[mixed] = np.inf
+        error[np.diff(xs) < min_width] = 0.0
+
+        split = np.flatnonzero(error > tol)
+        if split.size == 0:
+            break
+        budget = max_points - xs.size
+        if split.size > budget:
+            split = split[np.argsort(error[split])[::-1][:budget]]
+            split.sort()
+        xs = np.insert(xs, split + 1, xm[split])
+        ys = np.insert(ys, split + 1, ym[split])
+
+    # Break the line across poles: a sign change between two values that
+    # are both larger than the curve height
+    scale = _y_scale(xs, ys)
+    pole = np.flatnonzero((ys[:-1] * ys[1:] < 0)
+                          & (np.abs(ys[:-1]) > scale) & (np.abs(ys[1:]) > scale))
+    if pole.size:
+        xs = np.insert(xs, pole + 1, (xs[pole] + xs[pole + 1]) / 2.0)
+        ys = np.insert(ys, pole + 1, np.nan)
+    return xs, ys
+
+
+def minmax_downsample(xs, ys, columns, lo=None, hi=None):
+    """Reduce sorted samples to what is visible at a width of `columns` pixels.
+
+    Per pixel column of [lo, hi] only the first, the last, the lowest and the
+    highest sample are kept, so every column still spans the same vertical
+    range and the drawn line looks the same (at most 4 points per column).
+    Runs of undefined (nan) samples collapse to one nan, which keeps the
+    gaps. Samples outside [lo, hi] share one column on each side.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if xs.size <= 4 * columns:
+        return xs, ys
+    lo = xs[0] if lo is None else lo
+    hi = xs[-1] if hi is None else hi
+    column = np.clip(np.floor((xs - lo) / (hi - lo) * columns), -1, columns).astype(np.int64)
+    undefined = np.isnan(ys)
+
+    # Groups of consecutive defined samples in the same column, and whole
+    # runs of undefined samples
+    both_undefined = undefined[1:] & undefined[:-1]
+    change = np.empty(xs.size, dtype=bool)
+    change[0] = True
+    change[1:] = ((column[1:] != column[:-1]) & ~both_undefined) | (undefined[1:] != undefined[:-1])
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], xs.size) - 1
+    lengths = ends - starts + 1
+    defined = ~undefined[starts]
+
+    positions = np.arange(xs.size)
+    filled = np.where(undefined, 0.0, ys)
+    lowest = np.repeat(np.minimum.reduceat(filled, starts), lengths)
+    highest = np.repeat(np.maximum.reduceat(filled, starts), lengths)
+    first_min = np.minimum.reduceat(np.where(filled == lowest, positions, xs.size), starts)
+    first_max = np.minimum.reduceat(np.where(filled == highest, positions, xs.size), starts)
+
+    keep = np.unique(np.concatenate([starts, ends[defined], first_min[defined], first_max[defined]]))
+    return xs[keep], ys[keep]
+
+
+def pixel_columns(ax):
+    """Width of the axes in pixels (at least 1)."""
+    return max(int(ax.bbox.width), 1)
+
+
+def y_window(xs, ys, quantile=2.0):
+    """y-range ignoring the spikes next to poles, or None to autoscale.
+
+    Only used when the extreme values are far outside the range holding most
+    of the curve, otherwise the plain data range is best.
+    """
+    bounds = _percentiles(xs, ys, [quantile, 100.0 - quantile])
+    if bounds is None:
+        return None
+    low, high = bounds
+    spread = max(high - low, 1e-12)
+    finite = ys[np.isfinite(ys)]
+    if finite.min() > low - 10 * spread and finite.max() < high + 10 * spread:
+        return None
+    return low - 0.5 * spread, high + 0.5 * spread
+
+
+def curves_y_window(curves, quantile=2.0):
+    """y-range for several (xs, ys) curves on the same axes, or None to
+    autoscale: the union of the y_window of each curve, where a curve that
+    needs no clipping contributes its data range. Each curve is weighted on
+    its own, as joining the samples would break the x-spacing weights.
+    """
+    windows = [y_window(xs, ys, quantile) for xs, ys in curves]
+    if all(window is None for window in windows):
+        return None
+    lows, highs = [], []
+    for (xs, ys), window in zip(curves, windows):
+        if window is None:
+            finite = ys[np.isfinite(ys)]
+            if finite.size == 0:
+                continue
+            margin = 0.05 * (finite.max() - finite.min())
+            window = finite.min() - margin, finite.max() + margin
+        lows.append(window[0])
+        highs.append(window[1])
+    return min(lows), max(highs)
+
+
+def shade_area(ax, xs, ys, bounds):
+    """Shade the area between the sampled curve and the x-axis over bounds."""
+    inside = (xs >= bounds[0]) & (xs <= bounds[1]) & np.isfinite(ys)
+    return ax.fill_between(xs, ys, 0.0, where=inside, color=AREA_COLOR, alpha=0.5)
+
+
+def draw_integral(ax, func, x, a=None, b=None, antiderivative=None, max_points=2000):
+    """Draw f(x) on ax and shade the area of ∫ₐᵇ f dx when bounds are given.
+
+    The antiderivative F, when given in closed form, is drawn dashed on the
+    same axes. Both curves are sampled adaptively with at most max_points
+    points each, and reduced to what is visible at the width of ax before
+    drawing (minmax_downsample). Returns the artists in a dict: 'axis',
+    'curve', 'antiderivative' and 'area' (the last two may be None), plus
+    'samples' with the full (xs, ys) of each curve.
+    """
+    func = parse_function(func)
+    lo, hi = view_window(a, b)
+    bounds = ()
+    if a is not None and b is not None:
+        bounds = sorted((float(sp.sympify(a)), float(sp.sympify(b))))
+    # Sample the bounds themselves so the shading starts and ends exactly there
+    xs, ys = adaptive_sample(func, x, lo, hi, max_points, include=bounds)
+
+    ax.clear()
+    columns = pixel_columns(ax)
+    artists = {'antiderivative': None, 'area': None, 'samples': {'curve': (xs, ys)}}
+    artists['axis'] = ax.axhline(0.0, color='#999999', linewidth=0.8)
+    shown_x, shown_y = minmax_downsample(xs, ys, columns, lo, hi)
+    artists['curve'], = ax.plot(shown_x, shown_y, color=CURVE_COLOR, linewidth=1.5,
+                                label=f"f({x}) = {func}")
+    if antiderivative is not None and not sp.sympify(antiderivative).has(sp.Integral):
+        Fx, Fy = adaptive_sample(antiderivative, x, lo, hi, max_points)
+        artists['samples']['antiderivative'] = (Fx, Fy)
+        artists['antiderivative'], = ax.plot(*minmax_downsample(Fx, Fy, columns, lo, hi),
+                                             color=ANTIDERIVATIVE_COLOR, linewidth=1.2,
+                                             linestyle='--', label=f"F({x}) = {antiderivative}")
+    if bounds:
+        artists['area'] = shade_area(ax, shown_x, shown_y, bounds)
+    ax.set_xlim(lo, hi)
+    ylim = curves_y_window(artists['samples'].values())
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    ax.set_xlabel(str(x))
+    ax.legend(loc='upper right', fontsize=8)
+    ax.grid(True, color='#F0F0F0')
+    return artists
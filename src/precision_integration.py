@@ -0,0 +1,152 @@
+"""
+Arbitrary-precision definite integration
+Definite integrals evaluated to a requested number of significant digits with
+mpmath, with results cached per (integrand, bounds, precision).
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+import mpmath
+import sympy as sp
+from sympy import integrate, symbols
+
+from integration_utils import parse_function
+from singularities import find_singular_points
+
+# (func, x, a, b) -> cache entry shared by all precisions of that integral,
+# least recently used first
+_precision_cache = OrderedDict()
+_PRECISION_CACHE_SIZE = 256
+
+
+class _PrecisionEntry:
+    """Everything learned about one definite integral, independent of precision.
+
+    A lower-precision request records whether a closed form exists, where
+    the interval must be split and which quadrature degree was needed, so a
+    higher-precision request can skip straight to the method that works.
+    """
+
+    def __init__(self):
+        self.exact = None
+        self.exact_tried = False
+        self.split_points = None
+        self.degree = None
+        self.values = {}  # dps -> mpf correct to dps digits
+
+
+@lru_cache(maxsize=128)
+def _lambdify_mpmath(x, func):
+    return sp.lambdify(x, func, modules='mpmath')
+
+
+def _to_mpf(value, dps):
+    """Convert a SymPy number to an mpmath mpf with dps significant digits."""
+    evaluated = sp.N(value, dps + 5)
+    if evaluated in (sp.oo, -sp.oo):
+        return mpmath.inf if evaluated == sp.oo else -mpmath.inf
+    if evaluated in (sp.nan, sp.zoo):
+        return mpmath.nan
+    if not evaluated.is_real:
+        raise ValueError(f"Integral value is not real: {evaluated}")
+    with mpmath.workdps(dps):
+        return mpmath.mpf(sp.Float(evaluated, dps + 5)._mpf_)
+
+
+def _interval_points(func, x, a, b):
+    """Bounds plus any interior singular points of func, in integration order."""
+    found = find_singular_points(func, x, a, b) or ()
+    lo, hi = (a, b) if bool(a <= b) else (b, a)
+    points = [lo] + [p for p in found if p != lo and p != hi] + [hi]
+    if points[0] != a:
+        points.reverse()
+    return points
+
+
+def definite_integral_precise(func, a, b, dps=15, x=None, exact=None):
+    """Return the definite integral of func from a to b as an mpmath mpf
+    accurate to dps significant digits.
+
+    exact may be a closed form already computed by the caller; otherwise the
+    symbolic integral is attempted once per integrand and bounds. When no
+    closed form exists mpmath tanh-sinh quadrature is used, split at the
+    singular points of func. Raises ValueError when the quadrature does not
+    reach dps digits.
+    """
+    x = x if x is not None else symbols('x')
+    func = parse_function(func)
+    a = sp.sympify(a)
+    b = sp.sympify(b)
+    dps = int(dps)
+
+    key = (func, x, a, b)
+    entry = _precision_cache.get(key)
+    if entry is None:
+        entry = _precision_cache[key] = _PrecisionEntry()
+        if len(_precision_cache) > _PRECISION_CACHE_SIZE:
+            _precision_cache.popitem(last=False)
+    else:
+        _precision_cache.move_to_end(key)
+
+    # Any cached result at the same or higher precision answers the request
+    cached = [d for d in entry.values if d >= dps]
+    if cached:
+        with mpmath.workdps(dps):
+            return +entry.values[min(cached)]
+
+    if exact is not None and not exact.has(sp.Integral):
+        entry.exact = exact
+        entry.exact_tried = True
+
+    if not entry.exact_tried:
+        entry.exact_tried = True
+        try:
+            result = integrate(func, (x, a, b))
+            if not result.has(sp.Integral):
+                entry.exact = result
+        except Exception:
+            pass
+
+    value = None
+    if entry.exact is not None:
+        try:
+            value = _to_mpf(entry.exact, dps)
+        except (TypeError, ValueError):
+            value = None
+
+    if value is None:
+        if entry.split_points is None:
+            entry.split_points = _interval_points(func, x, a, b)
+        f_mp = _lambdify_mpmath(x, func)
+        degree = entry.degree or 6
+        with mpmath.workdps(dps + 5):
+            points = [mpmath.mpf(_to_mpf(p, dps + 5)) if p.is_finite else
+                      (mpmath.inf if p == sp.oo else -mpmath.inf) for p in entry.split_points]
+            tolerance = mpmath.mpf(10) ** (-dps)
+            while True:
+                value, error = mpmath.quad(f_mp, points, error=True, maxdegree=degree)
+                if error <= tolerance * max(1, abs(value)) or degree >= 12:
+                    break
+                degree += 2
+            entry.degree = degree
+            relative = error / max(1, abs(value))
+            if not relative <= tolerance:
+                # Keep what was reached for lower precisions, but do not
+                # pass it off as dps digits
+                reached = int(-mpmath.log10(relative)) if 0 < relative < 1 else 0
+                if reached > 0:
+                    with mpmath.workdps(reached):
+                        entry.values[reached] = +value
+                raise ValueError(f"Quadrature reached only {reached} of {dps} digits")
+        with mpmath.workdps(dps):
+            value = +value
+
+    entry.values[dps] = value
+    return value
+
+
+def clear_precision_cache():
+    """Forget all cached precision results."""
+    _precision_cache.clear()
+    _lambdify_mpmath.cache_clear()
@@ -0,0 +1,188 @@
+"""
+Layout of the result popups
+Places the parts of a result equation (integral sign with bounds, integrand,
+differential box, equals sign and the result, stacked or wrapped) in one
+left-to-right pass, measuring every part once with real font metrics. Fonts
+come in as FontMetrics, built from tkinter fonts by the calculator or from
+the font files Matplotlib uses by matplotlib_metrics, so layouts can be computed and
+benchmarked without a display.
+"""
+
+import math
+
+from matplotlib import font_manager
+
+from text_layout import text_measure, wrap_text, LazyLines
+
+# Fonts of the parts, as tkinter font descriptions
+FONTS = {
+    'sign': ('Times New Roman', 80, 'bold'),
+    'bound': ('Arial', 10, 'bold'),
+    'function': ('Arial', 16, 'bold'),
+    'dx': ('Arial', 12, 'bold'),
+    'equals': ('Arial', 20, 'bold'),
+    'result': ('Arial', 16, 'bold'),
+}
+
+TEXT_COLOR = '#333333'
+DX_FILL = '#F0F0F0'
+
+# Space above the first and below the last row of a scrolling result
+ROW_PADDING = 10
+
+
+class FontMetrics:
+    """Width and line height of one font; widths are cached per string
+    (see text_layout.text_measure)."""
+
+    def __init__(self, key, measure, linespace):
+        self.key = key
+        self.measure = measure
+        self.linespace = linespace
+
+    def width(self, text):
+        return text_measure(self.key, self.measure).width(text)
+
+    def wrap(self, text, max_width):
+        return wrap_text(text, max_width, self.key, self.measure)
+
+    def lazy_lines(self, text, max_width):
+        return LazyLines(text, max_width, self.key, self.measure)
+
+    def line_width(self, line):
+        """Width of a line returned by wrap, from its cached token widths"""
+        return text_measure(self.key, self.measure).line_width(line.split(" "))
+
+
+def matplotlib_metrics(fonts=FONTS, dpi=96):
+    """FontMetrics for fonts measured from the font files Matplotlib uses.
+
+    Sizes are in points as in tkinter, widths in pixels at dpi: the sum of
+    the glyph advances (kerning is ignored), cached per character. Families
+    that are not installed are replaced by the generic serif or sans-serif
+    font.
+    """
+    installed = {f.name for f in font_manager.fontManager.ttflist}
+    metrics = {}
+    for role, (family, size, *style) in fonts.items():
+        if family not in installed:
+            family = 'serif' if 'Times' in family else 'sans-serif'
+        prop = font_manager.FontProperties(family=family, size=size,
+                                           weight='bold' if 'bold' in style else 'normal')
+        font = font_manager.get_font(font_manager.findfont(prop))
+        font.set_size(size, dpi)
+        scale = size * dpi / 72.0 / font.units_per_EM
+
+        def measure(text, font=font, advances={}):
+            for ch in set(text).difference(advances):
+                advances[ch] = font.load_char(ord(ch)).linearHoriAdvance / 65536.0
+            return sum(advances[ch] for ch in text)
+
+        metrics[role] = FontMetrics(('matplotlib', dpi, family, size) + tuple(style), measure,
+                                    int(round((font.ascender - font.descender) * scale)))
+    return metrics
+
+
+class ResultLayout:
+    """Canvas size and the items to draw.
+
+    items holds ('text', x, y, text, role) centered at (x, y) in the font of
+    role, ('rect', x0, y0, x1, y1, fill) boxes and ('image', x, y) for a
+    typeset equation centered at (x, y). A result too long to show at once
+    is not in items but in rows (LazyLines): row i is centered at
+    (rows_x, rows_top + i * line_spacing) in the result font and the canvas
+    is meant to scroll (see result_view).
+    """
+
+    def __init__(self, width, height, items, rows=None, rows_x=0, rows_top=0, line_spacing=0):
+        self.width = width
+        self.height = height
+        self.items = items
+        self.rows = rows
+        self.rows_x = rows_x
+        self.rows_top = rows_top
+        self.line_spacing = line_spacing
+
+
+def layout_result(metrics, sign, integrand, differential, result, suffix="", bounds=None,
+                  center_y=100, height=200, margin=30, spacing=20, min_width=400, max_width=2500,
+                  scroll_width=900):
+    """Lay out "sign (integrand) differential = result suffix" on one row.
+
+    bounds is (lower, upper) or None. A result with several lines is a
+    stacked fraction; otherwise it is wrapped (see text_layout.wrap_text) to
+    the room left before max_width. suffix (e.g. " + C") follows the result.
+    A result with more lines than fit into height is wrapped lazily into a
+    column that makes the canvas scroll_width wide (rows of the layout).
+    Every part is measured once; returns a ResultLayout whose width is
+    clamped to [min_width, max_width].
+    """
+    def measured(role, text):
+        return int(math.ceil(metrics[role].width(text)))
+
+    items = []
+    x = margin
+
+    sign_width = measured('sign', sign)
+    sign_x = x + sign_width // 2
+    items.append(('text', sign_x, center_y, sign, 'sign'))
+    if bounds is not None:
+        # Bound boxes at the top and bottom of the sign, as in the display
+        for text, y in zip(bounds, (center_y + 70, center_y - 70)):
+            half = max(10, measured('bound', text) + 6) // 2
+            items.append(('rect', sign_x - 5 - half, y - 5, sign_x - 5 + half, y + 5, 'white'))
+            items.append(('text', sign_x - 5, y, text, 'bound'))
+    x += sign_width + spacing
+
+    function_width = measured('function', integrand)
+    items.append(('text', x + function_width // 2, center_y, integrand, 'function'))
+    x += function_width + spacing
+
+    dx_width = measured('dx', differential) + 12
+    dx_half_height = metrics['dx'].linespace // 2 + 3
+    items.append(('rect', x, center_y - dx_half_height, x + dx_width, center_y + dx_half_height, DX_FILL))
+    items.append(('text', x + dx_width // 2, center_y, differential, 'dx'))
+    x += dx_width + spacing
+
+    equals_width = measured('equals', "=")
+    items.append(('text', x + equals_width // 2, center_y, "=", 'equals'))
+    x += equals_width + spacing
+
+    result_font = metrics['result']
+    suffix_width = measured('result', suffix) if suffix else 0
+    if '\n' in result:
+        lines = result.split('\n')
+        line_spacing = 15
+        start_y = center_y - (len(lines) * line_spacing) // 2 + 5
+        result_width = max(measured('result', line) for line in lines)
+    else:
+        line_spacing = int(result_font.linespace * 1.2) or 20
+        visible_rows = max((height - 2 * ROW_PADDING) // line_spacing, 1)
+        if result_font.lazy_lines(result, max_width - margin - x - suffix_width).get(visible_rows) is not None:
+            # Too long to show at once: a narrower scrolling column, ending in the suffix
+            room = max(scroll_width - margin - x, 300)
+            width = max(min_width, x + room + margin)
+            return ResultLayout(width, height, items, rows=result_font.lazy_lines(result + suffix, room),
+                                rows_x=x + room // 2, rows_top=ROW_PADDING + line_spacing // 2,
+                                line_spacing=line_spacing)
+        lines = result_font.wrap(result, max_width - margin - x - suffix_width)
+        start_y = int(center_y - (len(lines) - 1) * line_spacing / 2)
+        result_width = int(math.ceil(max(result_font.line_width(line) for line in lines)))
+
+    width = max(min_width, min(max_width, x + result_width + suffix_width + margin))
+    # Center the result in the room left of the right margin
+    result_x = x + (width - margin - x - suffix_width) // 2
+    for i, line in enumerate(lines):
+        items.append(('text', result_x, start_y + i * line_spacing, line, 'result'))
+    if suffix:
+        items.append(('text', result_x + (result_width + suffix_width) // 2, center_y, suffix, 'result'))
+    return ResultLayout(width, height, items)
+
+
+def layout_image(image_width, height=200, margin=30, min_width=400, max_width=2500):
+    """Layout of a typeset equation image centered on the canvas, or None
+    when the image is too wide for max_width"""
+    if image_width + 2 * margin > max_width:
+        return None
+    width = max(min_width, image_width + 2 * margin)
+    return ResultLayout(width, height, [('image', width // 2, height // 2)])
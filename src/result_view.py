@@ -0,0 +1,73 @@
+"""
+Scrolling view of very long results
+Only the lines in view exist as canvas items: a small pool of text items is
+moved to the visible rows whenever the view scrolls, and the lines come from
+text_layout.LazyLines, which wraps the text only as far as it has been
+scrolled. Works with any canvas offering the tkinter Canvas methods.
+"""
+
+import math
+
+
+class VirtualLines:
+    """Rows of LazyLines on a vertically scrolling canvas.
+
+    Row i is centered at (x, top + i * line_spacing). Call refresh() after
+    every change of the view (e.g. from the canvas yscrollcommand); it
+    updates the pool of text items, the scroll region (from the estimated
+    number of lines) and moves the items tagged background_tag, such as the
+    grid, in steps of background_step so they always fill the view. The
+    text items get the given tags.
+    """
+
+    def __init__(self, canvas, rows, x, top, line_spacing, width, height, font, fill='#333333',
+                 background_tag=None, background_step=20, tags=()):
+        self.canvas = canvas
+        self.rows = rows
+        self.x = x
+        self.top = top
+        self.line_spacing = line_spacing
+        self.width = width
+        self.height = height
+        self.font = font
+        self.fill = fill
+        self.background_tag = background_tag
+        self.background_step = background_step
+        self.background_offset = 0
+        self.tags = tags
+        self.pool = []
+        self.scroll_region = None
+        self.first_row = 0
+
+    def scroll_height(self):
+        return max(self.height, 2 * self.top + (self.rows.estimated_count() - 1) * self.line_spacing)
+
+    def refresh(self):
+        """Show the rows in view, reusing the text items"""
+        view_top = self.canvas.canvasy(0)
+        self.first_row = max(int((view_top - self.top) // self.line_spacing), 0)
+        count = int(math.ceil(self.height / self.line_spacing)) + 2
+        while len(self.pool) < count:
+            self.pool.append(self.canvas.create_text(self.x, 0, text="", font=self.font, fill=self.fill,
+                                                     tags=self.tags))
+        for k, item in enumerate(self.pool):
+            row = self.first_row + k
+            line = self.rows.get(row) if k < count else None
+            if line is None:
+                self.canvas.itemconfig(item, state='hidden')
+            else:
+                self.canvas.coords(item, self.x, self.top + row * self.line_spacing)
+                self.canvas.itemconfig(item, text=line, state='normal')
+
+        # Only change the scroll region when the estimate changes, the
+        # canvas reports every change to yscrollcommand
+        region = (0, 0, self.width, self.scroll_height())
+        if region != self.scroll_region:
+            self.scroll_region = region
+            self.canvas.config(scrollregion=region)
+
+        if self.background_tag is not None:
+            offset = int(view_top // self.background_step) * self.background_step
+            if offset != self.background_offset:
+                self.canvas.move(self.background_tag, 0, offset - self.background_offset)
+                self.background_offset = offset
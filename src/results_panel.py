@@ -0,0 +1,177 @@
+"""
+Results panel
+One non-modal window shows every result: the window, the canvas with its grid
+and the widgets are created once, and a new result only replaces the
+equation items (the grid is redrawn only when the canvas size changes).
+Earlier results stay in the history list and can be shown again.
+"""
+
+import tkinter as tk
+
+from result_layout import FONTS, TEXT_COLOR
+from result_view import VirtualLines
+
+BACKGROUND = '#F5F5DC'
+
+
+def shorten(text, limit=80):
+    """text on one line, cut to limit characters"""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class ResultEntry:
+    """One result: the ResultLayout of its equation and what goes with it.
+
+    photo is the PhotoImage of a typeset equation (kept alive by the entry),
+    summary the one-line text of the history list, info an optional line
+    shown under the equation.
+    """
+
+    def __init__(self, title, summary, layout, photo=None, info=""):
+        self.title = title
+        self.summary = summary
+        self.layout = layout
+        self.photo = photo
+        self.info = info
+
+
+class ResultsPanel:
+    """Persistent results window with a history of earlier results.
+
+    show() adds a result to the history and displays it; closing the window
+    only hides it. Keeps the last history_size results.
+    """
+
+    def __init__(self, root, history_size=50):
+        self.root = root
+        self.history_size = history_size
+        self.history = []
+        self.current = None
+        self.view = None
+        self.grid_size = None
+        self.window = None
+
+    def build(self):
+        """Create the window and its widgets (once)"""
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Integral Results")
+        self.window.configure(bg=BACKGROUND)
+        self.window.resizable(False, False)
+        self.window.transient(self.root)
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+
+        main_frame = tk.Frame(self.window, bg=BACKGROUND)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+
+        self.title_label = tk.Label(main_frame, text="Result",
+                                    font=('Arial', 14, 'bold'), bg=BACKGROUND, fg='#333333')
+        self.title_label.pack(pady=(0, 15))
+
+        # Canvas with the styling of the main display, scrollable for long results
+        container = tk.Frame(main_frame, bg=BACKGROUND)
+        container.pack(pady=(10, 0))
+        self.canvas = tk.Canvas(container, width=400, height=200,
+                                bg='white', relief='solid', bd=1,
+                                highlightthickness=2, highlightbackground='#87CEEB')
+        self.canvas.pack(side=tk.LEFT)
+        self.scrollbar = tk.Scrollbar(container, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.config(yscrollcommand=self.scrolled)
+        self.canvas.bind('<MouseWheel>', lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, 'units'))
+
+        self.tex_label = tk.Label(main_frame, text="TeX", font=('Arial', 8), bg=BACKGROUND, fg='#999999')
+        self.tex_label.pack(anchor='e')
+
+        self.info_label = tk.Label(main_frame, text="", font=('Arial', 11), bg=BACKGROUND, fg='#666666')
+        self.info_label.pack(pady=(5, 0))
+
+        # Earlier results, newest last
+        tk.Label(main_frame, text="History", font=('Arial', 10, 'bold'),
+                 bg=BACKGROUND, fg='#333333').pack(anchor='w', pady=(10, 0))
+        self.history_list = tk.Listbox(main_frame, height=5, font=('Arial', 10), activestyle='none')
+        self.history_list.pack(fill=tk.X)
+        self.history_list.bind('<<ListboxSelect>>', self.history_selected)
+
+        close_btn = tk.Button(main_frame, text="Close", font=('Arial', 10, 'bold'),
+                              bg='#4169E1', fg='white', relief='raised', bd=1,
+                              command=self.window.withdraw)
+        close_btn.pack(pady=(15, 0))
+
+    def show(self, entry):
+        """Add a result to the history and display it"""
+        if self.window is None:
+            self.build()
+        self.history.append(entry)
+        self.history_list.insert(tk.END, entry.summary)
+        if len(self.history) > self.history_size:
+            self.history.pop(0)
+            self.history_list.delete(0)
+        self.history_list.selection_clear(0, tk.END)
+        self.history_list.selection_set(tk.END)
+        self.history_list.see(tk.END)
+        self.display(entry)
+
+    def history_selected(self, event=None):
+        selection = self.history_list.curselection()
+        if selection and self.history[selection[0]] is not self.current:
+            self.display(self.history[selection[0]])
+
+    def display(self, entry):
+        """Replace the shown result by entry, reusing the window"""
+        self.current = entry
+        layout = entry.layout
+        canvas = self.canvas
+
+        canvas.delete("result")
+        if self.view is not None:
+            # Put the grid back where the scrolling view had moved it
+            canvas.move("grid", 0, -self.view.background_offset)
+            self.view = None
+        canvas.yview_moveto(0)
+
+        size = (layout.width, layout.height)
+        if size != self.grid_size:
+            self.grid_size = size
+            canvas.config(width=layout.width, height=layout.height)
+            canvas.delete("grid")
+            for i in range(0, layout.width, 20):
+                canvas.create_line(i, 0, i, layout.height + 20, fill='#F0F0F0', width=1, tags="grid")
+            for i in range(0, layout.height + 20, 20):
+                canvas.create_line(0, i, layout.width, i, fill='#F0F0F0', width=1, tags="grid")
+            canvas.tag_lower("grid")
+
+        for item in layout.items:
+            if item[0] == 'text':
+                _, x, y, text, role = item
+                canvas.create_text(x, y, text=text, font=FONTS[role], fill=TEXT_COLOR, tags="result")
+            elif item[0] == 'rect':
+                _, x0, y0, x1, y1, fill = item
+                canvas.create_rectangle(x0, y0, x1, y1, fill=fill, outline=TEXT_COLOR, tags="result")
+            else:
+                canvas.create_image(item[1], item[2], image=entry.photo, tags="result")
+
+        if layout.rows is not None:
+            # Only the visible lines of a long result are items (see result_view)
+            self.scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+            canvas.config(yscrollincrement=layout.line_spacing)
+            self.view = VirtualLines(canvas, layout.rows, layout.rows_x, layout.rows_top, layout.line_spacing,
+                                     layout.width, layout.height, FONTS['result'], TEXT_COLOR,
+                                     background_tag="grid", tags="result")
+            self.view.refresh()
+        else:
+            self.scrollbar.pack_forget()
+            canvas.config(scrollregion=(0, 0, layout.width, layout.height))
+
+        self.title_label.config(text=entry.title)
+        self.tex_label.config(fg='#999999' if entry.photo is None else '#333333')
+        self.info_label.config(text=entry.info, wraplength=layout.width)
+        self.window.geometry("")  # Fit the window to the new canvas size
+        self.window.deiconify()
+        self.window.lift()
+
+    def scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.view is not None:
+            self.view.refresh()
@@ -0,0 +1,152 @@
+"""
+Riemann-sum and trapezoid animation
+The cells of every frame (left, right, midpoint or trapezoid rule for a
+growing number of subintervals) are computed up front with one vectorized
+evaluation of the integrand and cached; playback only swaps the vertices of a
+PolyCollection, so the integrand is never evaluated again.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+from matplotlib.collections import PolyCollection
+
+from integration_utils import parse_function, lambdify_numpy
+
+RULES = ('left', 'right', 'midpoint', 'trapezoid')
+DEFAULT_COUNTS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128)
+
+CELL_COLOR = '#FFD27F'
+CELL_EDGE_COLOR = '#CC8400'
+
+
+class RiemannFrames:
+    """Cells and sums of all frames.
+
+    vertices holds the four corners of every cell of every frame in one
+    (cells, 4, 2) array; frame k uses the rows offsets[k]:offsets[k + 1].
+    Rectangles have equal heights at both corners, trapezoids the function
+    values at both ends.
+    """
+
+    def __init__(self, rule, counts, offsets, vertices, sums):
+        self.rule = rule
+        self.counts = counts
+        self.offsets = offsets
+        self.vertices = vertices
+        self.sums = sums
+
+    def __len__(self):
+        return len(self.counts)
+
+    def frame(self, k):
+        """(n, vertices, sum) of frame k"""
+        return (int(self.counts[k]), self.vertices[self.offsets[k]:self.offsets[k + 1]],
+                float(self.sums[k]))
+
+
+@lru_cache(maxsize=32)
+def _riemann_frames_cached(func, x, a, b, counts, rule):
+    counts = np.array(counts, dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    total = int(offsets[-1])
+
+    # Cell i of the frame with n cells covers [a + i h, a + (i + 1) h]
+    n_per_cell = np.repeat(counts, counts)
+    index = np.arange(total) - np.repeat(offsets[:-1], counts)
+    width = (b - a) / n_per_cell
+    left = a + index * width
+    right = left + width
+
+    points = {'left': left, 'right': right, 'midpoint': left + width / 2.0,
+              'trapezoid': np.concatenate([left, right])}[rule]
+    values = lambdify_numpy(func, x)(points)
+    if rule == 'trapezoid':
+        left_height, right_height = values[:total], values[total:]
+    else:
+        left_height = right_height = values
+
+    areas = width * (left_height + right_height) / 2.0
+    sums = np.add.reduceat(areas, offsets[:-1])
+    zeros = np.zeros(total)
+    vertices = np.stack([np.stack([left, zeros], axis=1),
+                         np.stack([left, left_height], axis=1),
+                         np.stack([right, right_height], axis=1),
+                         np.stack([right, zeros], axis=1)], axis=1)
+    vertices.setflags(write=False)
+    sums.setflags(write=False)
+    return RiemannFrames(rule, counts, offsets, vertices, sums)
+
+
+def riemann_frames(func, x, a, b, counts=DEFAULT_COUNTS, rule='midpoint'):
+    """All frames of the rule for ∫ₐᵇ func dx with the given numbers of cells.
+
+    Computed once per integrand, bounds, counts and rule (cached).
+    """
+    if rule not in RULES:
+        raise ValueError(f"Unknown rule {rule!r}, use {', '.join(RULES)}")
+    a = float(sp.sympify(a))
+    b = float(sp.sympify(b))
+    if not (np.isfinite(a) and np.isfinite(b)):
+        raise ValueError("Riemann sums need finite bounds")
+    counts = tuple(int(n) for n in counts)
+    if not counts or min(counts) < 1:
+        raise ValueError("Every frame needs at least one cell")
+    return _riemann_frames_cached(parse_function(func), x, a, b, counts, rule)
+
+
+class RiemannAnimation:
+    """Plays RiemannFrames on an Axes with a Matplotlib timer.
+
+    redraw is called after every frame (e.g. a blitting refresh, or
+    canvas.draw_idle). exact, when given, is shown next to each sum.
+    """
+
+    def __init__(self, ax, frames, redraw, interval=600, exact=None):
+        self.ax = ax
+        self.frames = frames
+        self.redraw = redraw
+        self.exact = exact
+        self.index = 0
+        self.collection = PolyCollection([], facecolor=CELL_COLOR, edgecolor=CELL_EDGE_COLOR,
+                                         linewidth=0.8, alpha=0.6)
+        ax.add_collection(self.collection)
+        self.label = ax.text(0.02, 0.95, '', transform=ax.transAxes, va='top', fontsize=9)
+        self.timer = ax.figure.canvas.new_timer(interval=interval)
+        self.timer.add_callback(self._advance)
+
+    @property
+    def artists(self):
+        return [self.collection, self.label]
+
+    def show_frame(self, k):
+        """Show frame k without evaluating the integrand"""
+        self.index = k
+        n, vertices, total = self.frames.frame(k)
+        self.collection.set_verts(vertices)
+        text = f"{self.frames.rule.capitalize()} sum, n = {n}: {total:.6g}"
+        if self.exact is not None:
+            text += f"   (error {total - self.exact:.2e})"
+        self.label.set_text(text)
+        self.redraw()
+
+    def start(self):
+        self.show_frame(0)
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _advance(self):
+        if self.index + 1 >= len(self.frames):
+            self.stop()
+            return
+        self.show_frame(self.index + 1)
+
+    def remove(self):
+        """Stop playback and take the cells off the Axes"""
+        self.stop()
+        for artist in self.artists:
+            if artist.axes is not None:
+                artist.remove()
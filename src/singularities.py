@@ -0,0 +1,160 @@
+"""
+Singularity pre-pass for definite integrals
+Locates poles and branch points of an integrand inside [a, b] once, and
+splits the interval there so the Fundamental Theorem of Calculus is only
+applied where the antiderivative is continuous.
+"""
+
+from functools import lru_cache
+
+import sympy as sp
+from sympy import integrate, limit, solveset
+
+
+class UnknownSingularities(Exception):
+    """Raised when the singular points cannot be determined exactly."""
+
+
+def _singular_conditions(expr, x):
+    """Expressions that vanish at the poles and branch points of expr."""
+    conditions = []
+    for node in sp.preorder_traversal(expr):
+        if not getattr(node, 'has', None) or not node.has(x):
+            continue
+        if isinstance(node, sp.Piecewise):
+            raise UnknownSingularities(node)
+        if node.is_Pow:
+            exponent = node.exp
+            if exponent.has(x):
+                conditions.append(node.base)
+            elif exponent.is_negative or not exponent.is_integer:
+                # Poles for negative powers, branch points for roots
+                conditions.append(node.base)
+        elif isinstance(node, sp.log):
+            conditions.append(node.args[0])
+        elif isinstance(node, (sp.tan, sp.sec)):
+            conditions.append(sp.cos(node.args[0]))
+        elif isinstance(node, (sp.cot, sp.csc)):
+            conditions.append(sp.sin(node.args[0]))
+        elif isinstance(node, (sp.tanh, sp.sech)):
+            conditions.append(sp.cosh(node.args[0]))
+        elif isinstance(node, (sp.coth, sp.csch)):
+            conditions.append(sp.sinh(node.args[0]))
+        elif isinstance(node, (sp.asin, sp.acos, sp.atanh, sp.acoth)):
+            conditions.append(node.args[0] ** 2 - 1)
+    return conditions
+
+
+@lru_cache(maxsize=512)
+def _cached_singular_points(expr, x, lo, hi):
+    points = set()
+    domain = sp.Interval(lo, hi)
+    for condition in _singular_conditions(expr, x):
+        solutions = solveset(condition, x, domain)
+        if not isinstance(solutions, sp.FiniteSet) and solutions is not sp.S.EmptySet:
+            raise UnknownSingularities(condition)
+        points.update(p for p in solutions if p.is_real)
+    return tuple(sorted(points, key=lambda p: float(p)))
+
+
+def find_singular_points(expr, x, a, b):
+    """Return the sorted real singular points of expr in [min(a, b), max(a, b)].
+
+    Results are cached per (expression, variable, bounds). Returns None when
+    the points cannot be determined (for example infinitely many, or roots
+    that have no closed form).
+    """
+    expr = sp.sympify(expr)
+    a = sp.sympify(a)
+    b = sp.sympify(b)
+    lo, hi = (a, b) if bool(a <= b) else (b, a)
+    try:
+        return _cached_singular_points(expr, x, lo, hi)
+    except (UnknownSingularities, NotImplementedError, TypeError, ValueError):
+        return None
+
+
+def singular_conditions(expr, x):
+    """Expressions that vanish where expr has a pole or branch point, or
+    None when they cannot be determined (Piecewise)."""
+    try:
+        return _singular_conditions(sp.sympify(expr), x)
+    except UnknownSingularities:
+        return None
+
+
+def singular_roots(expr, x):
+    """Values of x where expr may have a pole or branch point, as
+    expressions in its other symbols (1/(x - c) gives (c,)), or None when
+    they have no closed form (tan(k*x) has infinitely many).
+    """
+    conditions = singular_conditions(expr, x)
+    if conditions is None:
+        return None
+    roots = set()
+    for condition in conditions:
+        try:
+            solutions = solveset(condition, x, sp.S.Complexes)
+        except NotImplementedError:
+            return None
+        if not isinstance(solutions, sp.FiniteSet) and solutions is not sp.S.EmptySet:
+            return None
+        roots.update(solutions)
+    return tuple(roots)
+
+
+def _one_sided(F, x, point, direction, singular):
+    """F at point, through a one-sided limit when point is singular."""
+    if singular or not point.is_finite:
+        return limit(F, x, point, direction)
+    return F.subs(x, point)
+
+
+def split_definite_integral(func, F, x, a, b):
+    """Definite integral of func from a to b split at its singular points.
+
+    F is an antiderivative of func (or None / an unevaluated Integral when
+    none is known). Each piece between singular points is computed with the
+    fastest method that applies: F(r) - F(l) away from singular points,
+    one-sided limits of F at them, and SymPy's definite integrate only when
+    there is no usable antiderivative. Divergent pieces give oo, -oo or nan.
+
+    Returns None when the singular points cannot be determined, so the caller
+    can fall back to its general method.
+    """
+    a = sp.sympify(a)
+    b = sp.sympify(b)
+    if a == b:
+        return sp.Integer(0)
+    if bool(b < a):
+        result = split_definite_integral(func, F, x, b, a)
+        return None if result is None else -result
+
+    singular = find_singular_points(func, x, a, b)
+    if singular is None:
+        return None
+    if F is not None and F.has(sp.Integral):
+        F = None
+    if F is not None:
+        # Jumps of the antiderivative (e.g. atan(tan(x/2))) must split too
+        F_singular = find_singular_points(F, x, a, b)
+        if F_singular is None:
+            return None
+        singular = tuple(sorted(set(singular) | set(F_singular), key=lambda p: float(p)))
+
+    edges = [a] + [p for p in singular if p != a and p != b] + [b]
+    singular_set = set(singular)
+    total = sp.Integer(0)
+    for left, right in zip(edges[:-1], edges[1:]):
+        if F is not None:
+            upper = _one_sided(F, x, right, '-', right in singular_set)
+            lower = _one_sided(F, x, left, '+', left in singular_set)
+            piece = upper - lower
+        else:
+            piece = integrate(func, (x, left, right))
+            if piece.has(sp.Integral):
+                return None
+        total += piece
+        if total is sp.nan:
+            break
+    return total
@@ -0,0 +1,224 @@
+"""
+Symbolic integration without the GUI
+Antiderivatives with the calculator's special cases and simplifications, and
+the definite-integral pipeline (symmetry shortcuts, splitting at singular
+points, numeric value at a chosen precision). Used by IntegralCalculator and
+by the headless renderer.
+"""
+
+import mpmath
+import sympy as sp
+from sympy import integrate, simplify, expand, factor, cancel, trigsimp, nsimplify, pi, E
+from sympy import tanh, cosh, log
+
+from precision_integration import definite_integral_precise
+from interval_integration import definite_integral_enclosure, format_enclosure
+from singularities import split_definite_integral
+from symmetry import reduce_by_symmetry
+
+
+def improved_integrate(func, x):
+    """Enhanced integration function that handles special cases better"""
+    try:
+        # First try standard integration
+        result = integrate(func, x)
+
+        # Apply simplification and canonical forms for better accuracy
+        result = simplify_and_canonicalize(result, func, x)
+
+        # Verify antiderivative; try manualintegrate if needed
+        if not verify_antiderivative(func, result, x):
+            try:
+                from sympy.integrals.manualintegrate import manualintegrate
+                alt = manualintegrate(func, x)
+                alt = simplify_expr(alt)
+                if verify_antiderivative(func, alt, x):
+                    return alt
+            except Exception:
+                pass
+
+        return result
+
+    except Exception as e:
+        # If standard integration fails, try alternative methods
+        return handle_special_cases(func, x)
+
+
+def simplify_and_canonicalize(result, original_func, x):
+    """Simplify and canonicalize the integration result for better accuracy"""
+    # Apply various simplification techniques
+    result = simplify(result)
+    result = expand(result)
+    result = factor(result)
+    result = cancel(result)
+
+    # For trigonometric results, try trigonometric simplification
+    if any(trig in str(result) for trig in ['sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh']):
+        result = trigsimp(result)
+
+    return result
+
+
+def handle_special_cases(func, x):
+    """Handle special cases that might not integrate well with standard methods"""
+    func_str = str(func)
+
+    # Handle hyperbolic tangent specifically
+    if 'tanh' in func_str:
+        return handle_tanh_integration(func, x)
+
+    # Handle complex exponential-trigonometric products
+    if 'exp' in func_str and ('sin' in func_str or 'cos' in func_str):
+        return handle_exponential_trigonometric(func, x)
+
+    # Default fallback
+    return integrate(func, x)
+
+
+def handle_tanh_integration(func, x):
+    """Special handling for tanh(x) integration"""
+    try:
+        # Standard integration
+        result = integrate(func, x)
+
+        # For tanh(x), we know the canonical form should be log(cosh(x))
+        if func == tanh(x):
+            # Verify by differentiation
+            canonical_result = log(cosh(x))
+            derivative = canonical_result.diff(x)
+
+            # Check if derivative matches original function
+            if simplify(derivative - func) == 0:
+                return canonical_result
+
+        return result
+
+    except Exception as e:
+        # Fallback to known result for tanh(x)
+        if func == tanh(x):
+            return log(cosh(x))
+        raise e
+
+
+def handle_exponential_trigonometric(func, x):
+    """Special handling for products of exponential and trigonometric functions"""
+    try:
+        # Try standard integration first
+        result = integrate(func, x)
+
+        # For x*exp(x)*sin(x), try to get a cleaner form
+        if str(func) == 'x*exp(x)*sin(x)':
+            # Known result: exp(x)*((x-1)*sin(x) - x*cos(x))/2
+            # But SymPy might give a different but equivalent form
+            # Let's verify by differentiation
+            derivative = result.diff(x)
+            if simplify(derivative - func) == 0:
+                return result
+
+        return result
+
+    except Exception as e:
+        raise e
+
+
+def simplify_expr(expr):
+    """Apply a sequence of simplifications to get a cleaner, equivalent form."""
+    try:
+        simplified = simplify(expr)
+        simplified = cancel(simplified)
+        simplified = factor(simplified)
+        simplified = sp.together(simplified)
+        simplified = sp.radsimp(simplified)
+        simplified = trigsimp(simplified)
+        try:
+            simplified = nsimplify(simplified, [pi, E])
+        except Exception:
+            pass
+        return simplified
+    except Exception:
+        return expr
+
+
+def verify_antiderivative(func, F, x):
+    """Return True if dF/dx simplifies to func."""
+    try:
+        check = simplify(sp.diff(F, x) - func)
+        return check == 0
+    except Exception:
+        return False
+
+
+def approximation_text(numeric, digits=None):
+    """Text shown after the exact value of a definite integral.
+
+    " ∈ [lo, hi]" for an enclosure, " ≈ value" with digits significant
+    digits or 4 decimals by default (complex values with 4 significant
+    digits), "" when numeric is None.
+    """
+    if numeric is None:
+        return ""
+    if isinstance(numeric, mpmath.iv.mpf):
+        return f" ∈ {format_enclosure(numeric, digits or 15)}"
+    if digits:
+        return f" ≈ {mpmath.nstr(numeric, digits)}"
+    if isinstance(numeric, (mpmath.mpc, complex)):
+        return f" ≈ {mpmath.nstr(mpmath.mpc(numeric), 4)}"
+    return f" ≈ {float(numeric):.4f}"
+
+
+def definite_integral(func, x, a, b, precision="4"):
+    """Exact and numeric value of ∫ₐᵇ func dx, as shown by the calculator.
+
+    precision is the number of digits of the numeric value ("4", "15", ...)
+    or "Interval" for a validated enclosure. Returns (antiderivative, exact,
+    numeric); the antiderivative is None when a symmetry shortcut made it
+    unnecessary, numeric is None when it could not be computed (in Interval
+    mode: when no enclosure could be computed).
+    """
+    # Parity and periodicity shortcuts before any heavy integration:
+    # odd on [-c, c] is zero, even needs [0, c], n periods need one
+    try:
+        factor_, a_reduced, b_reduced = reduce_by_symmetry(func, x, a, b)
+    except Exception:
+        factor_, a_reduced, b_reduced = 1, a, b
+
+    if factor_ == 0:
+        integral = None
+        exact = sp.Integer(0)
+    else:
+        # Calculate antiderivative and exact definite integral if possible
+        integral = simplify_expr(improved_integrate(func, x))
+
+        # Split at poles and branch points first, so the Fundamental Theorem
+        # of Calculus is only applied where the antiderivative is continuous
+        try:
+            exact = split_definite_integral(func, integral, x, a_reduced, b_reduced)
+        except Exception:
+            exact = None
+
+        if exact is None:
+            # Singular points unknown: let SymPy's definite integrate find them
+            try:
+                exact = integrate(func, (x, a_reduced, b_reduced))
+            except Exception:
+                exact = sp.Integral(func, (x, a_reduced, b_reduced))
+
+        exact = simplify_expr(factor_ * exact)
+
+    # Numeric approximation at the selected precision (cached per digits),
+    # or a validated enclosure in interval mode
+    if precision == "Interval":
+        # Only a validated enclosure is shown: none when it cannot be computed
+        # (unsupported functions, infinite bounds, poles)
+        try:
+            numeric = definite_integral_enclosure(func, a, b, x=x)
+        except Exception:
+            numeric = None
+        return integral, exact, numeric
+    # The precise value is split at singular points too; F(b) - F(a) alone
+    # would be wrong across poles, so there is no value when it fails
+    try:
+        numeric = definite_integral_precise(func, a, b, dps=max(int(precision), 15), x=x, exact=exact)
+    except Exception:
+        numeric = None
+    return integral, exact, numeric
@@ -0,0 +1,111 @@
+"""
+Symmetry and periodicity shortcuts for definite integrals
+Odd integrands over [-c, c] vanish, even integrands need only half the
+interval, and periodic integrands over whole periods need only one period.
+"""
+
+from functools import lru_cache
+
+import sympy as sp
+from sympy import periodicity
+
+from singularities import find_singular_points
+
+# Sample points for the quick numeric parity check (irrational-looking on purpose)
+_PARITY_SAMPLES = (sp.Rational(3, 7), sp.Rational(13, 11), sp.Rational(29, 13))
+
+# Functions that can make an integrand periodic
+_PERIODIC = (sp.functions.elementary.trigonometric.TrigonometricFunction, sp.frac, sp.Mod)
+
+
+def _numeric_parity(func, x):
+    """Cheap parity guess from a few samples: 'odd', 'even' or None."""
+    odd = even = True
+    for t in _PARITY_SAMPLES:
+        try:
+            plus = complex(func.subs(x, t).evalf())
+            minus = complex(func.subs(x, -t).evalf())
+        except (TypeError, ValueError):
+            return None
+        scale = max(1.0, abs(plus))
+        even = even and abs(plus - minus) <= 1e-12 * scale
+        odd = odd and abs(plus + minus) <= 1e-12 * scale
+        if not (odd or even):
+            return None
+    if even and odd:
+        return 'even'  # Identically zero
+    return 'odd' if odd else 'even'
+
+
+@lru_cache(maxsize=256)
+def detect_parity(func, x):
+    """Return 'odd', 'even' or None for func as a function of x.
+
+    A numeric spot check rejects most integrands before the symbolic
+    confirmation is attempted.
+    """
+    guess = _numeric_parity(func, x)
+    if guess is None:
+        return None
+    mirrored = func.subs(x, -x)
+    difference = mirrored + func if guess == 'odd' else mirrored - func
+    if difference == 0 or sp.expand(difference) == 0 or sp.simplify(difference) == 0:
+        return guess
+    return None
+
+
+def _may_be_periodic(func):
+    """Whether func contains a periodic function, such as sin or exp(I*x)."""
+    return func.has(*_PERIODIC) or any(e.exp.has(sp.I) for e in func.atoms(sp.exp))
+
+
+@lru_cache(maxsize=256)
+def detect_period(func, x):
+    """Return the fundamental period of func in x, or None if not periodic."""
+    if not func.has(x) or not _may_be_periodic(func):
+        return None
+    try:
+        period = periodicity(func, x)
+    except Exception:
+        return None
+    if period is None or period == 0 or not period.is_positive:
+        return None
+    return period
+
+
+def reduce_by_symmetry(func, x, a, b):
+    """Reduce ∫ₐᵇ func dx using parity and periodicity.
+
+    Returns (factor, a', b') such that the integral equals
+    factor * ∫ₐ'ᵇ' func dx; factor is 0 when the integral vanishes.
+    Returns (1, a, b) when no shortcut applies.
+    """
+    a = sp.sympify(a)
+    b = sp.sympify(b)
+    factor = sp.Integer(1)
+
+    while a != b:
+        # Whole periods: ∫ over n periods is n times one period
+        period = detect_period(func, x) if (b - a).is_finite else None
+        if period is not None:
+            periods = sp.simplify((b - a) / period)
+            if periods.is_Integer and abs(periods) >= 2:
+                factor *= periods
+                b = a + period
+                continue
+
+        # Symmetric interval [-c, c]
+        if a == -b or sp.simplify(a + b) == 0:
+            parity = detect_parity(func, x)
+            if parity == 'odd':
+                # A pole at 0, or an infinite interval, may make the integral
+                # divergent rather than zero
+                if b.is_finite and find_singular_points(func, x, a, b) == ():
+                    return sp.Integer(0), a, b
+            elif parity == 'even':
+                factor *= 2
+                a = sp.Integer(0)
+                continue
+        break
+
+    return factor, a, b
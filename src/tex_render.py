@@ -0,0 +1,95 @@
+"""
+TeX rendering of the input and the results
+Expressions are converted with sympy.latex and rasterized to PNG with
+Matplotlib mathtext. The images are kept in an LRU cache keyed by
+(LaTeX string, font size, dpi), so redrawing a formula that was shown before
+costs nothing. The calculator turns the PNG data into PhotoImages.
+"""
+
+import io
+from functools import lru_cache
+
+import sympy as sp
+from matplotlib.font_manager import FontProperties
+from matplotlib.mathtext import math_to_image
+
+from integration_utils import parse_function
+
+TEX_DPI = 100
+TEX_COLOR = '#333333'
+# Longer formulas are not typeset; they would not fit on any screen
+MAX_LATEX_LENGTH = 2000
+# Results with more nodes are not typeset and printed without sorting terms
+LARGE_EXPRESSION = 2000
+
+
+def is_large(expr, limit=LARGE_EXPRESSION):
+    """True when expr has more than limit nodes (counting stops there)"""
+    for count, _ in enumerate(sp.preorder_traversal(expr), 1):
+        if count > limit:
+            return True
+    return False
+
+
+def result_text(expr):
+    """str(expr), except that large expressions keep their term order:
+    sorting the terms is most of the printing time"""
+    return sp.sstr(expr, order='none') if is_large(expr) else str(expr)
+
+
+@lru_cache(maxsize=512)
+def expression_latex(text):
+    """LaTeX of an expression typed by the user, kept as typed (not
+    simplified), or None while it does not parse (e.g. "sin(" mid-typing).
+    """
+    try:
+        return sp.latex(parse_function(text, evaluate=False))
+    except Exception:
+        return None
+
+
+def bounds_latex(text, count=1):
+    """LaTeX of the bounds typed in one field: a single bound, or one per
+    variable separated by commas when there are several. None when a bound
+    does not parse or the number does not match.
+    """
+    parts = text.split(',') if count > 1 else [text]
+    if len(parts) != count:
+        return None
+    bounds = [expression_latex(part) for part in parts]
+    return None if None in bounds else bounds
+
+
+def integral_latex(integrand, variables, lower=None, upper=None, result=None, constant=False):
+    """LaTeX of an integral and optionally its result.
+
+    integrand and result are LaTeX strings, variables the integration
+    variables, inner to outer. lower and upper list the LaTeX bounds per
+    variable for a definite integral. constant adds "+ C" to the result.
+    """
+    if lower is None or upper is None:
+        signs = r"\int" * len(variables)
+    else:
+        signs = "".join(rf"\int_{{{lo}}}^{{{hi}}}" for lo, hi in reversed(list(zip(lower, upper))))
+    differentials = r"\,".join(f"d{sp.latex(v)}" for v in variables)
+    latex = rf"{signs} \left({integrand}\right)\,{differentials}"
+    if result is not None:
+        latex += f" = {result}" + (" + C" if constant else "")
+    return latex
+
+
+@lru_cache(maxsize=256)
+def tex_png(latex, size=16, dpi=TEX_DPI):
+    """PNG data of $latex$ rendered with mathtext at size points, or None
+    when mathtext cannot typeset it or it is longer than MAX_LATEX_LENGTH.
+    Cached by (latex, size, dpi).
+    """
+    if len(latex) > MAX_LATEX_LENGTH:
+        return None
+    buffer = io.BytesIO()
+    try:
+        math_to_image(f"${latex}$", buffer, prop=FontProperties(size=size), dpi=dpi,
+                      format='png', color=TEX_COLOR)
+    except Exception:
+        return None
+    return buffer.getvalue()
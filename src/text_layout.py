@@ -0,0 +1,135 @@
+"""
+Line wrapping with cached font measurements
+Text is split into tokens at spaces and math operators; each distinct token
+is measured once per font and lines are filled with a running width, so
+wrapping is linear in the length of the text. Whole wrap results are cached
+per (text, width, font). Fonts are given as a measure callable (e.g. the
+measure method of a tkinter Font) plus a hashable key.
+"""
+
+import re
+from functools import lru_cache
+
+# Operators are tokens of their own; everything else breaks at spaces
+TOKENS = re.compile(r"[+\-*/^=(),·×÷]|[^\s+\-*/^=(),·×÷]+")
+
+
+class TextMeasure:
+    """Widths of strings in one font, measured once per token.
+
+    Line widths are the sum of the token widths plus one space between
+    tokens, which is what the font measures for the joined line up to
+    kerning across token boundaries.
+    """
+
+    def __init__(self, measure):
+        self.measure = measure
+        self.widths = {}
+        self.space = measure(" ")
+
+    def width(self, token):
+        width = self.widths.get(token)
+        if width is None:
+            width = self.widths[token] = self.measure(token)
+        return width
+
+    def line_width(self, tokens):
+        if not tokens:
+            return 0
+        return sum(self.width(t) for t in tokens) + self.space * (len(tokens) - 1)
+
+
+_measures = {}
+
+
+def font_key(font):
+    """Hashable description of a tkinter Font (family, size, weight, ...)"""
+    return tuple(sorted(font.actual().items()))
+
+
+def text_measure(key, measure):
+    """The TextMeasure of the font with this key, created on first use"""
+    widths = _measures.get(key)
+    if widths is None:
+        widths = _measures[key] = TextMeasure(measure)
+    return widths
+
+
+def tokenize(text):
+    """Tokens of a math string, split at spaces and around operators"""
+    return TOKENS.findall(text)
+
+
+def iter_lines(text, max_width, widths):
+    """Lines of text at most max_width wide, produced as they are consumed.
+
+    widths is the TextMeasure of the font. Lines are the tokens joined by
+    single spaces.
+    """
+    line = []
+    line_width = 0
+    for match in TOKENS.finditer(text):
+        token = match.group()
+        width = widths.width(token)
+        if line and line_width + widths.space + width > max_width:
+            yield " ".join(line)
+            line, line_width = [], 0
+        line_width += width if not line else widths.space + width
+        line.append(token)
+    if line:
+        yield " ".join(line)
+
+
+@lru_cache(maxsize=512)
+def _wrap_cached(text, max_width, key):
+    return tuple(iter_lines(text, max_width, _measures[key])) or (text,)
+
+
+def wrap_text(text, max_width, key, measure):
+    """Wrap a math string to lines at most max_width wide.
+
+    Breaks at spaces and around operators; a single token wider than
+    max_width gets a line of its own. key identifies the font measured by
+    measure (see font_key). Returns a list of lines, cached per
+    (text, max_width, key).
+    """
+    if not text:
+        return [""]
+    text_measure(key, measure)
+    return list(_wrap_cached(text, max_width, key))
+
+
+class LazyLines:
+    """The wrapped lines of a long text, computed only up to the last line
+    asked for, so very long results can be shown without wrapping all of
+    them first.
+    """
+
+    def __init__(self, text, max_width, key, measure):
+        self.lines = []
+        self._source = iter_lines(text, max_width, text_measure(key, measure))
+        self._done = False
+        # Progress through the text, counted in characters other than spaces
+        self._total = max(len(text) - sum(map(str.isspace, text)), 1)
+        self._consumed = 0
+
+    def get(self, index):
+        """Line index, or None past the last line"""
+        while not self._done and len(self.lines) <= index:
+            line = next(self._source, None)
+            if line is None:
+                self._done = True
+            else:
+                self.lines.append(line)
+                self._consumed += len(line) - line.count(" ")
+        return self.lines[index] if index < len(self.lines) else None
+
+    def estimated_count(self):
+        """Number of lines: exact once all are wrapped, otherwise
+        extrapolated from the part of the text wrapped so far"""
+        if self._done:
+            return len(self.lines)
+        if not self.lines:
+            return 1
+        estimate = round(len(self.lines) * self._total / self._consumed)
+        return max(estimate, len(self.lines) + 1)
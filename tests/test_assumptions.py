@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for symbol assumptions
+Checks parsing of assumptions and that assumed parameters avoid Piecewise results
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import sympy as sp
+from sympy import symbols, integrate, oo
+from integration_utils import parse_assumptions, parse_function, assumed_symbols
+from batch_integration import parameter_sweep
+from multiple_integrals import multiple_integral
+
+
+def test_parse_assumptions():
+    """Assumption text is parsed into flags per symbol"""
+    print("ASSUMPTION PARSING TESTS")
+    print("-" * 60)
+
+    assumptions = parse_assumptions("k: positive; a, b: real nonzero\nn: integer")
+    print(f"Parsed: {assumptions}")
+    assert assumptions == {'k': ('positive',), 'a': ('real', 'nonzero'),
+                           'b': ('real', 'nonzero'), 'n': ('integer',)}
+    assert parse_assumptions("") == {}
+
+    for bad in ("k: postive", "k positive"):
+        try:
+            parse_assumptions(bad)
+        except ValueError as e:
+            print(f"{bad!r}: {e}")
+        else:
+            raise AssertionError(f"{bad!r} should be rejected")
+
+    k = assumed_symbols({'k': 'positive'})['k']
+    assert k.is_positive
+    assert k != symbols('k')
+
+
+def test_assumptions_avoid_piecewise():
+    """Assumed parameters give plain closed forms instead of Piecewise"""
+    print("PIECEWISE AVOIDANCE TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    plain = integrate(parse_function("exp(-k*x)"), (x, 0, oo))
+    assumed = integrate(parse_function("exp(-k*x)", {'k': 'positive'}), (x, 0, oo))
+    print(f"Without assumptions: {plain}")
+    print(f"With k positive: {assumed}")
+    assert plain.has(sp.Piecewise)
+    assert not assumed.has(sp.Piecewise)
+    assert assumed == 1 / assumed_symbols({'k': 'positive'})['k']
+
+    # SymPy expressions are converted too
+    k = symbols('k')
+    assert parse_function(k * x, {'k': 'positive'}).has(assumed_symbols({'k': 'positive'})['k'])
+
+    y = symbols('y')
+    result, method = multiple_integral("exp(-a*x - a*y)", [(x, 0, oo), (y, 0, oo)],
+                                       assumptions={'a': 'positive'})
+    print(f"Double integral with a positive: {result} ({method})")
+    assert method == 'symbolic'
+    assert not result.has(sp.Piecewise)
+
+
+def test_sweep_with_assumptions():
+    """Parameter sweeps accept assumptions for the swept parameters"""
+    print("SWEEP WITH ASSUMPTIONS TEST")
+    print("-" * 60)
+
+    k = np.linspace(0.5, 4, 8)
+    values = parameter_sweep("exp(-k*x^2)*cos(x)", 0, "oo", {"k": k}, assumptions={"k": "positive"})
+    expected = np.sqrt(np.pi / k) * np.exp(-1 / (4 * k)) / 2
+    print(f"Max error: {np.max(np.abs(values - expected)):.2e}")
+    assert np.allclose(values, expected, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    test_parse_assumptions()
+    test_assumptions_avoid_piecewise()
+    test_sweep_with_assumptions()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for batch definite integration
+Checks vectorized F(b) - F(a) evaluation and the quadrature fallback
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from batch_integration import (definite_integrals_batch, cumulative_integral, iter_cumulative_integral,
+                               parameter_sweep)
+
+
+def test_batch_polynomial():
+    """Many bound pairs for a polynomial match the closed form"""
+    print("BATCH POLYNOMIAL TEST")
+    print("-" * 60)
+
+    a = np.linspace(-3, 3, 2000)
+    b = a + 0.5
+    values = definite_integrals_batch("x^2", a, b)
+    expected = (b ** 3 - a ** 3) / 3
+    error = np.max(np.abs(values - expected))
+    print(f"Pairs: {a.size}, max error: {error:.2e}")
+    assert values.shape == a.shape
+    assert error < 1e-10
+
+
+def test_batch_quadrature_fallback():
+    """Intervals crossing a discontinuity of F, and integrands without an
+    elementary antiderivative, fall back to quadrature"""
+    print("BATCH QUADRATURE FALLBACK TEST")
+    print("-" * 60)
+
+    # log(x) is not defined for x < 0, so [-2, -1] falls back to quadrature
+    values = definite_integrals_batch("1/x", [1, -2], [2, -1])
+    print(f"int 1/x dx over [1, 2] and [-2, -1]: {values}")
+    assert np.allclose(values, [np.log(2), -np.log(2)])
+
+    # No elementary antiderivative
+    values = definite_integrals_batch("exp(x^2)*sin(x)", [0, 1], [1, 0])
+    print(f"int exp(x^2)*sin(x) dx over [0, 1] and [1, 0]: {values}")
+    assert np.isclose(values[0], 0.778745, atol=1e-6)
+    assert np.isclose(values[1], -values[0])
+
+
+
+def test_batch_divergent_integrals():
+    """Intervals containing a pole of the integrand are not integrated by
+    quadrature: divergent pairs give inf or nan, improper ones their value"""
+    print("BATCH DIVERGENT INTEGRALS TEST")
+    print("-" * 60)
+
+    values = definite_integrals_batch("1/x^2", [-1, 1], [1, 2])
+    print(f"int 1/x^2 dx over [-1, 1] and [1, 2]: {values}")
+    assert values[0] == np.inf and np.isclose(values[1], 0.5)
+
+    values = definite_integrals_batch("1/x", [0, 1], [1, 0])
+    print(f"int 1/x dx over [0, 1] and [1, 0]: {values}")
+    assert values[0] == np.inf and values[1] == -np.inf
+
+    values = definite_integrals_batch("tan(x)", [0, 0], [2, 1])
+    print(f"int tan(x) dx over [0, 2] and [0, 1]: {values}")
+    assert not np.isfinite(values[0]) and np.isclose(values[1], -np.log(np.cos(1)))
+
+    values = definite_integrals_batch("1/sqrt(x)", 0, 1)
+    assert np.isclose(values, 2)
+
+    try:
+        definite_integrals_batch("y*x", 0, 1)
+    except ValueError as e:
+        print(f"y*x: {e}")
+        assert "y" in str(e)
+    else:
+        raise AssertionError("unbound symbol accepted")
+
+
+def test_batch_infinite_bounds():
+    """Infinite bounds use limits of F or the mapped quadrature"""
+    print("BATCH INFINITE BOUNDS TEST")
+    print("-" * 60)
+
+    values = definite_integrals_batch("exp(-x^2)", [-np.inf, 0], [np.inf, np.inf])
+    print(f"Gaussian integrals: {values}")
+    assert np.allclose(values, [np.sqrt(np.pi), np.sqrt(np.pi) / 2], atol=1e-8)
+
+    # Divergent integrals are not given a finite quadrature value
+    cases = [
+        ("1", 0, np.inf, np.inf),
+        ("1/x", 1, np.inf, np.inf),
+        ("x^2", np.inf, 0, -np.inf),
+        ("sin(x)", 0, np.inf, np.nan),
+        ("x", -np.inf, np.inf, np.nan),
+        ("1/log(x)^2", 2, np.inf, np.nan),  # SymPy's limit of F has the wrong sign
+        ("x^x", 1, np.inf, np.nan),  # No antiderivative, the tail grows
+    ]
+    for func, a, b, expected in cases:
+        value = definite_integrals_batch(func, a, b)
+        print(f"∫ {func} from {a} to {b}: {value}")
+        assert np.array_equal(value, expected, equal_nan=True), (func, value)
+
+    # Convergent ones without an antiderivative still use the quadrature
+    value = definite_integrals_batch("x^(-x)", 1, np.inf)
+    assert abs(value - 0.7041699604) < 1e-8
+
+
+def test_cumulative_integral():
+    """Cumulative integral on a grid matches the antiderivative"""
+    print("CUMULATIVE INTEGRAL TEST")
+    print("-" * 60)
+
+    for method in ("gauss", "simpson"):
+        grid, values = cumulative_integral("cos(x)", 0, 10, 2001, method=method)
+        error = np.max(np.abs(values - np.sin(grid)))
+        print(f"{method}: {grid.size} points, max error: {error:.2e}")
+        assert grid.size == 2001
+        assert values[0] == 0.0
+        assert error < 1e-9
+
+    # Bounds may be expressions, as in parameter_sweep
+    grid, values = cumulative_integral("sin(x)", 0, "pi", 101)
+    assert np.isclose(grid[-1], np.pi)
+    assert abs(values[-1] - 2.0) < 1e-9
+
+
+def test_cumulative_integral_chunks():
+    """Streaming in small chunks gives the same values as one chunk"""
+    print("CUMULATIVE INTEGRAL CHUNK TEST")
+    print("-" * 60)
+
+    _, whole = cumulative_integral("x*exp(-x)", 0, 5, 1000)
+    chunks = list(iter_cumulative_integral("x*exp(-x)", 0, 5, 1000, chunk_size=64))
+    streamed = np.concatenate([values for _, values in chunks])
+    print(f"Chunks: {len(chunks)}, max difference: {np.max(np.abs(whole - streamed)):.2e}")
+    assert len(chunks) == 16
+    assert np.allclose(whole, streamed, rtol=0, atol=1e-12)
+
+
+def test_parameter_sweep():
+    """Symbolic sweep over a parameter grid, with numeric fallback"""
+    print("PARAMETER SWEEP TESTS")
+    print("-" * 60)
+
+    a = np.array([1.0, 2.0, 3.0])
+    k = np.linspace(0.5, 3, 6)
+    values = parameter_sweep("a*exp(-k*x)", 0, "oo", {"a": a, "k": k})
+    print(f"Grid shape: {values.shape}")
+    assert values.shape == (3, 6)
+    assert np.allclose(values, a[:, None] / k[None, :], rtol=1e-12)
+
+    # Divergent for n = -1, which the symbolic form reports as oo
+    values = parameter_sweep("x^n", 0, 1, {"n": [0, 1, 2, -0.5, -1]})
+    print(f"x^n on [0, 1]: {values}")
+    assert np.allclose(values[:4], [1, 0.5, 1 / 3, 2])
+    assert np.isinf(values[4])
+
+    # Symbolic integration times out, every point is integrated numerically
+    k = np.linspace(0, 3, 2000)
+    values = parameter_sweep("exp(-k*x^2)*sin(x)^2/(1+x)", 0, 2, {"k": k}, timeout=0.5, chunk_size=256)
+    exact_k0 = 0.5293007562
+    print(f"Numeric sweep at k=0: {values[0]:.10f}")
+    assert abs(values[0] - exact_k0) < 1e-8
+    assert np.all(np.diff(values) < 0)
+
+
+def test_parameter_sweep_poles():
+    """Numeric fallback points with a pole in [a, b] are not integrated"""
+    print("PARAMETER SWEEP POLE TESTS")
+    print("-" * 60)
+
+    values = parameter_sweep("1/(x-c)", 0, 1, {"c": [0.5, 2, -1, 1]})
+    print(f"1/(x-c) on [0, 1]: {values}")
+    assert np.isnan(values[0]) and np.isnan(values[3])
+    assert np.allclose(values[1:3], [np.log(1 / 2), np.log(2)])
+
+    # The same without the symbolic form
+    values = parameter_sweep("1/(x-c)", 0, 1, {"c": [0.5, 2]}, timeout=0.0001)
+    assert np.isnan(values[0]) and abs(values[1] - np.log(1 / 2)) < 1e-10
+
+    # Poles without a closed form (π/(2k) inside [0, 1] for k > π/2)
+    k = np.linspace(0.1, 3, 200)
+    values = parameter_sweep("tan(k*x)", 0, 1, {"k": k}, timeout=0.0001)
+    inside = k >= np.pi / 2
+    assert np.all(np.isnan(values[inside]))
+    assert np.allclose(values[~inside], -np.log(np.cos(k[~inside])) / k[~inside])
+
+
+if __name__ == "__main__":
+    test_batch_polynomial()
+    test_batch_quadrature_fallback()
+    test_batch_divergent_integrals()
+    test_batch_infinite_bounds()
+    test_cumulative_integral()
+    test_cumulative_integral_chunks()
+    test_parameter_sweep()
+    test_parameter_sweep_poles()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the input display canvas
+Checks that typing does not pile up canvas items or widgets and that
+keystrokes are coalesced into one redraw (needs a display, skipped otherwise)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tkinter as tk
+from integral_calculator import IntegralCalculator
+
+
+def make_calculator():
+    """Calculator on a hidden Tk root, or None without a display"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        if 'pytest' in sys.modules:
+            # Reported as skipped, not passed
+            import pytest
+            pytest.skip("No display available")
+        print("No display available, skipped")
+        return None, None
+    root.withdraw()
+    return root, IntegralCalculator(root)
+
+
+def type_text(calc, text):
+    """Simulate typing text key by key into the input field"""
+    for ch in text:
+        calc.function_var.set(calc.function_var.get() + ch)
+        calc.update_display()
+
+
+def test_item_count_stays_bounded():
+    """The grid is drawn once per size and typing does not add items"""
+    print("DISPLAY ITEM COUNT TEST")
+    print("-" * 60)
+
+    root, calc = make_calculator()
+    if calc is None:
+        return
+    try:
+        expression = "sin(x)^2 + 3x*exp(x) - 1/(x+1)"
+        type_text(calc, expression * 3)
+        typed_count = calc.display_item_count()
+        grid_items = len(calc.display_canvas.find_withtag("grid"))
+
+        # A fresh display of the same text has the same number of items
+        calc.function_var.set("")
+        calc.update_display()
+        calc.function_var.set(expression * 3)
+        calc.update_display()
+        print(f"Items after typing: {typed_count}, fresh: {calc.display_item_count()}, grid: {grid_items}")
+        assert typed_count == calc.display_item_count()
+        assert grid_items == len(calc.display_canvas.find_withtag("grid"))
+
+        # Unchanged content is not redrawn at all
+        items = calc.display_canvas.find_all()
+        calc.update_display()
+        assert calc.display_canvas.find_all() == items
+    finally:
+        root.destroy()
+
+
+def test_widgets_are_reused():
+    """Typing and switching the integral type create no new widgets"""
+    print("DISPLAY WIDGET REUSE TEST")
+    print("-" * 60)
+
+    root, calc = make_calculator()
+    if calc is None:
+        return
+    try:
+        canvas = calc.display_canvas
+        widgets = canvas.winfo_children()
+        integral_items = canvas.find_withtag("integral")
+
+        type_text(calc, "exp(-x^2)*cos(3x) + sqrt(1+x^4)")
+        calc.integral_type_var.set("definite")
+        calc.lower_bound_var.set("0")
+        calc.upper_bound_var.set("pi")
+        calc.update_display()
+        upper_text = calc.display_items['upper_text']
+        assert canvas.itemcget(upper_text, 'text') == "pi"
+
+        calc.integral_type_var.set("indefinite")
+        calc.update_display()
+        assert canvas.itemcget(upper_text, 'text') == ""
+
+        print(f"Widgets: {len(widgets)} before, {len(canvas.winfo_children())} after")
+        assert canvas.winfo_children() == widgets
+        assert canvas.find_withtag("integral") == integral_items
+    finally:
+        root.destroy()
+
+
+def test_keystrokes_are_coalesced():
+    """Keystrokes queued before the display is idle cause a single redraw"""
+    print("COALESCED DISPLAY UPDATE TEST")
+    print("-" * 60)
+
+    root, calc = make_calculator()
+    if calc is None:
+        return
+    try:
+        redraws = []
+        draw = calc.create_integral_display
+        calc.create_integral_display = lambda: (redraws.append(calc.function_var.get()), draw())
+
+        for ch in "x^3 + sin(x)":
+            calc.function_var.set(calc.function_var.get() + ch)
+            calc.schedule_display_update()
+        assert redraws == []
+        root.update()
+
+        summary = calc.display_latency_summary()
+        print(f"Redraws: {len(redraws)}, latency: {summary}")
+        assert redraws == ["x^3 + sin(x)"]
+        assert summary['count'] == 1 and summary['max_ms'] >= 0.0
+        assert calc.display_update_id is None
+    finally:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    test_item_count_stays_bounded()
+    test_widgets_are_reused()
+    test_keystrokes_are_coalesced()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script for the expression parser
+Checks the calculator syntax, precedence, implicit multiplication, error
+positions and that nothing is evaluated as Python code
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+
+import sympy as sp
+from sympy import symbols, sqrt, sin, cos, exp, log, atan2, factorial, Function, pi, oo, Rational
+
+from expression_parser import parse_expression, ParseError
+from integration_utils import parse_function, assumed_symbols
+
+x, y = symbols('x y')
+
+
+def test_syntax():
+    """Calculator notation gives the expected SymPy expressions"""
+    print("SYNTAX TESTS")
+    print("-" * 60)
+
+    cases = [
+        ("x^2", x**2),
+        ("x**2", x**2),
+        ("2x", 2 * x),
+        ("3(x+1)", 3 * (x + 1)),
+        ("(x+1)(x-1)", (x + 1) * (x - 1)),
+        ("x sin(x)", x * sin(x)),
+        ("2x^2", 2 * x**2),
+        ("2^3x", 8 * x),
+        ("1/2x", x / 2),
+        ("-x^2", -x**2),
+        ("2^-1", Rational(1, 2)),
+        ("2^3^2", 2**9),
+        ("sin(x)^2", sin(x)**2),
+        ("3×x÷2", 3 * x / 2),
+        ("x·y − 1", x * y - 1),
+        ("√x + 1", sqrt(x) + 1),
+        ("2√(x+1)", 2 * sqrt(x + 1)),
+        ("x²+x³", x**2 + x**3),
+        ("π", pi),
+        ("2πx", 2 * pi * x),
+        ("E^x", exp(x)),
+        ("exp(-x^2)", exp(-x**2)),
+        ("log(x, 2)", log(x, 2)),
+        ("ln(x)", log(x)),
+        ("abs(x)", sp.Abs(x)),
+        ("atan2(y, x)", atan2(y, x)),
+        ("x!", factorial(x)),
+        ("-∞", -oo),
+        ("f(x)", Function('f')(x)),
+        ("0.5x", sp.Float(0.5) * x),
+        ("1e-3", sp.Float('1e-3')),
+    ]
+    for text, expected in cases:
+        result = parse_expression(text)
+        print(f"{text:15} -> {result}")
+        assert result == expected, (text, result, expected)
+
+
+def test_unevaluated():
+    """evaluate=False keeps the expression as typed"""
+    print("UNEVALUATED TESTS")
+    print("-" * 60)
+
+    assert sp.latex(parse_expression("x + x", evaluate=False)) == "x + x"
+    assert sp.latex(parse_expression("x/2", evaluate=False)) == r"\frac{x}{2}"
+    assert sp.latex(parse_expression("--x", evaluate=False)) == "x"
+    assert sp.latex(parse_expression("√4", evaluate=False)) == r"\sqrt{4}"
+
+
+def test_errors():
+    """Syntax errors report where they are"""
+    print("ERROR TESTS")
+    print("-" * 60)
+
+    cases = [
+        ("x^", 2),
+        ("(x+1", 4),
+        ("x+1)", 3),
+        ("sin x", 4),
+        ("2 $ x", 2),
+        ("sin(1, 2)", 0),
+        ("x2", 1),
+        ("x.5", 1),
+        ("2 3", 2),
+        ("(x+1)2", 5),
+    ]
+    for text, position in cases:
+        try:
+            parse_expression(text)
+        except ParseError as e:
+            print(f"{text:10} -> {e}")
+            assert e.position == position, (text, e.position)
+            assert isinstance(e, ValueError)
+        else:
+            raise AssertionError(f"{text!r} parsed")
+
+
+def test_no_python_evaluation():
+    """Input is never run as Python code"""
+    print("SAFETY TESTS")
+    print("-" * 60)
+
+    for text in ["__import__('os').system('true')", "x.__class__", "lambda: 1", "[x for x in y]"]:
+        try:
+            parse_expression(text)
+        except ParseError as e:
+            print(f"{text:35} -> {e}")
+        else:
+            raise AssertionError(f"{text!r} parsed")
+
+
+def test_limits():
+    """Deep nesting and huge numbers raise ParseError quickly"""
+    print("LIMIT TESTS")
+    print("-" * 60)
+
+    assert parse_expression("(" * 50 + "x" + ")" * 50) == x
+    cases = [
+        ("(" * 5000 + "x" + ")" * 5000, 100),
+        ("-" * 5000 + "x", 100),
+        ("9^9^9^9", 3),
+        ("9999999!", 7),
+        ("factorial(9999999)", 0),
+        ("1" * 5000, 0),
+    ]
+    for text, position in cases:
+        start = time.perf_counter()
+        try:
+            parse_expression(text)
+        except ParseError as e:
+            print(f"{text[:20]:20} -> {e} in {(time.perf_counter() - start) * 1000:.1f} ms")
+            assert e.position == position, (text[:20], e.position)
+        else:
+            raise AssertionError(f"{text[:20]!r} parsed")
+        assert time.perf_counter() - start < 1.0
+
+    assert parse_expression("2^100") == 2**100
+    assert parse_expression("100!") == factorial(100)
+
+    # Functions SymPy evaluates exactly for integers are limited, others
+    # outside the list of functions are undefined functions (never evaluated)
+    for text in ["gamma(10^5)", "binomial(10^5, 5*10^4)", "zeta(10^6)", "polygamma(1000, 1000)",
+                 "lowergamma(1000, x)"]:
+        start = time.perf_counter()
+        try:
+            parse_expression(text)
+        except ParseError as e:
+            print(f"{text:22} -> {e}")
+            assert e.position == 0
+        else:
+            raise AssertionError(f"{text!r} parsed")
+        assert time.perf_counter() - start < 1.0
+    for text in ["harmonic(10^6)", "fibonacci(10^6)"]:
+        start = time.perf_counter()
+        result = parse_expression(text)
+        assert isinstance(result.func, sp.core.function.UndefinedFunction)
+        assert time.perf_counter() - start < 1.0
+    assert parse_expression("gamma(5)") == 24
+
+
+def test_parse_function():
+    """parse_function uses the parser with assumptions and caches results"""
+    print("PARSE FUNCTION TESTS")
+    print("-" * 60)
+
+    k = assumed_symbols({'k': 'positive'})['k']
+    assert parse_function("exp(-k x)", {'k': 'positive'}) == exp(-k * x)
+    assert parse_function("2x") is parse_function("2x")
+
+    # A name before a parenthesis means the same with and without assumptions
+    f = Function('x')(x + 1)
+    assert parse_function("x(x+1)") == f
+    assert parse_function("x(x+1)", {'x': 'real'}).func == f.func
+    xr = assumed_symbols({'x': 'real'})['x']
+    assert parse_function("x (x+1)", {'x': 'real'}) == xr * (xr + 1)
+
+    try:
+        parse_function("   ")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("empty input parsed")
+
+    texts = [f"x^{i} sin({i}x) + cos(x)/(1+x^2)" for i in range(200)]
+    start = time.perf_counter()
+    for text in texts:
+        parse_expression(text)
+    elapsed = time.perf_counter() - start
+    print(f"{len(texts)} expressions parsed in {elapsed * 1000:.1f} ms")
+    assert parse_expression(texts[3]) == x**3 * sin(3 * x) + cos(x) / (1 + x**2)
+
+
+if __name__ == "__main__":
+    test_syntax()
+    test_unevaluated()
+    test_errors()
+    test_no_python_evaluation()
+    test_limits()
+    test_parse_function()
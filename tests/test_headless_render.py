@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for headless rendering
+Checks PNG/SVG output, the process-pool batch and that tkinter is never imported
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import subprocess
+import tempfile
+
+import numpy as np
+import sympy as sp
+from sympy import symbols, Si, pi
+from integration_utils import lambdify_numpy
+from symbolic_integration import definite_integral
+from headless_render import equation_text, render_integral, render_batch
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def test_no_tkinter_import():
+    """The renderer and everything it uses load without tkinter"""
+    print("NO TKINTER TEST")
+    print("-" * 60)
+
+    code = ("import sys; sys.path.insert(0, sys.argv[1]); import headless_render; "
+            "print('tkinter' not in sys.modules, sorted(m for m in sys.modules if 'tkinter' in m))")
+    result = subprocess.run([sys.executable, '-c', code, SRC], capture_output=True, text=True)
+    print(f"tkinter not loaded, tkinter modules: {result.stdout.strip()}")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "True []"
+
+
+def test_equation_and_results():
+    """Definite pipeline and the equation text"""
+    print("EQUATION TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    integral, exact, numeric = definite_integral(x ** 2, x, 0, 2)
+    assert exact == sp.Rational(8, 3)
+    text = equation_text(x ** 2, x, integral, 0, 2, exact, numeric)
+    print(text)
+    assert text.startswith("$\\int_{0}^{2}") and "\\approx 2.6666667" in text
+
+    # Odd integrand on a symmetric interval: no antiderivative needed
+    integral, exact, _ = definite_integral(x ** 3 * sp.cos(x), x, -pi, pi)
+    assert integral is None and exact == 0
+
+    # Antiderivatives with special functions can be sampled for the plot
+    values = lambdify_numpy(Si(x), x)(np.array([0.0, 1.0]))
+    assert np.allclose(values, [0.0, 0.9460830703671830])
+
+
+def test_render_files():
+    """Single renders and a parallel batch"""
+    print("RENDER TESTS")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        png = render_integral("exp(-x^2)", os.path.join(out_dir, "gauss.png"), -1, 2)
+        svg = render_integral("sin(x)/x", os.path.join(out_dir, "si.svg"))
+        with open(png, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+        with open(svg) as f:
+            assert '<svg' in f.read()
+
+        paths = render_batch(["x^2", ("cos(x)", 0, "pi"), "x +* 2"], out_dir, fmt='png', workers=2)
+        print(f"Batch: {[p and os.path.basename(p) for p in paths]}")
+        assert [os.path.basename(p) for p in paths[:2]] == ["integral_000.png", "integral_001.png"]
+        assert all(os.path.getsize(p) > 1000 for p in paths[:2])
+        assert paths[2] is None
+
+        try:
+            render_integral("x", os.path.join(out_dir, "x.gif"))
+        except ValueError as e:
+            print(f"gif: {e}")
+        else:
+            raise AssertionError("gif output should be rejected")
+
+
+if __name__ == "__main__":
+    test_no_tkinter_import()
+    test_equation_and_results()
+    test_render_files()
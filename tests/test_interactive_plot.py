@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for pan and zoom of the integral plot
+Checks that only newly exposed ranges are sampled and that frames are blitted
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from types import SimpleNamespace
+
+import numpy as np
+from sympy import symbols, exp
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from plotting import adaptive_sample
+from interactive_plot import SampleCache, PanZoomPlot
+
+
+def test_sample_cache():
+    """Panning samples only the exposed strip, zooming far resamples"""
+    print("SAMPLE CACHE TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    xs, ys = adaptive_sample("sin(x)", x, 0, 10)
+    cache = SampleCache("sin(x)", x, xs, ys)
+
+    view_x, view_y = cache.samples(2, 8)
+    assert cache.evaluated == 0
+    assert view_x[0] <= 2 and view_x[-1] >= 8
+    assert np.allclose(view_y, np.sin(view_x))
+
+    cache.samples(1, 11)
+    print(f"Pan by 1 to the right: {cache.evaluated} new samples, {xs.size} in the first view")
+    assert 0 < cache.evaluated < xs.size / 4
+    assert np.all(np.diff(cache.xs) > 0)
+    assert np.allclose(cache.ys, np.sin(cache.xs))
+
+    cache.samples(-1, 11)
+    evaluated = cache.evaluated
+    cache.samples(0, 10)
+    assert cache.evaluated == evaluated
+
+    # Zoomed in far: the new view is sampled at its own resolution
+    view_x, _ = cache.samples(4, 4.5)
+    print(f"Zoomed to [4, 4.5]: {view_x.size} samples")
+    assert view_x.size >= 60
+
+
+def test_pan_zoom_blitting():
+    """Drag and scroll events update the curves by blitting"""
+    print("PAN AND ZOOM TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    figure = Figure(figsize=(7, 2.8))
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    full_draws = []
+    canvas.mpl_connect('draw_event', lambda event: full_draws.append(event))
+    blits = []
+    canvas.blit = lambda bbox=None: blits.append(bbox)
+
+    view = PanZoomPlot(canvas, ax)
+    view.show("x*exp(-x^2/10)", x, 0, 3, antiderivative=-5 * exp(-x ** 2 / 10))
+    canvas.draw()
+    assert view.background is not None
+    draws_before = len(full_draws)
+
+    view._on_press(SimpleNamespace(x=300, y=100, inaxes=ax, button=1))
+    for step in range(1, 31):
+        view._on_motion(SimpleNamespace(x=300 - 5 * step, y=100, inaxes=ax, button=1))
+    xlo, xhi = ax.get_xlim()
+    curve_x, _ = view.artists['curve'].get_data()
+    print(f"After panning: view [{xlo:.2f}, {xhi:.2f}], "
+          f"{view.caches['curve'].evaluated} new samples, last frame {view.last_frame_seconds * 1000:.2f} ms")
+    assert len(blits) == 30
+    assert len(full_draws) == draws_before
+    assert curve_x[0] <= xlo and curve_x[-1] >= xhi
+    assert view.last_frame_seconds < 0.1
+
+    view._on_release(SimpleNamespace())
+    view._on_scroll(SimpleNamespace(button='up', inaxes=ax, xdata=1.0, ydata=0.0))
+    new_lo, new_hi = ax.get_xlim()
+    assert np.isclose(new_hi - new_lo, (xhi - xlo) / 1.2)
+    assert len(blits) == 31
+
+
+if __name__ == "__main__":
+    test_sample_cache()
+    test_pan_zoom_blitting()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for validated interval enclosures of definite integrals
+Checks that enclosures contain the exact value and respect the work cap
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+
+import mpmath
+import sympy as sp
+from mpmath import iv
+from interval_integration import definite_integral_enclosure, format_enclosure
+from symbolic_integration import definite_integral
+
+
+def contains(enclosure, value):
+    return mpmath.mpf(enclosure.a) <= value <= mpmath.mpf(enclosure.b)
+
+
+def test_enclosures_contain_exact_values():
+    """Enclosures contain the exact integral and are narrow"""
+    print("INTERVAL ENCLOSURE TESTS")
+    print("-" * 60)
+
+    test_cases = [
+        ("x^2", 0, 2, mpmath.mpf(8) / 3),
+        ("sin(x)", 0, "pi", mpmath.mpf(2)),
+        ("1/x", 1, 2, mpmath.log(2)),
+        ("exp(x)", 0, 1, mpmath.e - 1),
+        ("x^3", 2, 0, mpmath.mpf(-4)),
+        ("erf(x)", 0, 1, mpmath.quad(mpmath.erf, [0, 1])),
+    ]
+    for func, a, b, exact in test_cases:
+        enclosure = definite_integral_enclosure(func, a, b)
+        print(f"int {func} dx from {a} to {b} in {format_enclosure(enclosure)}")
+        assert contains(enclosure, exact)
+        assert float(enclosure.delta.b) < 1e-7
+
+
+def test_enclosure_work_cap():
+    """The work cap stops refinement but keeps the enclosure rigorous"""
+    print("INTERVAL WORK CAP TEST")
+    print("-" * 60)
+
+    enclosure = definite_integral_enclosure("exp(-x^2)", 0, 3, max_pieces=9)
+    exact = mpmath.sqrt(mpmath.pi) / 2 * mpmath.erf(3)
+    print(f"9 pieces: {format_enclosure(enclosure)}")
+    assert contains(enclosure, exact)
+    assert float(enclosure.delta.b) > 1e-8
+
+    # A pole inside the interval gives an unbounded enclosure
+    enclosure = definite_integral_enclosure("1/x", -1, 1, max_pieces=50)
+    print(f"1/x over [-1, 1]: {format_enclosure(enclosure)}")
+    assert not mpmath.isfinite(mpmath.mpf(enclosure.b))
+
+    # ... and refinement stops early instead of using every piece
+    start = time.perf_counter()
+    enclosure = definite_integral_enclosure("tan(x)", 0, 2)
+    elapsed = time.perf_counter() - start
+    print(f"tan(x) over [0, 2]: {format_enclosure(enclosure)} in {elapsed:.2f} s")
+    assert not mpmath.isfinite(mpmath.mpf(enclosure.b))
+    assert elapsed < 2.0
+
+
+def test_format_enclosure_rounds_outward():
+    """Printed end points are rounded away from the value"""
+    print("INTERVAL FORMAT TEST")
+    print("-" * 60)
+
+    text = format_enclosure(iv.mpf([1, 2]) / 3, 5)
+    print(f"[1, 2] / 3 -> {text}")
+    assert text == "[0.33333, 0.66667]"
+
+
+def test_no_enclosure_no_value():
+    """Interval mode gives no numeric value when no enclosure exists"""
+    print("NO ENCLOSURE TEST")
+    print("-" * 60)
+
+    x = sp.symbols('x')
+    for func, a, b in ((1 / x**2 + sp.atan(x), -1, 1), (sp.exp(-x**2), 0, sp.oo)):
+        _, exact, numeric = definite_integral(func, x, a, b, "Interval")
+        print(f"int_{a}^{b} {func} dx = {exact}, enclosure {numeric}")
+        assert numeric is None
+
+
+if __name__ == "__main__":
+    test_enclosures_contain_exact_values()
+    test_enclosure_work_cap()
+    test_format_enclosure_rounds_outward()
+    test_no_enclosure_no_value()
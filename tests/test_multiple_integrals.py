@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for double and triple integrals
+Checks iterated symbolic integration, inner-result caching and the cubature fallback
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import sympy as sp
+from sympy import symbols, exp, sin
+from multiple_integrals import multiple_integral, nested_gauss, inner_integral
+
+
+def test_symbolic_multiple_integrals():
+    """Double and triple integrals with variable bounds"""
+    print("SYMBOLIC MULTIPLE INTEGRAL TESTS")
+    print("-" * 60)
+
+    x, y, z = symbols('x y z')
+    test_cases = [
+        (x * y, [(x, 0, 1), (y, 0, 2)], 1),
+        (x + y, [(y, 0, x), (x, 0, 1)], sp.Rational(1, 2)),
+        (x * y * z, [(z, 0, x + y), (y, 0, x), (x, 0, 1)], sp.Rational(17, 144)),
+    ]
+    for func, limits, expected in test_cases:
+        result, method = multiple_integral(func, limits)
+        print(f"{func} over {limits}: {result} ({method})")
+        assert method == 'symbolic'
+        assert result == expected
+
+    result, method = multiple_integral(x * y, [x, y])
+    print(f"Indefinite: {result}")
+    assert result == x ** 2 * y ** 2 / 4
+
+
+def test_bounds_use_outer_variables():
+    """A bound using a variable integrated inside it is rejected"""
+    print("BOUND ORDER TESTS")
+    print("-" * 60)
+
+    x, y = symbols('x y')
+    for limits in ([(x, 0, 1), (y, 0, x)], [(x, 0, x), (y, 0, 1)]):
+        try:
+            multiple_integral(x * y, limits)
+        except ValueError as e:
+            print(f"{limits}: {e}")
+        else:
+            raise AssertionError(f"{limits} accepted")
+
+    result, method = multiple_integral(x * y, [(y, 0, x), (x, 0, 1)])
+    assert result == sp.Rational(1, 8)
+
+
+def test_inner_integral_cache():
+    """Changing the outer bounds reuses the cached inner integral"""
+    print("INNER INTEGRAL CACHE TEST")
+    print("-" * 60)
+
+    x, y = symbols('x y')
+    inner_integral.cache_clear()
+    multiple_integral(x ** 2 * y, [(x, 0, 1), (y, 0, 1)])
+    multiple_integral(x ** 2 * y, [(x, 0, 1), (y, 0, 5)])
+    info = inner_integral.cache_info()
+    print(f"Cache: {info}")
+    assert info.hits == 1
+
+
+def test_numeric_cubature():
+    """Nested Gauss matches the exact value, and takes over on timeout"""
+    print("NUMERIC CUBATURE TESTS")
+    print("-" * 60)
+
+    x, y, z = symbols('x y z')
+    value = nested_gauss(x * y * z, [(z, 0, x + y), (y, 0, x), (x, 0, 1)])
+    print(f"Nested Gauss triple integral: {value}")
+    assert abs(value - 17 / 144) < 1e-12
+
+    result, method = multiple_integral(exp(x * y ** 2) * sin(x * y), [(x, 0, 1), (y, 0, 1)], timeout=0.5)
+    print(f"Timed out symbolic integral: {result} ({method})")
+    assert method == 'numeric'
+    assert abs(float(result) - 0.3413925932) < 1e-9
+
+
+if __name__ == "__main__":
+    test_symbolic_multiple_integrals()
+    test_bounds_use_outer_variables()
+    test_inner_integral_cache()
+    test_numeric_cubature()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the integrand plot
+Checks the plotted range, adaptive sampling, downsampling and the
+shaded area without opening a window
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from sympy import symbols, oo, cos, log
+from matplotlib.figure import Figure
+from plotting import view_window, adaptive_sample, minmax_downsample, draw_integral
+
+
+def test_view_window():
+    """Finite, half-infinite and indefinite ranges"""
+    print("VIEW WINDOW TESTS")
+    print("-" * 60)
+
+    test_cases = [
+        ((0, 2), (-0.3, 2.3)),
+        ((2, 0), (-0.3, 2.3)),
+        ((0, oo), (-1.5, 11.5)),
+        ((-oo, oo), (-13.0, 13.0)),
+        ((None, None), (-5.0, 5.0)),
+    ]
+    for (a, b), expected in test_cases:
+        window = view_window(a, b)
+        print(f"[{a}, {b}] -> {window}")
+        assert np.allclose(window, expected)
+
+
+def test_adaptive_sample():
+    """Points go where the curve needs them, within the budget"""
+    print("ADAPTIVE SAMPLING TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    xs, ys = adaptive_sample("3", x, 0, 1)
+    print(f"Constant: {xs.size} points")
+    assert xs.size == 65
+
+    # A narrow peak: most points end up near it
+    xs, ys = adaptive_sample("exp(-1000*x^2)", x, -5, 5, max_points=400)
+    near = np.sum(np.abs(xs) < 0.2)
+    print(f"Narrow peak: {xs.size} points, {near} within 0.2 of the peak")
+    assert xs.size <= 400
+    assert near > xs.size / 2
+    dense = np.linspace(-5, 5, 100001)
+    error = np.max(np.abs(np.interp(dense, xs, ys) - np.exp(-1000 * dense ** 2)))
+    uniform = np.linspace(-5, 5, xs.size)
+    uniform_error = np.max(np.abs(np.interp(dense, uniform, np.exp(-1000 * uniform ** 2))
+                                  - np.exp(-1000 * dense ** 2)))
+    print(f"Max interpolation error: adaptive {error:.2e}, uniform {uniform_error:.2e}")
+    assert error < uniform_error / 10
+
+    # The budget caps refinement of an endlessly oscillating curve
+    xs, _ = adaptive_sample("sin(1/x)", x, 1e-4, 1, max_points=500)
+    assert xs.size <= 500
+
+    # Poles break the line, and the domain edge of sqrt is located closely
+    xs, ys = adaptive_sample("1/x", x, -1, 2)
+    gap = xs[np.isnan(ys)]
+    print(f"1/x: break at {gap}")
+    assert gap.size == 1 and abs(gap[0]) < 1e-6
+    xs, ys = adaptive_sample("sqrt(x)", x, -1, 1)
+    first = xs[np.isfinite(ys)][0]
+    print(f"sqrt(x): first defined sample at {first:.2e}")
+    assert 0 <= first < 1e-6
+
+
+def test_minmax_downsample():
+    """Dense samples shrink to a few points per pixel column, extremes kept"""
+    print("MIN-MAX DOWNSAMPLING TESTS")
+    print("-" * 60)
+
+    xs = np.linspace(-3, 3, 1_000_000)
+    with np.errstate(all='ignore'):
+        ys = np.sin(300 * xs) * np.exp(-xs ** 2) + np.log(xs + 2)
+    ys[~np.isfinite(ys)] = np.nan
+    small_x, small_y = minmax_downsample(xs, ys, 600, -3, 3)
+    print(f"{xs.size} samples -> {small_x.size} points")
+    assert small_x.size <= 4 * 601
+    assert np.all(np.diff(small_x) > 0)
+
+    column = np.floor((xs + 3) / 6 * 600).astype(int)
+    small_column = np.floor((small_x + 3) / 6 * 600).astype(int)
+    for c in range(120, 600, 13):
+        assert np.nanmax(ys[column == c]) == np.nanmax(small_y[small_column == c])
+        assert np.nanmin(ys[column == c]) == np.nanmin(small_y[small_column == c])
+
+    # The undefined part (x < -2) collapses to a single gap marker
+    print(f"Undefined samples: {np.isnan(ys).sum()} -> {np.isnan(small_y).sum()}")
+    assert np.isnan(small_y).sum() == 1
+
+    # Few samples are left alone
+    assert minmax_downsample(xs[:100], ys[:100], 600)[0].size == 100
+
+
+def test_draw_integral():
+    """The curve and the shaded area are drawn on a plain Figure"""
+    print("DRAW INTEGRAL TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    ax = Figure().add_subplot(111)
+    draw_integral(ax, "exp(-x^2)", x, 0, oo)
+    assert len(ax.lines) == 2  # axis line and curve
+    assert len(ax.collections) == 1
+    area = ax.collections[0].get_paths()[0].vertices
+    print(f"Shaded x-range: {area[:, 0].min()} .. {area[:, 0].max()}")
+    assert area[:, 0].min() == 0.0 and area[:, 0].max() == 11.5  # to the edge for b = oo
+
+    draw_integral(ax, "1/x", x, -1, 1)
+    low, high = ax.get_ylim()
+    print(f"1/x y-range: {low:.1f} .. {high:.1f}")
+    assert high < 1000
+
+    draw_integral(ax, "sin(x)", x, antiderivative=-cos(x))
+    assert len(ax.lines) == 3  # axis line, f and F
+    assert len(ax.collections) == 0
+    assert ax.get_xlim() == (-5.0, 5.0)
+
+    # The window of f is kept when F is drawn too, each curve weighted on its own
+    draw_integral(ax, "tan(x)", x)
+    alone = ax.get_ylim()
+    draw_integral(ax, "tan(x)", x, antiderivative=-log(cos(x)))
+    low, high = ax.get_ylim()
+    print(f"tan y-range: {alone[0]:.1f} .. {alone[1]:.1f}, with F: {low:.1f} .. {high:.1f}")
+    assert low >= alone[0] - 1e-9 and high < 2 * alone[1]
+
+
+if __name__ == "__main__":
+    test_view_window()
+    test_adaptive_sample()
+    test_minmax_downsample()
+    test_draw_integral()
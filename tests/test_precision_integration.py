@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for arbitrary-precision definite integration
+Checks digits of the results and reuse of the precision cache
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import mpmath
+import sympy as sp
+import precision_integration
+from precision_integration import definite_integral_precise, clear_precision_cache, _precision_cache
+from symbolic_integration import definite_integral, approximation_text
+
+
+def test_precise_closed_form():
+    """Closed-form integrals are evaluated to the requested digits"""
+    print("PRECISE CLOSED FORM TEST")
+    print("-" * 60)
+
+    clear_precision_cache()
+    for dps in (15, 50, 100):
+        value = definite_integral_precise("sin(x)", 0, "pi/3", dps=dps)
+        print(f"{dps} digits: {mpmath.nstr(value, dps)}")
+        with mpmath.workdps(dps + 10):
+            assert abs(value - mpmath.mpf(1) / 2) < mpmath.mpf(10) ** (-dps + 1)
+
+
+def test_precise_quadrature():
+    """Integrals without a closed form use mpmath quadrature"""
+    print("PRECISE QUADRATURE TEST")
+    print("-" * 60)
+
+    clear_precision_cache()
+    value = definite_integral_precise("exp(x^2)*sin(x)", 0, 1, dps=50)
+    text = mpmath.nstr(value, 50)
+    print(f"int_0^1 exp(x^2)*sin(x) dx = {text}")
+    assert text.startswith("0.778745160526724004625135711280174208359638652943")
+
+
+def test_precision_cache_seeding():
+    """Lower-precision requests record the method so higher precision skips
+    the symbolic attempt, and higher precision answers lower precision"""
+    print("PRECISION CACHE TEST")
+    print("-" * 60)
+
+    clear_precision_cache()
+    x = sp.symbols('x')
+    func = sp.exp(x ** 2) * sp.sin(x)
+    definite_integral_precise(func, 0, 1, dps=15)
+    entry = _precision_cache[(func, x, 0, 1)]
+    print(f"Closed form tried: {entry.exact_tried}, closed form: {entry.exact}, degree: {entry.degree}")
+    assert entry.exact_tried and entry.exact is None
+    assert entry.split_points is not None
+
+    definite_integral_precise(func, 0, 1, dps=100)
+    assert sorted(entry.values) == [15, 100]
+
+    # Served from the 100 digit result
+    value = definite_integral_precise(func, 0, 1, dps=30)
+    assert 30 not in entry.values
+    print(f"30 digits from cache: {mpmath.nstr(value, 30)}")
+    assert mpmath.nstr(value, 30) == "0.77874516052672400462513571128"
+
+
+def test_precision_not_reached():
+    """A quadrature that misses the tolerance raises and is cached only at
+    the precision it reached"""
+    print("PRECISION NOT REACHED TEST")
+    print("-" * 60)
+
+    clear_precision_cache()
+    x = sp.symbols('x')
+    func = sp.floor(10 * x) * sp.exp(x ** 2)
+    try:
+        definite_integral_precise(func, 0, 1, dps=30)
+    except ValueError as e:
+        print(f"30 digits: {e}")
+    else:
+        raise AssertionError("30 digits returned")
+    entry = _precision_cache[(func, x, 0, 1)]
+    reached = max(entry.values)
+    assert reached < 30 and sorted(entry.values) == [reached]
+    # Asking again does not answer from the cache
+    try:
+        definite_integral_precise(func, 0, 1, dps=30)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("30 digits returned from the cache")
+    _, _, numeric = definite_integral(func, x, 0, 1, "30")
+    assert numeric is None
+
+
+def test_precision_cache_bound():
+    """The cache keeps only the most recently used integrals"""
+    print("PRECISION CACHE BOUND TEST")
+    print("-" * 60)
+
+    clear_precision_cache()
+    saved = precision_integration._PRECISION_CACHE_SIZE
+    precision_integration._PRECISION_CACHE_SIZE = 4
+    try:
+        x = sp.symbols('x')
+        for k in range(6):
+            definite_integral_precise(x ** k, 0, 1)
+        definite_integral_precise(x ** 2, 0, 1)
+        definite_integral_precise(x ** 6, 0, 1)
+        print(f"Cached: {[key[0] for key in _precision_cache]}")
+        assert [key[0] for key in _precision_cache] == [x ** 4, x ** 5, x ** 2, x ** 6]
+    finally:
+        precision_integration._PRECISION_CACHE_SIZE = saved
+
+
+def test_complex_values():
+    """Complex values get an approximation at the default precision too"""
+    print("COMPLEX VALUE TESTS")
+    print("-" * 60)
+
+    x = sp.symbols('x')
+    for func, expected in ((sp.sqrt(x), "(0.6667 + 0.6667j)"), (sp.log(x), "(-2.0 + 3.142j)")):
+        _, exact, numeric = definite_integral(func, x, -1, 1, "4")
+        text = approximation_text(numeric)
+        print(f"int_-1^1 {func} dx = {exact}{text}")
+        assert text == f" ≈ {expected}"
+
+    assert approximation_text(mpmath.mpf(2) / 3) == " ≈ 0.6667"
+    assert approximation_text(mpmath.mpf(2) / 3, 6) == " ≈ 0.666667"
+    assert approximation_text(None) == ""
+
+
+def test_no_value_without_precise_result():
+    """Without a precise value there is no numeric value, never F(b) - F(a)"""
+    print("NO NUMERIC VALUE TEST")
+    print("-" * 60)
+
+    x, k = sp.symbols('x k')
+    integral, exact, numeric = definite_integral(k * x, x, 0, 1, "4")
+    print(f"int_0^1 k*x dx = {exact}, numeric {numeric}")
+    assert exact == k / 2 and numeric is None
+
+    # Across a pole the value is the divergence, not the FTC difference -2
+    _, exact, numeric = definite_integral(1 / x**2, x, -1, 1, "4")
+    assert exact == sp.oo and numeric == mpmath.inf
+
+
+if __name__ == "__main__":
+    test_precise_closed_form()
+    test_precise_quadrature()
+    test_precision_cache_seeding()
+    test_precision_not_reached()
+    test_precision_cache_bound()
+    test_complex_values()
+    test_no_value_without_precise_result()
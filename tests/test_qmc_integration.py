@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for quasi-Monte Carlo integration
+Checks high-dimensional integrals, the error estimate and chunked evaluation
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import sympy as sp
+from sympy import symbols, cos, exp
+from qmc_integration import qmc_integrate, halton_points
+from multiple_integrals import multiple_integral
+
+
+def test_halton_points():
+    """Halton points are the radical inverses in prime bases"""
+    print("HALTON POINTS TEST")
+    print("-" * 60)
+
+    points = halton_points(1, 4, 2)
+    print(points)
+    assert np.allclose(points[:, 0], [1 / 2, 1 / 4, 3 / 4, 1 / 8])
+    assert np.allclose(points[:, 1], [1 / 3, 2 / 3, 1 / 9, 4 / 9])
+
+
+def test_qmc_high_dimension():
+    """An 8-dimensional product integral matches its exact value"""
+    print("QMC HIGH DIMENSION TEST")
+    print("-" * 60)
+
+    xs = symbols('x1:9')
+    func = sp.Mul(*[cos(v) for v in xs])
+    estimate, error = qmc_integrate(func, [(v, 0, 1) for v in xs], seed=1)
+    exact = np.sin(1) ** 8
+    print(f"Estimate: {estimate} +/- {error}, exact: {exact}")
+    assert error < 1e-4
+    assert abs(estimate - exact) < 5 * error + 1e-6
+
+
+def test_qmc_chunks_do_not_change_result():
+    """The chunk size only changes memory use, not the estimate"""
+    print("QMC CHUNK TEST")
+    print("-" * 60)
+
+    x, y, z = symbols('x y z')
+    limits = [(x, 0, 1), (y, -1, 1), (z, 0, 2)]
+    small = qmc_integrate(exp(-x * y * z), limits, n_points=5000, chunk_size=64, seed=3)
+    large = qmc_integrate(exp(-x * y * z), limits, n_points=5000, chunk_size=8192, seed=3)
+    print(f"Chunk 64: {small}, chunk 8192: {large}")
+    assert np.allclose(small, large, rtol=1e-12)
+
+
+def test_multiple_integral_uses_qmc_beyond_three_dimensions():
+    """Four-dimensional boxes fall back to quasi-Monte Carlo"""
+    print("MULTIPLE INTEGRAL QMC FALLBACK TEST")
+    print("-" * 60)
+
+    xs = symbols('x1:5')
+    func = exp(-sum(v ** 2 for v in xs) * sp.Rational(1, 2)) * sp.Abs(xs[0])
+    result, method = multiple_integral(func, [(v, -1, 1) for v in xs], timeout=0.2)
+    print(f"Result: {result} ({method})")
+    assert method in ('qmc', 'symbolic')
+
+
+if __name__ == "__main__":
+    test_halton_points()
+    test_qmc_high_dimension()
+    test_qmc_chunks_do_not_change_result()
+    test_multiple_integral_uses_qmc_beyond_three_dimensions()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the result popup layout
+Runs headlessly with font metrics from Matplotlib: positions, widths,
+wrapping of long results and the number of measurements
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+
+from result_layout import FontMetrics, matplotlib_metrics, layout_result, layout_image
+
+
+def counting_metrics():
+    """Metrics with 8 px per character that count the measure calls"""
+    calls = []
+
+    def font(role):
+        def measure(text):
+            calls.append((role, text))
+            return 8 * len(text)
+        return FontMetrics(('counting', role), measure, 18)
+
+    metrics = {role: font(role) for role in ('sign', 'bound', 'function', 'dx', 'equals', 'result')}
+    return metrics, calls
+
+
+def texts(layout, role):
+    return [item for item in layout.items if item[0] == 'text' and item[4] == role]
+
+
+def test_row_layout():
+    """Parts are placed left to right without overlap, result centered"""
+    print("ROW LAYOUT TESTS")
+    print("-" * 60)
+
+    metrics, calls = counting_metrics()
+    layout = layout_result(metrics, "∫", "(x² + 1)", "dx", "x³/3 + x", suffix=" + C")
+    for item in layout.items:
+        print(item)
+    xs = [item[1] for item in layout.items if item[0] == 'text']
+    assert xs == sorted(xs)
+    assert layout.width == 400 and layout.height == 200
+
+    # Every part measured once (the result by its tokens)
+    assert len(calls) == len(set(calls))
+    assert ('result', "x³/3 + x") not in calls
+
+    result, = texts(layout, 'result')[:1]
+    suffix = texts(layout, 'result')[-1]
+    assert result[3] == "x³ / 3 + x" and suffix[3] == " + C"
+    assert suffix[1] - result[1] == (8 * len(result[3]) + 8 * len(" + C")) // 2
+
+    # Bounds get boxes above and below the sign, stacked fractions one line each
+    layout = layout_result(metrics, "∫", "(sin(x))", "dx", "1\n—\n2", bounds=("0", "π"),
+                           center_y=110, height=220)
+    bounds = texts(layout, 'bound')
+    assert [(b[3], b[2]) for b in bounds] == [("0", 180), ("π", 40)]
+    assert [r[3] for r in texts(layout, 'result')] == ["1", "—", "2"]
+    assert len([item for item in layout.items if item[0] == 'rect']) == 3
+
+
+def test_long_results_wrap():
+    """Long results are wrapped inside the maximum width"""
+    print("WRAPPING TESTS")
+    print("-" * 60)
+
+    metrics = matplotlib_metrics()
+    result = " + ".join(f"c{i}*x**{i}" for i in range(60))
+    start = time.perf_counter()
+    layout = layout_result(metrics, "∫", "(f(x))", "dx", result)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    layout_result(metrics, "∫", "(f(x))", "dx", result)
+    again = time.perf_counter() - start
+
+    lines = texts(layout, 'result')
+    print(f"{len(lines)} lines, width {layout.width}, first {first * 1000:.1f} ms, "
+          f"again {again * 1000:.1f} ms")
+    assert layout.rows is None
+    assert layout.width <= 2500 and len(lines) > 1
+    assert " ".join(line[3] for line in lines).replace(" ", "") == result.replace(" ", "")
+    measure = metrics['result'].measure
+    for _, x, _, text, _ in lines:
+        assert x + measure(text) / 2 <= layout.width - 30 + 10
+
+    short = layout_result(metrics, "∫", "(x)", "dx", "x²/2", suffix=" + C")
+    assert short.width < 500 and isinstance(short.width, int)
+
+
+def test_scrolling_rows():
+    """Results longer than the canvas become lazily wrapped rows"""
+    print("SCROLLING ROWS TESTS")
+    print("-" * 60)
+
+    metrics = matplotlib_metrics()
+    result = " + ".join(f"c{i}*x**{i}" for i in range(20000))
+    start = time.perf_counter()
+    layout = layout_result(metrics, "∫", "(f(x))", "dx", result, suffix=" + C")
+    elapsed = time.perf_counter() - start
+    print(f"{len(result)} characters laid out in {elapsed * 1000:.1f} ms, width {layout.width}")
+
+    assert layout.rows is not None and layout.width <= 900
+    assert texts(layout, 'result') == []
+    assert layout.rows.lines == []  # nothing wrapped before it is shown
+    first = layout.rows.get(0)
+    assert first.startswith("c0 * x * * 0 +")
+    room = 2 * (layout.rows_x - texts(layout, 'equals')[0][1])
+    assert metrics['result'].line_width(first) <= room
+
+
+def test_image_layout():
+    """A typeset equation is centered; too wide images are refused"""
+    print("IMAGE LAYOUT TESTS")
+    print("-" * 60)
+
+    assert layout_image(100).width == 400
+    assert layout_image(1000).width == 1060
+    assert layout_image(5000) is None
+    assert layout_image(1000, height=220).items == [('image', 530, 110)]
+
+
+if __name__ == "__main__":
+    test_row_layout()
+    test_long_results_wrap()
+    test_scrolling_rows()
+    test_image_layout()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the scrolling result view
+Runs headlessly on a minimal canvas: only visible lines are items, items are
+reused while scrolling and lines are wrapped only as far as scrolled
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+
+from text_layout import LazyLines, wrap_text
+from result_view import VirtualLines
+
+
+class ScrollCanvas:
+    """The Canvas methods VirtualLines uses, with a settable view top"""
+
+    def __init__(self):
+        self.items = {}
+        self.view_top = 0
+        self.scrollregion = None
+        self.moved = 0
+
+    def canvasy(self, y):
+        return self.view_top + y
+
+    def create_text(self, x, y, **kw):
+        item = len(self.items) + 1
+        self.items[item] = dict(kw, coords=(x, y))
+        return item
+
+    def itemconfig(self, item, **kw):
+        self.items[item].update(kw)
+
+    def coords(self, item, x, y):
+        self.items[item]['coords'] = (x, y)
+
+    def config(self, scrollregion):
+        self.scrollregion = scrollregion
+
+    def move(self, tag, dx, dy):
+        self.moved += dy
+
+    def shown(self):
+        """(y, text) of the visible text items, top to bottom"""
+        return sorted((it['coords'][1], it['text']) for it in self.items.values()
+                      if it.get('state') == 'normal')
+
+
+def measure(text):
+    return 9 * len(text)
+
+
+def make_view(terms=20000):
+    text = " + ".join(f"c{i}*x**{i}" for i in range(terms))
+    rows = LazyLines(text, 400, ('view-test',), measure)
+    canvas = ScrollCanvas()
+    view = VirtualLines(canvas, rows, 250, 21, 22, 500, 200, ('Arial', 16, 'bold'), background_tag="grid")
+    return text, rows, canvas, view
+
+
+def test_visible_lines_only():
+    """Only the rows in view are items, reused while scrolling"""
+    print("VISIBLE LINES TESTS")
+    print("-" * 60)
+
+    text, rows, canvas, view = make_view()
+    start = time.perf_counter()
+    view.refresh()
+    elapsed = time.perf_counter() - start
+    pool = len(canvas.items)
+    print(f"{len(text)} characters: first view in {elapsed * 1000:.2f} ms, {pool} text items, "
+          f"{len(rows.lines)} lines wrapped")
+    assert pool == 12  # ceil(200 / 22) + 2
+    assert len(rows.lines) <= pool + 1
+    shown = canvas.shown()
+    assert shown[0] == (21, rows.lines[0])
+
+    # Scroll far down: same items, the lines there
+    canvas.view_top = 21 + 22 * 5000
+    view.refresh()
+    assert len(canvas.items) == pool
+    assert view.first_row == 5000
+    shown = canvas.shown()
+    assert shown[0] == (21 + 22 * 5000, rows.lines[5000])
+    assert [t for _, t in shown] == rows.lines[5000:5000 + len(shown)]
+    assert len(rows.lines) <= 5000 + pool + 1
+    assert canvas.moved == (21 + 22 * 5000) // 20 * 20
+
+
+def test_scroll_region_estimate():
+    """The scroll region is estimated from the part wrapped so far"""
+    print("SCROLL REGION TESTS")
+    print("-" * 60)
+
+    text, rows, canvas, view = make_view()
+    view.refresh()
+    estimate = rows.estimated_count()
+    total = len(wrap_text(text, 400, ('view-test',), measure))
+    print(f"Estimated {estimate} lines after {len(rows.lines)}, actually {total}")
+    assert abs(estimate - total) / total < 0.2
+    assert canvas.scrollregion == (0, 0, 500, view.scroll_height())
+
+    # At the end the count is exact and all text is shown once
+    canvas.view_top = 22 * total
+    view.refresh()
+    assert rows.estimated_count() == total == len(rows.lines)
+    assert rows.lines == wrap_text(text, 400, ('view-test',), measure)
+    assert canvas.shown()[-1][1] == rows.lines[-1]
+
+
+if __name__ == "__main__":
+    test_visible_lines_only()
+    test_scroll_region_estimate()
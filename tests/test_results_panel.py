@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the results panel
+Checks that results reuse one window and canvas, that earlier results stay
+reachable from the history and that long summaries are shortened (the panel
+tests need a display and are skipped otherwise)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tkinter as tk
+
+from results_panel import ResultsPanel, ResultEntry, shorten
+from result_layout import FontMetrics, layout_result
+
+
+def make_panel(history_size=50):
+    """Panel on a hidden Tk root, or None without a display"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        if 'pytest' in sys.modules:
+            # Reported as skipped, not passed
+            import pytest
+            pytest.skip("No display available")
+        print("No display available, skipped")
+        return None, None
+    root.withdraw()
+    return root, ResultsPanel(root, history_size)
+
+
+def metrics():
+    """Metrics with 8 px per character"""
+    return {role: FontMetrics(('panel-test', role), lambda text: 8 * len(text), 18)
+            for role in ('sign', 'bound', 'function', 'dx', 'equals', 'result')}
+
+
+def entry(result):
+    layout = layout_result(metrics(), "∫", "(f(x))", "dx", result, suffix=" + C")
+    return ResultEntry("Result", shorten(f"∫ f(x) dx = {result} + C"), layout)
+
+
+def test_shorten():
+    """Summaries are one line of limited length"""
+    print("SUMMARY TESTS")
+    print("-" * 60)
+
+    assert shorten("x²/2") == "x²/2"
+    assert shorten("a +\n  b") == "a + b"
+    long = shorten("x + " * 1000, 80)
+    print(long)
+    assert len(long) == 80 and long.endswith("…")
+
+
+def test_window_is_reused():
+    """Every result is shown in the same window and canvas"""
+    print("WINDOW REUSE TESTS")
+    print("-" * 60)
+
+    root, panel = make_panel()
+    if panel is None:
+        return
+    try:
+        panel.show(entry("x²/2"))
+        window, canvas = panel.window, panel.canvas
+        grid = canvas.find_withtag("grid")
+        items = len(canvas.find_all())
+        for _ in range(20):
+            panel.show(entry("x³/3"))
+        assert panel.window is window and panel.canvas is canvas
+        assert canvas.find_withtag("grid") == grid
+        assert len(canvas.find_all()) == items
+        assert len(root.winfo_children()) == 1
+
+        # A long result scrolls; the next short one removes its rows again
+        panel.show(entry(" + ".join(f"c{i}*x**{i}" for i in range(5000))))
+        assert panel.view is not None
+        panel.show(entry("x²/2"))
+        assert panel.view is None and len(canvas.find_all()) == items
+
+        # Closing hides the window, the next result shows it again
+        panel.window.withdraw()
+        panel.show(entry("x"))
+        root.update_idletasks()
+        assert panel.window.state() == 'normal'
+    finally:
+        root.destroy()
+
+
+def test_history():
+    """Earlier results can be shown again, the oldest are dropped"""
+    print("HISTORY TESTS")
+    print("-" * 60)
+
+    root, panel = make_panel(history_size=3)
+    if panel is None:
+        return
+    try:
+        entries = [entry(f"x^{i}") for i in range(5)]
+        for e in entries:
+            panel.show(e)
+        assert panel.history == entries[2:]
+        assert panel.history_list.get(0, tk.END) == tuple(e.summary for e in entries[2:])
+        assert panel.current is entries[4]
+
+        panel.history_list.selection_clear(0, tk.END)
+        panel.history_list.selection_set(0)
+        panel.history_selected()
+        assert panel.current is entries[2]
+    finally:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    test_shorten()
+    test_window_is_reused()
+    test_history()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the Riemann-sum and trapezoid animation
+Checks the precomputed sums and cells, and that playback never evaluates the integrand
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from sympy import symbols
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import riemann_animation
+from riemann_animation import riemann_frames, RiemannAnimation
+
+
+def test_riemann_sums():
+    """Sums of x^2 on [0, 2] match the closed forms of each rule"""
+    print("RIEMANN SUM TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    counts = (1, 2, 5, 10, 100)
+    n = np.array(counts, dtype=float)
+    h = 2.0 / n
+    expected = {
+        'left': 8 / 3 - 4 / n + 4 / (3 * n ** 2),
+        'right': 8 / 3 + 4 / n + 4 / (3 * n ** 2),
+        'midpoint': 8 / 3 - h ** 2 / 6,
+        'trapezoid': 8 / 3 + h ** 2 / 3,
+    }
+    for rule, values in expected.items():
+        frames = riemann_frames("x^2", x, 0, 2, counts=counts, rule=rule)
+        print(f"{rule}: {np.round(frames.sums, 6)}")
+        assert len(frames) == len(counts)
+        assert np.allclose(frames.sums, values, rtol=1e-12)
+
+    frames = riemann_frames("x^2", x, 0, 2, counts=counts, rule='trapezoid')
+    k, vertices, total = frames.frame(2)
+    assert k == 5 and vertices.shape == (5, 4, 2)
+    assert np.allclose(vertices[:, 2, 1], vertices[:, 2, 0] ** 2)
+    assert riemann_frames("x^2", x, 0, 2, counts=counts, rule='trapezoid') is frames
+
+    for bad in ({'rule': 'simpson'}, {'counts': (0, 1)}):
+        try:
+            riemann_frames("x^2", x, 0, 2, **bad)
+        except ValueError as e:
+            print(f"{bad}: {e}")
+        else:
+            raise AssertionError(f"{bad} should be rejected")
+
+
+def test_playback_without_evaluation():
+    """All frames come from one vectorized call, playback reuses them"""
+    print("PLAYBACK TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    calls = []
+    original = riemann_animation.lambdify_numpy
+
+    def counting(expr, variables):
+        f_np = original(expr, variables)
+
+        def evaluate(*args):
+            calls.append(np.size(args[0]))
+            return f_np(*args)
+        return evaluate
+
+    riemann_animation.lambdify_numpy = counting
+    try:
+        frames = riemann_frames("sin(x)", x, 0, 3, rule='left')
+        print(f"Integrand calls while building {len(frames)} frames: {len(calls)} ({calls[0]} points)")
+        assert len(calls) == 1
+
+        figure = Figure()
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111)
+        redraws = []
+        animation = RiemannAnimation(ax, frames, lambda: redraws.append(1), exact=1 - np.cos(3))
+        animation.start()
+        for _ in range(len(frames) + 2):
+            animation._advance()
+        canvas.draw()
+        print(f"Last label: {animation.label.get_text()}")
+        assert len(calls) == 1
+        assert len(redraws) == len(frames)
+        assert len(animation.collection.get_paths()) == frames.counts[-1]
+
+        animation.remove()
+        assert animation.collection.axes is None
+    finally:
+        riemann_animation.lambdify_numpy = original
+
+
+if __name__ == "__main__":
+    test_riemann_sums()
+    test_playback_without_evaluation()
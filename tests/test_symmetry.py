@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for symmetry and periodicity shortcuts
+Checks parity and period detection and the reduced definite integrals
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+
+import sympy as sp
+from sympy import symbols, integrate, sin, cos, exp, pi, oo
+from symmetry import detect_parity, detect_period, reduce_by_symmetry
+
+
+def test_parity_and_period_detection():
+    """Odd, even and periodic integrands are recognized"""
+    print("PARITY AND PERIOD DETECTION TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    parity_cases = [
+        (x ** 3 * cos(x), 'odd'),
+        (x ** 2 + cos(x), 'even'),
+        (exp(-x ** 2), 'even'),
+        (sin(x) ** 3, 'odd'),
+        (exp(x), None),
+        (sp.sqrt(x), None),
+    ]
+    for func, expected in parity_cases:
+        parity = detect_parity(func, x)
+        print(f"{func}: {parity}")
+        assert parity == expected
+
+    assert detect_period(sin(x) + cos(x), x) == 2 * pi
+    assert detect_period(sin(x) + x, x) is None
+    assert detect_period(exp(sp.I * x), x) == 2 * pi
+
+    # Integrands without periodic functions are not sent to periodicity
+    start = time.perf_counter()
+    for k in range(20):
+        assert detect_period(x ** k * exp(-x) / (1 + x ** 2), x) is None
+    elapsed = time.perf_counter() - start
+    print(f"20 non-periodic integrands checked in {elapsed * 1000:.1f} ms")
+    assert elapsed < 0.5
+
+
+def test_reduce_by_symmetry():
+    """Reduced integrals equal the full ones"""
+    print("SYMMETRY REDUCTION TESTS")
+    print("-" * 60)
+
+    x = symbols('x')
+    test_cases = [
+        (x ** 3 * cos(x), -pi, pi, 0),
+        (x ** 2, -2, 2, 2),
+        (x ** 2, 2, -2, 2),
+        (sin(x) ** 2, 0, 6 * pi, 3),
+        (exp(-x ** 2), -oo, oo, 2),
+        (1 / x, -1, 1, 1),       # Odd but divergent, no shortcut
+        (x, -oo, oo, 1),         # Odd but divergent, no shortcut
+        (exp(x), -1, 1, 1),
+    ]
+    for func, a, b, expected_factor in test_cases:
+        factor, a2, b2 = reduce_by_symmetry(func, x, a, b)
+        print(f"int {func} dx from {a} to {b} = {factor} * int from {a2} to {b2}")
+        assert factor == expected_factor
+        if factor not in (0, 1):
+            full = integrate(func, (x, a, b))
+            assert sp.simplify(factor * integrate(func, (x, a2, b2)) - full) == 0
+
+
+if __name__ == "__main__":
+    test_parity_and_period_detection()
+    test_reduce_by_symmetry()
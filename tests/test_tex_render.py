@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for TeX rendering
+Checks the LaTeX of input and results and the cached mathtext images
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import sympy as sp
+from sympy import symbols, pi
+from tex_render import expression_latex, bounds_latex, integral_latex, tex_png
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def png_size(data):
+    """(width, height) from the IHDR chunk of PNG data"""
+    return int.from_bytes(data[16:20], 'big'), int.from_bytes(data[20:24], 'big')
+
+
+def test_latex():
+    """Input is shown as typed, partial input gives None"""
+    print("LATEX TESTS")
+    print("-" * 60)
+
+    x, y = symbols('x y')
+    cases = [
+        ("x^2", "x^{2}"),
+        ("3x + x", "x + 3 x"),
+        ("exp(-x^2)/(1+x^4)", r"\frac{e^{- x^{2}}}{x^{4} + 1}"),
+        ("π/2", r"\frac{\pi}{2}"),
+        ("1/x", r"\frac{1}{x}"),
+        ("1/(1+x^2)", r"\frac{1}{x^{2} + 1}"),
+        ("sin(", None),
+        ("", None),
+    ]
+    for text, expected in cases:
+        latex = expression_latex(text)
+        print(f"{text!r:24} -> {latex}")
+        assert latex == expected
+
+    assert bounds_latex("0, pi", 2) == ["0", r"\pi"]
+    assert bounds_latex("0", 2) is None
+    assert bounds_latex("1/", 1) is None
+
+    latex = integral_latex("x^{2}", [x], ["0"], [r"\pi"], result=sp.latex(pi**3 / 3))
+    print(latex)
+    assert latex == r"\int_{0}^{\pi} \left(x^{2}\right)\,dx = \frac{\pi^{3}}{3}"
+    latex = integral_latex("x y", [x, y], ["0", "1"], ["1", "2"])
+    assert latex.startswith(r"\int_{1}^{2}\int_{0}^{1} ") and latex.endswith(r"\,dx\,dy")
+    assert integral_latex("x", [x], result="x^{2}/2", constant=True).endswith("+ C")
+
+
+def test_cached_images():
+    """Images are PNG, cached per (latex, size, dpi), None when mathtext fails"""
+    print("IMAGE CACHE TESTS")
+    print("-" * 60)
+
+    latex = integral_latex(r"\frac{e^{- x^{2}}}{x^{4} + 1}", [symbols('x')])
+    small = tex_png(latex, 12)
+    assert small.startswith(PNG_SIGNATURE)
+
+    hits = tex_png.cache_info().hits
+    assert tex_png(latex, 12) is small
+    assert tex_png.cache_info().hits == hits + 1
+
+    large = tex_png(latex, 24)
+    print(f"12 pt: {png_size(small)}, 24 pt: {png_size(large)}")
+    assert png_size(large)[0] > png_size(small)[0]
+    assert png_size(tex_png(latex, 12, 200))[0] > png_size(small)[0]
+
+    assert tex_png(r"\begin{matrix} x \end{matrix}") is None
+
+
+if __name__ == "__main__":
+    test_latex()
+    test_cached_images()
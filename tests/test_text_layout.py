@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for line wrapping
+Checks the wrapped lines against re-measuring every trial line, and that
+each token is measured once
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+
+from text_layout import tokenize, wrap_text
+
+
+class CountingFont:
+    """Stand-in for a tkinter Font: proportional widths, counts measure calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def measure(self, text):
+        self.calls += 1
+        return sum(5 if ch in " ()ilt" else 12 if ch.isupper() else 9 for ch in text)
+
+
+def quadratic_wrap(text, max_width, measure):
+    """The former wrapping: measure the whole joined line for every token"""
+    lines, line = [], []
+    for token in tokenize(text):
+        if line and measure(" ".join(line + [token])) > max_width:
+            lines.append(" ".join(line))
+            line = []
+        line.append(token)
+    if line:
+        lines.append(" ".join(line))
+    return lines or [text]
+
+
+def test_same_lines():
+    """Running widths give the same lines as measuring each trial line"""
+    print("WRAP RESULT TESTS")
+    print("-" * 60)
+
+    texts = [
+        "x**3/3 + sin(x)*cos(x) - log(x + sqrt(x**2 + 1)) + C",
+        "-x**2*exp(-x)/2 - x*exp(-x) - exp(-x)",
+        "Si(x)",
+        "averyveryverylongtokenwithoutbreaks + 1",
+    ]
+    font = CountingFont()
+    for i, text in enumerate(texts):
+        for width in (40, 120, 300, 1000):
+            lines = wrap_text(text, width, ('counting', i), font.measure)
+            assert lines == quadratic_wrap(text, width, font.measure), (text, width)
+    assert wrap_text("", 100, ('counting',), font.measure) == [""]
+    print(f"Lines for width 120: {wrap_text(texts[0], 120, ('counting', 0), font.measure)}")
+
+
+def test_linear_measurements():
+    """Every distinct token is measured once; repeated wraps are cached"""
+    print("MEASUREMENT COUNT TESTS")
+    print("-" * 60)
+
+    text = " + ".join(f"c{i}*x**{i}" for i in range(2000))
+    tokens = tokenize(text)
+    font = CountingFont()
+
+    start = time.perf_counter()
+    lines = wrap_text(text, 400, ('counting', 'linear'), font.measure)
+    elapsed = time.perf_counter() - start
+    print(f"{len(tokens)} tokens, {len(lines)} lines, {font.calls} measure calls, {elapsed * 1000:.1f} ms")
+    assert font.calls == len(set(tokens)) + 1  # plus the width of a space
+    assert all(font.measure(line) <= 400 for line in lines)
+    assert " ".join(lines).split() == tokens
+
+    calls = font.calls
+    assert wrap_text(text, 400, ('counting', 'linear'), font.measure) == lines
+    assert font.calls == calls
+    wrap_text(text, 300, ('counting', 'linear'), font.measure)
+    assert font.calls == calls
+
+
+if __name__ == "__main__":
+    test_same_lines()
+    test_linear_measurements()